@@ -16,12 +16,12 @@
 """Utilities for use with asynchronous code."""
 
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from functools import partial, wraps
 from inspect import signature
 import os
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 
 from cylc.flow import LOG
 
@@ -481,6 +481,71 @@ def make_async(fcn):
 async_listdir = make_async(os.listdir)
 
 
+class ThreadSafeEvent:
+    """An asyncio event which may be set from any thread.
+
+    The event is bound to the event loop which is running when it is created.
+    Calling "set" from another thread (e.g. the server thread) schedules the
+    event to be set in that loop, so coroutines waiting on it are woken
+    without the need to poll.
+
+    Examples:
+        >>> async def test():
+        ...     event = ThreadSafeEvent()
+        ...     asyncio.get_running_loop().call_later(0.01, event.set)
+        ...     woken = await event.wait(10)
+        ...     event.clear()
+        ...     return woken, await event.wait(0.01)
+        >>> asyncio.run(test())
+        (True, False)
+
+    """
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def set(self) -> None:  # noqa: A003 (method name)
+        """Set the event (may be called from any thread)."""
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = (
+                asyncio.get_running_loop()
+            )
+        except RuntimeError:
+            loop = None
+        if loop is self._loop:
+            self._event.set()
+        else:
+            with suppress(RuntimeError):
+                # RuntimeError: the loop has been closed
+                self._loop.call_soon_threadsafe(self._event.set)
+
+    def clear(self) -> None:
+        """Clear the event."""
+        self._event.clear()
+
+    def is_set(self) -> bool:
+        """Return True if the event is set."""
+        return self._event.is_set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for the event to be set for up to timeout seconds.
+
+        Always yields control to the event loop, even if the event is
+        already set.
+
+        Returns:
+            True if the event was set, else False.
+
+        """
+        if self._event.is_set() or timeout <= 0:
+            await asyncio.sleep(0)
+            return self._event.is_set()
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._event.wait(), timeout)
+        return self._event.is_set()
+
+
 @asynccontextmanager
 async def async_block():
     """Ensure all tasks started within the context are awaited when it closes.
@@ -730,6 +730,88 @@ with Conf('global.cylc', desc='''
 
                Moved into the ``[scheduler]`` section from the top level.
         ''')
+        Conf('xtrigger pool size', VDR.V_INTEGER, 0, desc='''
+            Number of long-lived worker processes used to run xtrigger
+            functions.
+
+            By default (``0``) each xtrigger function call is run in a new
+            subprocess in the process pool. Otherwise, calls are run by a
+            pool of this many worker processes which are started once and
+            keep xtrigger modules imported between calls. This reduces the
+            cost of workflows which check a large number of xtriggers.
+
+            Calls which take longer than
+            :cylc:conf:`global.cylc[scheduler]process pool timeout` are
+            killed by restarting the workers.
+
+            .. versionadded:: 8.3.0
+        ''')
+        Conf('watch job status files', VDR.V_BOOLEAN, False, desc='''
+            Watch job status files for changes rather than relying on
+            polling alone (Linux only).
+
+            This applies to jobs on platforms which share the scheduler's
+            filesystem (i.e. have the ``localhost`` install target) and use
+            the ``poll`` communication method, see
+            :cylc:conf:`global.cylc[platforms][<platform name>]
+            communication method`.
+
+            The scheduler is notified by the operating system (inotify)
+            whenever such a job writes to its ``job.status`` file, and
+            processes the job's new messages and status as if it had been
+            polled. Task state changes are then picked up immediately rather
+            than at the next poll.
+
+            Jobs are still polled at their configured polling intervals in
+            order to detect jobs which die without updating their status
+            file, but these intervals can be made longer.
+
+            .. versionadded:: 8.3.0
+        ''')
+        Conf('database journal mode', VDR.V_STRING, 'delete',
+             options=['delete', 'wal'], desc='''
+            The SQLite journal mode of the scheduler's private database.
+
+            Options:
+
+            delete
+               (The default) The database is opened for each batch of
+               writes and uses a rollback journal.
+            wal
+               The database connection is kept open and uses write-ahead
+               logging (with ``synchronous=NORMAL``). This makes writes
+               cheaper for workflows with a high rate of task and job
+               changes. A power loss or operating system crash may lose
+               the last few writes, but does not corrupt the database.
+
+            .. warning::
+
+               Write-ahead logging does not work on network filesystems
+               such as NFS, only use ``wal`` if the workflow run
+               directory is on a local filesystem.
+
+            The public database (read by other Cylc commands) always uses a
+            rollback journal.
+
+            .. versionadded:: 8.3.0
+        ''')
+        Conf('graphql result cache ttl', VDR.V_INTERVAL, DurationFloat(0),
+             desc='''
+            How long the scheduler may reuse the result of a GraphQL query.
+
+            Clients such as the UI and ``cylc tui`` repeat the same queries.
+            If this is set, the result of each query is kept for this long
+            and returned to identical requests (same query and variables)
+            until the workflow data changes. This makes repeated queries
+            almost free when the workflow is idle.
+
+            Some fields are not part of the workflow data (e.g.
+            ``loopTimings``) and may be up to this much out of date.
+
+            By default (``PT0S``) results are not reused.
+
+            .. versionadded:: 8.3.0
+        ''')
         Conf('auto restart delay', VDR.V_INTERVAL, desc=f'''
             Maximum number of seconds the auto-restart mechanism will delay
             before restarting workflows.
@@ -868,6 +950,43 @@ with Conf('global.cylc', desc='''
 
                    {REPLACES}``[suite servers][run host select]rank``.
             ''')
+            Conf('ranking timeout', VDR.V_INTERVAL, DurationFloat(30),
+                 desc='''
+                The maximum time to wait for the system information used by
+                :cylc:conf:`global.cylc[scheduler][run hosts]ranking`.
+
+                The information is requested from all hosts at the same time.
+                Hosts which do not respond within this time are not selected.
+
+                .. versionadded:: 8.3.0
+            ''')
+            Conf('ranking quorum', VDR.V_INTEGER, 0, desc='''
+                Stop waiting for host system information once this many hosts
+                have responded and passed all of the thresholds in
+                :cylc:conf:`global.cylc[scheduler][run hosts]ranking`.
+
+                The host is then selected from those which have responded.
+                This avoids waiting for slow hosts, at the cost of ranking
+                fewer hosts. By default (``0``) all hosts are waited for.
+
+                .. versionadded:: 8.3.0
+            ''')
+            Conf('ranking cache duration', VDR.V_INTERVAL, DurationFloat(0),
+                 desc='''
+                Reuse host system information for this long.
+
+                If set, the system information used by
+                :cylc:conf:`global.cylc[scheduler][run hosts]ranking` is cached
+                in ``~/.cylc/flow/host-metrics.json`` and reused by
+                subsequent host selections (e.g. ``cylc play`` commands) within
+                this time.
+
+                Note that the cached information does not reflect the load of
+                schedulers started in the meantime, so keep this short if
+                many workflows are started at once.
+
+                .. versionadded:: 8.3.0
+            ''')
 
         with Conf('host self-identification', desc=f'''
             How Cylc determines and shares the identity of the workflow host.
@@ -1466,6 +1585,30 @@ with Conf('global.cylc', desc='''
                    Moved from ``suite.rc[runtime][<namespace>][job]
                    cylc executable``.
             ''')
+            Conf('use jobs agent', VDR.V_BOOLEAN, False, desc='''
+                Run job submission, poll and kill commands on this platform
+                via a long-lived ``cylc jobs-agent`` process.
+
+                By default, Cylc runs each batch of job commands with a new
+                SSH connection, i.e. ``ssh <host> cylc jobs-submit ...``.
+                If this is set, the scheduler instead starts
+                ``cylc jobs-agent`` on the platform host over SSH and sends
+                it the commands to run. This avoids the cost of the SSH
+                connection, login shell and Cylc start up for each command.
+
+                The agent runs commands concurrently. A command which does
+                not return within the
+                :cylc:conf:`global.cylc[scheduler]process pool timeout`
+                fails, but the agent is left running.
+                If the agent cannot be started, or dies, Cylc falls back to
+                running the commands over new SSH connections and tries to
+                start the agent again later.
+
+                Has no effect on platforms which run jobs on the workflow
+                host.
+
+                .. versionadded:: 8.3.0
+            ''')
             Conf('global init-script', VDR.V_STRING, desc=f'''
                 A per-platform script which is run before other job scripts.
 
@@ -1719,6 +1862,22 @@ with Conf('global.cylc', desc='''
 
                 .. versionadded:: 8.0.0
             ''')
+            Conf('batch submit window', VDR.V_INTERVAL, DurationFloat(0),
+                 desc='''
+                How long to wait for more jobs to batch together before
+                submitting jobs to this platform.
+
+                Jobs which are ready to submit are held until
+                :cylc:conf:`[..]max batch submit size` jobs are ready or
+                until the first of them has waited for this long. This
+                reduces the number of job submission commands (each of which
+                may require an SSH connection and a job runner command) when
+                tasks become ready in quick succession.
+
+                By default jobs are submitted as soon as they are ready.
+
+                .. versionadded:: 8.3.0
+            ''')
             Conf('ssh forward environment variables', VDR.V_STRING_LIST, '',
                  desc='''
                 A list containing the names of the environment variables to
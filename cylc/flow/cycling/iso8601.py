@@ -74,28 +74,54 @@ class WorkflowSpecifics:
 
 class ISO8601Point(PointBase):
 
-    """A single point in an ISO8601 date time sequence."""
+    """A single point in an ISO8601 date time sequence.
+
+    Points are compared and hashed by their number of seconds since the
+    epoch (in the workflow calendar), which is computed on first use.
+    """
 
     TYPE = CYCLER_TYPE_ISO8601
     TYPE_SORT_KEY = CYCLER_TYPE_SORT_KEY_ISO8601
 
-    __slots__ = ('value')
+    __slots__ = ('value', '_seconds')
+
+    def __init__(self, value: str):
+        super().__init__(value)
+        self._seconds: Optional[int] = None
 
     @classmethod
     def from_nonstandard_string(cls, point_string):
         """Standardise a date-time string."""
         return ISO8601Point(str(point_parse(point_string))).standardise()
 
+    @property
+    def seconds(self) -> int:
+        """The number of seconds since the epoch."""
+        if self._seconds is None:
+            self._seconds = _point_seconds(
+                self.value,
+                CALENDAR.mode,
+                WorkflowSpecifics.DUMP_FORMAT,
+                WorkflowSpecifics.ASSUMED_TIME_ZONE,
+            )
+        return self._seconds
+
     def add(self, other):
         """Add an Interval to self."""
-        return ISO8601Point(self._iso_point_add(
+        ret = ISO8601Point(self._iso_point_add(
             self.value, other.value, CALENDAR.mode
         ))
+        if self._seconds is not None:
+            seconds = _interval_seconds(other.value)
+            if seconds is not None:
+                ret._seconds = self._seconds + seconds
+        return ret
 
     def standardise(self):
         """Reformat self.value into a standard representation."""
         try:
             self.value = str(point_parse(self.value))
+            self._seconds = None
         except IsodatetimeError as exc:
             if self.value.startswith("+") or self.value.startswith("-"):
                 message = WARNING_PARSE_EXPANDED_YEAR_DIGITS % (
@@ -111,9 +137,14 @@ class ISO8601Point(PointBase):
             return ISO8601Interval(self._iso_point_sub_point(
                 self.value, other.value, CALENDAR.mode
             ))
-        return ISO8601Point(self._iso_point_sub_interval(
+        ret = ISO8601Point(self._iso_point_sub_interval(
             self.value, other.value, CALENDAR.mode
         ))
+        if self._seconds is not None:
+            seconds = _interval_seconds(other.value)
+            if seconds is not None:
+                ret._seconds = self._seconds - seconds
+        return ret
 
     @staticmethod
     @lru_cache(10000)
@@ -124,8 +155,40 @@ class ISO8601Point(PointBase):
         return str(point + interval)
 
     def _cmp(self, other: 'ISO8601Point') -> int:
+        seconds = self.seconds
+        other_seconds = other.seconds
+        if seconds != other_seconds:
+            return -1 if seconds < other_seconds else 1
+        # (sub-second differences)
         return self._iso_point_cmp(self.value, other.value, CALENDAR.mode)
 
+    def __eq__(self, other: object) -> bool:
+        if type(other) is ISO8601Point:
+            if self.value == other.value:
+                return True
+            if self.seconds != other.seconds:
+                return False
+        return super().__eq__(other)
+
+    def __lt__(self, other: 'PointBase') -> bool:
+        if (
+            type(other) is ISO8601Point
+            and self.seconds != other.seconds
+        ):
+            return self.seconds < other.seconds
+        return super().__lt__(other)
+
+    def __gt__(self, other: 'PointBase') -> bool:
+        if (
+            type(other) is ISO8601Point
+            and self.seconds != other.seconds
+        ):
+            return self.seconds > other.seconds
+        return super().__gt__(other)
+
+    def __hash__(self) -> int:
+        return hash(self.seconds)
+
     @staticmethod
     @lru_cache(10000)
     def _iso_point_cmp(point_string, other_point_string, _calendar_mode):
@@ -290,6 +353,124 @@ class ISO8601Exclusions(ExclusionBase):
                     self.exclusion_points.append(exclusion_point)
 
 
+class _RegularRecurrence:
+
+    """Integer representation of a recurrence with a fixed step.
+
+    The points of a recurrence with a start point and an exact duration
+    (e.g. PT6H or P1D but not P1M) are start + k * duration for k >= 0.
+    They can be located by integer arithmetic on seconds since the epoch
+    rather than by iterating over the recurrence from its start.
+
+    The point strings are kept for a window of consecutive indices k,
+    which is extended one step at a time as sequences are walked.
+    """
+
+    MAX_WINDOW = 1000
+
+    __slots__ = ('start', 'start_seconds', 'duration', 'step', 'min_index',
+                 'max_index', '_first_index', '_values', '_first', '_last')
+
+    @classmethod
+    def from_recurrence(cls, recurrence) -> 'Optional[_RegularRecurrence]':
+        """Return the integer representation of a recurrence if possible."""
+        start = recurrence.start_point
+        duration = recurrence.duration
+        if (
+            start is None
+            or start.truncated
+            or duration is None
+            or not duration.is_exact()
+        ):
+            return None
+        step = duration.get_seconds()
+        if step <= 0 or step != int(step):
+            return None
+        return cls(recurrence, int(step))
+
+    def __init__(self, recurrence, step: int):
+        self.start = recurrence.start_point
+        self.start_seconds = _timepoint_seconds(self.start)
+        self.duration = recurrence.duration
+        self.step = step
+
+        # the range of valid indices
+        self.min_index = 0
+        if recurrence.min_point is not None:
+            self.min_index = max(
+                0, self.ceil_index(_timepoint_seconds(recurrence.min_point)))
+        self.max_index: Optional[int] = None
+        for point in (recurrence.end_point, recurrence.max_point):
+            if point is not None:
+                index = self.floor_index(_timepoint_seconds(point))
+                if self.max_index is None or index < self.max_index:
+                    self.max_index = index
+
+        self._first_index = 0
+        self._values = [str(self.start)]
+        self._first = self._last = self.start
+
+    def floor_index(self, seconds: int) -> int:
+        """Return the largest k where point k <= seconds."""
+        return (seconds - self.start_seconds) // self.step
+
+    def ceil_index(self, seconds: int) -> int:
+        """Return the smallest k where point k >= seconds."""
+        return -((self.start_seconds - seconds) // self.step)
+
+    def in_bounds(self, index: int) -> bool:
+        return index >= self.min_index and (
+            self.max_index is None or index <= self.max_index)
+
+    def get_index(self, seconds: int) -> Optional[int]:
+        """Return k where point k == seconds, or None."""
+        index, remainder = divmod(seconds - self.start_seconds, self.step)
+        if remainder or not self.in_bounds(index):
+            return None
+        return index
+
+    def get_first_index(self, seconds: int) -> Optional[int]:
+        """Return the smallest valid k where point k >= seconds, or None."""
+        index = max(self.min_index, self.ceil_index(seconds))
+        if not self.in_bounds(index):
+            return None
+        return index
+
+    def get_last_index(self, seconds: int) -> Optional[int]:
+        """Return the largest valid k where point k < seconds, or None."""
+        index = self.ceil_index(seconds) - 1
+        if self.max_index is not None:
+            index = min(index, self.max_index)
+        if not self.in_bounds(index):
+            return None
+        return index
+
+    def get_value(self, index: int) -> str:
+        """Return the point string for index k."""
+        offset = index - self._first_index
+        if 0 <= offset < len(self._values):
+            return self._values[offset]
+        if offset == len(self._values):
+            self._last = self._last + self.duration
+            self._values.append(str(self._last))
+            if len(self._values) > self.MAX_WINDOW:
+                del self._values[0]
+                self._first_index += 1
+                self._first = point_parse(self._values[0])
+            return self._values[-1]
+        if offset == -1 and len(self._values) < self.MAX_WINDOW:
+            self._first = self._first - self.duration
+            self._values.insert(0, str(self._first))
+            self._first_index -= 1
+            return self._values[0]
+        # jump to a new window
+        self._first = self._last = self.start + Duration(
+            seconds=index * self.step)
+        self._first_index = index
+        self._values = [str(self._first)]
+        return self._values[0]
+
+
 class ISO8601Sequence(SequenceBase):
 
     """A sequence of ISO8601 date time points separated by an interval.
@@ -317,7 +498,8 @@ class ISO8601Sequence(SequenceBase):
                  'offset', '_cached_first_point_values',
                  '_cached_next_point_values', '_cached_valid_point_booleans',
                  '_cached_recent_valid_points', 'spec', 'abbrev_util',
-                 'recurrence', 'exclusions', 'step', 'value', 'is_on_sequence')
+                 'recurrence', 'exclusions', 'step', 'value', 'is_on_sequence',
+                 '_regular')
 
     @classmethod
     def get_async_expr(cls, start_point=None):
@@ -400,6 +582,7 @@ class ISO8601Sequence(SequenceBase):
                     exclusion_end_point)
 
         self.step = ISO8601Interval(str(self.recurrence.duration))
+        self._regular = _RegularRecurrence.from_recurrence(self.recurrence)
         self.value = str(self.recurrence)
         # Concatenate the strings in exclusion list
         if self.exclusions:
@@ -416,6 +599,7 @@ class ISO8601Sequence(SequenceBase):
     def set_offset(self, i_offset):
         """Deprecated: alter state to i_offset the entire sequence."""
         self.recurrence += interval_parse(str(i_offset))
+        self._regular = _RegularRecurrence.from_recurrence(self.recurrence)
         self._cached_first_point_values = {}
         self._cached_next_point_values = {}
         self._cached_valid_point_booleans = {}
@@ -431,6 +615,9 @@ class ISO8601Sequence(SequenceBase):
         if self.exclusions and point in self.exclusions:
             return False
 
+        if self._regular:
+            return self._regular.get_index(point.seconds) is not None
+
         for valid_point in reversed(self._cached_recent_valid_points):
             if valid_point == point:
                 return True
@@ -461,6 +648,15 @@ class ISO8601Sequence(SequenceBase):
         """Return the previous point < point, or None if out of bounds."""
         # may be None if out of the recurrence bounds
         res = None
+        if self._regular:
+            index = self._regular.get_index(point.seconds)
+            if index is not None:
+                if not self._regular.in_bounds(index - 1):
+                    return None
+                res = ISO8601Point(self._regular.get_value(index - 1))
+                if self.exclusions and res in self.exclusions:
+                    return self.get_prev_point(res)
+                return res
         prev_point = self.recurrence.get_prev(point_parse(point.value))
         if prev_point:
             res = ISO8601Point(str(prev_point))
@@ -480,6 +676,11 @@ class ISO8601Sequence(SequenceBase):
         """Return the largest point < some arbitrary point."""
         if self.is_on_sequence(point):
             return self.get_prev_point(point)
+        if self._regular and not self.exclusions:
+            index = self._regular.get_last_index(point.seconds)
+            if index is None:
+                return None
+            return ISO8601Point(self._regular.get_value(index))
         p_iso_point = point_parse(point.value)
         prev_cycle_point = None
 
@@ -507,6 +708,16 @@ class ISO8601Sequence(SequenceBase):
 
     def get_next_point(self, point):
         """Return the next point > p, or None if out of bounds."""
+        if self._regular:
+            index = self._regular.get_first_index(point.seconds + 1)
+            while index is not None:
+                next_point = ISO8601Point(self._regular.get_value(index))
+                if not self.exclusions or next_point not in self.exclusions:
+                    return next_point
+                index += 1
+                if not self._regular.in_bounds(index):
+                    return None
+            return None
         with contextlib.suppress(KeyError):
             return ISO8601Point(self._cached_next_point_values[point.value])
         # Iterate starting at recent valid points, for speed.
@@ -561,6 +772,15 @@ class ISO8601Sequence(SequenceBase):
         """Return the on-sequence point > point assuming that point is
         on-sequence, or None if out of bounds."""
         result = None
+        if self._regular:
+            index = self._regular.get_index(point.seconds)
+            if index is not None:
+                if not self._regular.in_bounds(index + 1):
+                    return None
+                result = ISO8601Point(self._regular.get_value(index + 1))
+                if self.exclusions and result in self.exclusions:
+                    return self.get_next_point_on_sequence(result)
+                return result
         next_point = self.recurrence.get_next(point_parse(point.value))
         if next_point:
             result = ISO8601Point(str(next_point))
@@ -579,6 +799,14 @@ class ISO8601Sequence(SequenceBase):
         point: ISO8601Point
     ) -> Optional[ISO8601Point]:
         """Return the first point >= to point, or None if out of bounds."""
+        if self._regular:
+            index = self._regular.get_first_index(point.seconds)
+            if index is None:
+                return None
+            ret = ISO8601Point(self._regular.get_value(index))
+            if self.exclusions and ret in self.exclusions:
+                return self.get_next_point_on_sequence(ret)
+            return ret
         with contextlib.suppress(KeyError):
             return ISO8601Point(self._cached_first_point_values[point.value])
         p_iso_point = point_parse(point.value)
@@ -599,6 +827,9 @@ class ISO8601Sequence(SequenceBase):
 
     def get_start_point(self):
         """Return the first point in this sequence, or None."""
+        if self._regular:
+            return self.get_first_point(
+                ISO8601Point(self._regular.get_value(0)))
         for recurrence_iso_point in self.recurrence:
             point = ISO8601Point(str(recurrence_iso_point))
             # Check for multiple exclusions
@@ -613,6 +844,17 @@ class ISO8601Sequence(SequenceBase):
                  self.recurrence.min_point is not None) and
                 (self.recurrence.end_point is not None or
                  self.recurrence.max_point is not None))):
+            regular = self._regular
+            if (
+                regular
+                and regular.max_index is not None
+                and regular.max_index >= regular.min_index
+            ):
+                ret = ISO8601Point(regular.get_value(regular.max_index))
+                if self.exclusions and ret in self.exclusions:
+                    return ISO8601Point(
+                        regular.get_value(regular.max_index - 1))
+                return ret
             curr = None
             prev = None
             for recurrence_iso_point in self.recurrence:
@@ -945,6 +1187,36 @@ def _interval_parse(interval_string):
     return WorkflowSpecifics.interval_parser.parse(interval_string)
 
 
+def _timepoint_seconds(timepoint: 'TimePoint') -> int:
+    """Return the number of seconds since the epoch of a time point."""
+    return int(timepoint.seconds_since_unix_epoch)
+
+
+@lru_cache(10000)
+def _point_seconds(point_string: str, _calendar_mode, _dump_fmt, _tz) -> int:
+    """Return the number of seconds since the epoch of a point string.
+
+    Args:
+        point_string: The string to parse.
+        _calendar_mode: Only used to avoid invalid cache hits.
+        _dump_fmt: Only used to avoid invalid cache hits.
+        _tz: Only used to avoid invalid cache hits.
+    """
+    return _timepoint_seconds(point_parse(point_string))
+
+
+@lru_cache(1000)
+def _interval_seconds(interval_string: str) -> Optional[int]:
+    """Return the number of seconds in an exact interval, else None."""
+    duration = interval_parse(interval_string)
+    if not duration.is_exact():
+        return None
+    seconds = duration.get_seconds()
+    if seconds != int(seconds):
+        return None
+    return int(seconds)
+
+
 def point_parse(point_string: str) -> 'TimePoint':
     """Parse a point_string into a proper TimePoint object."""
     return _point_parse(
@@ -20,6 +20,7 @@
     B605: start_process_with_a_shell
     https://docs.openstack.org/developer/bandit/plugins/start_process_with_a_shell.html
 """
+import asyncio
 from shlex import split
 from subprocess import PIPE, STDOUT, DEVNULL, Popen  # nosec
 
@@ -57,3 +58,22 @@ def procopen(cmd, bufsize=0, executable=None, stdin=None, stdout=None,
                     universal_newlines, startupinfo, creationflags)
 
     return process
+
+
+async def aprocopen(cmd, stdin=None, preexec_fn=None, usesh=False, env=None):
+    """Asyncio equivalent of procopen.
+
+    Returns an asyncio.subprocess.Process with STDOUT/STDERR pipes which are
+    read by the event loop.
+
+    If usesh is True, cmd is run by "/bin/sh -c" (as Popen would), in which
+    case cmd may be a string or a list of the command string followed by
+    arguments for the shell.
+    """
+    if usesh:
+        if isinstance(cmd, str):
+            cmd = [cmd]
+        cmd = ['/bin/sh', '-c', *cmd]
+    return await asyncio.create_subprocess_exec(  # nosec
+        *cmd, stdin=stdin, stdout=PIPE, stderr=PIPE,
+        preexec_fn=preexec_fn, env=env)
@@ -54,9 +54,11 @@ Packaging methods are included for dissemination of protobuf messages.
 
 """
 
+from bisect import bisect_left, insort
 from contextlib import suppress
 from collections import Counter, deque
 from copy import deepcopy
+from itertools import chain, count
 import json
 from time import time
 from typing import (
@@ -159,6 +161,17 @@ DELTAS_MAP = {
 }
 
 DELTA_FIELDS = {DELTA_ADDED, DELTA_UPDATED, DELTA_PRUNED}
+# data-store versions, unique over reloads (see DataStoreMgr.data_version)
+DATA_VERSIONS = count()
+
+_ALL_DELTAS_FIELD_NUMBERS = {
+    field.name: field.number for field in AllDeltas.DESCRIPTOR.fields
+}
+# Wire type 2 (length-delimited) tags of the AllDeltas message fields
+_ALL_DELTAS_TAGS = {
+    name: bytes([number << 3 | 2])
+    for name, number in _ALL_DELTAS_FIELD_NUMBERS.items()
+}
 
 JOB_STATUSES_ALL = [
     TASK_STATUS_SUBMITTED,
@@ -228,6 +241,148 @@ def generate_checksum(in_strings):
     return zlib.adler32(''.join(sorted(in_strings)).encode()) & 0xffffffff
 
 
+def adler32_combine(adler1: int, adler2: int, len2: int) -> int:
+    """Return the Adler-32 checksum of two concatenated byte strings.
+
+    Args:
+        adler1: Checksum of the first string.
+        adler2: Checksum of the second string.
+        len2: Length of the second string.
+
+    Examples:
+        >>> adler32_combine(
+        ...     zlib.adler32(b'foo'), zlib.adler32(b'bar'), 3
+        ... ) == zlib.adler32(b'foobar')
+        True
+
+    """
+    base = 65521
+    sum1 = adler1 & 0xffff
+    sum2 = (
+        (adler1 >> 16) + (adler2 >> 16) + len2 * (sum1 - 1)
+    ) % base
+    sum1 = (sum1 + (adler2 & 0xffff) - 1) % base
+    return (sum2 << 16) | sum1
+
+
+class StringsChecksum:
+    """Maintain the generate_checksum of a changing collection of strings.
+
+    The strings are kept sorted in blocks, each with the checksum and
+    length of its content. Adding or removing a string only invalidates the
+    checksum of its block, the total is then combined from the blocks
+    (see adler32_combine).
+
+    Examples:
+        >>> checksum = StringsChecksum()
+        >>> for string in ('b', 'c', 'a'):
+        ...     checksum.add(string)
+        >>> checksum.remove('c')
+        >>> checksum.value == generate_checksum(['a', 'b'])
+        True
+
+    """
+
+    # Max number of strings in a block (blocks are split above this)
+    BLOCK_SIZE = 128
+
+    def __init__(self):
+        self._blocks: List[List[str]] = []
+        # the last (largest) string in each block
+        self._maxes: List[str] = []
+        # (checksum, length) of each block, None if changed
+        self._sums: List[Optional[Tuple[int, int]]] = []
+
+    def add(self, string: str) -> None:
+        """Add a string."""
+        if not self._blocks:
+            self._blocks.append([string])
+            self._maxes.append(string)
+            self._sums.append(None)
+            return
+        index = min(bisect_left(self._maxes, string), len(self._blocks) - 1)
+        block = self._blocks[index]
+        insort(block, string)
+        self._maxes[index] = block[-1]
+        self._sums[index] = None
+        if len(block) > self.BLOCK_SIZE:
+            half = len(block) // 2
+            self._blocks[index:index + 1] = [block[:half], block[half:]]
+            self._maxes[index:index + 1] = [block[half - 1], block[-1]]
+            self._sums[index:index + 1] = [None, None]
+
+    def remove(self, string: str) -> None:
+        """Remove a string (which must have been added)."""
+        index = bisect_left(self._maxes, string)
+        block = self._blocks[index]
+        del block[bisect_left(block, string)]
+        if block:
+            self._maxes[index] = block[-1]
+            self._sums[index] = None
+        else:
+            del self._blocks[index]
+            del self._maxes[index]
+            del self._sums[index]
+
+    @property
+    def value(self) -> int:
+        """The checksum of the strings."""
+        checksum = zlib.adler32(b'')
+        for index, block in enumerate(self._blocks):
+            block_sum = self._sums[index]
+            if block_sum is None:
+                data = ''.join(block).encode()
+                block_sum = (zlib.adler32(data), len(data))
+                self._sums[index] = block_sum
+            checksum = adler32_combine(checksum, *block_sum)
+        return checksum & 0xffffffff
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer as a protobuf varint.
+
+    Examples:
+        >>> encode_varint(1)
+        b'\\x01'
+        >>> encode_varint(300)
+        b'\\xac\\x02'
+
+    """
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def serialize_all_deltas(serialized_deltas: Dict[str, bytes]) -> bytes:
+    """Combine serialized deltas into a serialized AllDeltas message.
+
+    The wire format of a message field is its tag and length followed by
+    the serialized sub message, so the deltas need not be serialized again.
+
+    Args:
+        serialized_deltas: Serialized deltas by AllDeltas field name.
+
+    Examples:
+        >>> deltas = {WORKFLOW: WDeltas(time=1.0), JOBS: JDeltas(time=2.0)}
+        >>> AllDeltas.FromString(serialize_all_deltas({
+        ...     key: delta.SerializeToString()
+        ...     for key, delta in deltas.items()
+        ... })) == AllDeltas(**deltas)
+        True
+
+    """
+    return b''.join(
+        _ALL_DELTAS_TAGS[key] + encode_varint(len(data)) + data
+        for key, data in sorted(
+            serialized_deltas.items(),
+            key=lambda item: _ALL_DELTAS_FIELD_NUMBERS[item[0]],
+        )
+    )
+
+
 def task_mean_elapsed_time(tdef):
     """Calculate task mean elapsed time."""
     if tdef.elapsed_times:
@@ -421,6 +576,83 @@ def create_delta_store(delta=None, workflow_id=None):
     return delta_store
 
 
+def merge_element(key, element, update):
+    """Return a copy of an element with an update merged in.
+
+    Fields are cleared and merged as in apply_delta.
+    """
+    merged = type(element)()
+    merged.CopyFrom(element)
+    field_set = {field.name for field, _ in update.ListFields()}
+    for field in CLEAR_FIELD_MAP[key]:
+        if field in field_set or (key == WORKFLOW and update.states_updated):
+            merged.ClearField(field)
+    merged.MergeFrom(update)
+    return merged
+
+
+def merge_delta_stores(delta_store, new_delta_store):
+    """Combine two delta stores into one.
+
+    Applying the result has the same effect as applying the two delta stores
+    in order. Neither delta store is modified (the added elements of a delta
+    store may be those of the data store itself).
+
+    Args:
+        delta_store (dict):
+            Delta store, as returned by create_delta_store.
+        new_delta_store (dict):
+            Delta store which follows delta_store.
+
+    Returns:
+        dict
+
+    """
+    merged = create_delta_store()
+    for store in (delta_store, new_delta_store):
+        if 'id' in store:
+            merged['id'] = store['id']
+    added = merged[DELTA_ADDED]
+    updated = merged[DELTA_UPDATED]
+    pruned = merged[DELTA_PRUNED]
+
+    # workflow
+    new_added = new_delta_store[DELTA_ADDED][WORKFLOW]
+    new_updated = new_delta_store[DELTA_UPDATED][WORKFLOW]
+    if new_added.ListFields():
+        # the workflow has been replaced
+        added[WORKFLOW] = new_added
+        updated[WORKFLOW] = new_updated
+    else:
+        added[WORKFLOW] = delta_store[DELTA_ADDED][WORKFLOW]
+        updated[WORKFLOW] = delta_store[DELTA_UPDATED][WORKFLOW]
+        if new_updated.ListFields():
+            updated[WORKFLOW] = merge_element(
+                WORKFLOW, updated[WORKFLOW], new_updated)
+
+    # other elements
+    for key in pruned:
+        added[key] = dict(delta_store[DELTA_ADDED][key])
+        updated[key] = dict(delta_store[DELTA_UPDATED][key])
+        pruned[key] = list(delta_store[DELTA_PRUNED][key])
+        for e_id, element in new_delta_store[DELTA_ADDED][key].items():
+            # (re)added elements replace any earlier updates or pruning
+            added[key][e_id] = element
+            updated[key].pop(e_id, None)
+            if e_id in pruned[key]:
+                pruned[key].remove(e_id)
+        for e_id, element in new_delta_store[DELTA_UPDATED][key].items():
+            if e_id in updated[key]:
+                element = merge_element(key, updated[key][e_id], element)
+            updated[key][e_id] = element
+        for e_id in new_delta_store[DELTA_PRUNED][key]:
+            added[key].pop(e_id, None)
+            updated[key].pop(e_id, None)
+            if e_id not in pruned[key]:
+                pruned[key].append(e_id)
+    return merged
+
+
 class DataStoreMgr:
     """Manage the workflow data store.
 
@@ -519,6 +751,16 @@ class DataStoreMgr:
         self.updates_pending = False
         self.updates_pending_follow_on = False
         self.publish_pending = False
+        # the checksummed string of each element, and the checksum of each
+        # element type
+        self.checksum_strings: Dict[str, Dict[str, str]] = {
+            key: {} for key in self.deltas if key != WORKFLOW
+        }
+        self.checksums: Dict[str, StringsChecksum] = {
+            key: StringsChecksum() for key in self.checksum_strings
+        }
+        # changes whenever the data-store changes (e.g. for caching)
+        self.data_version = next(DATA_VERSIONS)
 
     def initiate_data_model(self, reloaded=False):
         """Initiate or Update data model on start/restart/reload.
@@ -2639,43 +2881,59 @@ class DataStoreMgr:
         data = self.data[self.workflow_id]
         for key, delta in self.deltas.items():
             if delta.ListFields():
+                self.data_version = next(DATA_VERSIONS)
                 apply_delta(key, delta, data)
+                if key != WORKFLOW:
+                    self.update_checksum(key, delta)
+
+    def update_checksum(self, key, delta):
+        """Update the checksum of an element type from an applied delta.
+
+        Only the elements in the delta are visited, the result is the same
+        as generate_checksum over the whole element type.
+        """
+        elements = self.data[self.workflow_id][key]
+        strings = self.checksum_strings[key]
+        s_att = 'id' if key == EDGES else 'stamp'
+        checksum = self.checksums[key]
+        for e_id in chain(
+            (e.id for e in delta.added),
+            (e.id for e in delta.updated),
+            delta.pruned,
+        ):
+            string = strings.pop(e_id, None)
+            if string is not None:
+                checksum.remove(string)
+            element = elements.get(e_id)
+            if element is not None:
+                string = getattr(element, s_att)
+                strings[e_id] = string
+                checksum.add(string)
 
     def apply_delta_checksum(self):
         """Construct checksum on deltas for export."""
-        data = self.data[self.workflow_id]
         update_time = time()
         for key, delta in self.deltas.items():
             if delta.ListFields():
                 delta.time = update_time
                 if hasattr(delta, 'checksum'):
-                    if key == EDGES:
-                        s_att = 'id'
-                    else:
-                        s_att = 'stamp'
-                    delta.checksum = generate_checksum(
-                        [getattr(e, s_att)
-                         for e in data[key].values()]
-                    )
+                    delta.checksum = self.checksums[key].value
 
     def clear_delta_batch(self):
         """Clear current deltas."""
-        # Potential shared reference, avoid clearing
-        self.deltas = {
-            EDGES: EDeltas(),
-            FAMILIES: FDeltas(),
-            FAMILY_PROXIES: FPDeltas(),
-            JOBS: JDeltas(),
-            TASKS: TDeltas(),
-            TASK_PROXIES: TPDeltas(),
-            WORKFLOW: WDeltas(),
-        }
+        # Published deltas are serialized, so these can be reused
+        for delta in self.deltas.values():
+            delta.Clear()
 
     def clear_delta_store(self):
         """Clear current delta store."""
-        # Potential shared reference, avoid clearing
-        self.added = deepcopy(DATA_TEMPLATE)
-        self.updated = deepcopy(DATA_TEMPLATE)
+        # Elements are copied into the deltas, so the stores can be reused
+        for store in (self.added, self.updated):
+            for key, elements in store.items():
+                if key == WORKFLOW:
+                    elements.Clear()
+                else:
+                    elements.clear()
 
     # Message collation and dissemination methods:
     def get_entire_workflow(self):
@@ -2700,19 +2958,29 @@ class DataStoreMgr:
         return workflow_msg
 
     def get_publish_deltas(self):
-        """Return deltas for publishing."""
-        all_deltas = DELTAS_MAP[ALL_DELTAS]()
-        result = []
-        for key, delta in self.deltas.items():
-            if delta.ListFields():
-                result.append(
-                    (key.encode('utf-8'), delta, 'SerializeToString'))
-                getattr(all_deltas, key).CopyFrom(delta)
+        """Return deltas for publishing.
+
+        Each delta is serialized once, the resulting bytes are immutable so
+        can be handed to the publisher thread as they are.
+
+        Returns:
+            list: [(topic, serialized delta)]
+
+        """
+        serialized = {
+            key: delta.SerializeToString()
+            for key, delta in self.deltas.items()
+            if delta.ListFields()
+        }
+        result = [
+            (key.encode('utf-8'), data)
+            for key, data in serialized.items()
+        ]
         result.append(
-            (ALL_DELTAS.encode('utf-8'), all_deltas, 'SerializeToString')
+            (ALL_DELTAS.encode('utf-8'), serialize_all_deltas(serialized))
         )
         self.publish_pending = True
-        return deepcopy(result)
+        return result
 
     def get_data_elements(self, element_type):
         """Get elements of a given type in the form of a delta.
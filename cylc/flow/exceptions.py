@@ -313,6 +313,27 @@ class ClientTimeout(CylcError):
         return self.message
 
 
+class JobsAgentError(CylcError):
+    """A job command could not be run by a remote jobs agent.
+
+    Args:
+        message:
+            The reason.
+        sent:
+            True if the command had been sent to the agent (so may have
+            run), False if the command can safely be run by other means.
+
+    """
+
+    def __init__(self, message: str, sent: bool = False):
+        self.message = message
+        self.sent = sent
+        super().__init__(message, sent)
+
+    def __str__(self) -> str:
+        return self.message
+
+
 class CyclingError(CylcError):
     """Base class for errors in cycling configuration."""
 
@@ -17,11 +17,15 @@
 """Functionality for selecting a host from pre-defined list."""
 import ast
 from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import suppress
 from functools import lru_cache
 from io import BytesIO
 import json
+import os
+from pathlib import Path
 import random
-from time import sleep
+from time import time
 import token
 from tokenize import tokenize
 
@@ -33,12 +37,17 @@ from cylc.flow.exceptions import (
     NoHostsError,
 )
 from cylc.flow.hostuserutil import get_fqdn_by_host, is_remote_host
+from cylc.flow.pathutil import expand_path
 from cylc.flow.remote import run_cmd, cylc_server_cmd
 from cylc.flow.terminal import parse_dirty_json
 
 
 GLBL_CFG_STR = 'global.cylc[scheduler][run hosts]ranking'
 
+# Cache of host metrics shared between host selections
+# (see global.cylc[scheduler][run hosts]ranking cache duration)
+METRICS_CACHE_FILE = '~/.cylc/flow/host-metrics.json'
+
 
 def select_workflow_host(cached=True):
     """Return a host as specified in `[workflow hosts]`.
@@ -79,7 +88,16 @@ def select_workflow_host(cached=True):
         blacklist=global_config.get(
             ['scheduler', 'run hosts', 'condemned']
         ),
-        blacklist_name='condemned host'
+        blacklist_name='condemned host',
+        timeout=global_config.get(
+            ['scheduler', 'run hosts', 'ranking timeout']
+        ),
+        quorum=global_config.get(
+            ['scheduler', 'run hosts', 'ranking quorum']
+        ),
+        cache_duration=global_config.get(
+            ['scheduler', 'run hosts', 'ranking cache duration']
+        ),
     )
 
 
@@ -87,7 +105,10 @@ def select_host(
     hosts,
     ranking_string=None,
     blacklist=None,
-    blacklist_name=None
+    blacklist_name=None,
+    timeout=None,
+    quorum=None,
+    cache_duration=None,
 ):
     """Select a host from the provided list.
 
@@ -122,6 +143,13 @@ def select_host(
         blacklist_name (str):
             The reason for blacklisting these hosts
             (used for exceptions).
+        timeout (float):
+            The maximum time to wait for host metrics (seconds).
+        quorum (int):
+            Stop waiting for host metrics once this many hosts have passed
+            the ranking thresholds.
+        cache_duration (float):
+            Reuse cached host metrics up to this old (seconds).
 
     Raises:
         HostSelectException:
@@ -183,8 +211,22 @@ def select_host(
 
     # filter and sort by rankings
     metrics = list({x for x, _ in rankings})  # required metrics
+
+    def is_good(host, host_results):
+        # does the host pass the ranking thresholds
+        return bool(
+            _filter_by_ranking([host], rankings, {host: host_results})[0]
+        )
+
     results, data = _get_metrics(  # get data from each host
-        hosts, metrics, data)
+        hosts,
+        metrics,
+        data,
+        timeout=timeout,
+        quorum=quorum,
+        is_good=is_good,
+        cache_duration=cache_duration,
+    )
     hosts = list(results)  # some hosts might not be contactable
 
     # stop here if we don't need to proceed
@@ -520,12 +562,24 @@ def _deserialise(metrics, data):
     return data
 
 
-def _get_metrics(hosts, metrics, data=None):
+def _get_metrics(
+    hosts,
+    metrics,
+    data=None,
+    timeout=None,
+    quorum=None,
+    is_good=None,
+    cache_duration=None,
+):
     """Retrieve host metrics using SSH if necessary.
 
+    The metrics are requested from all hosts at once.
+
     Note hosts will not appear in the returned results if:
     * They are not contactable.
     * There is an error in the command which returns the results.
+    * They do not respond within the timeout.
+    * The quorum was reached before they responded.
 
     Args:
         hosts (list):
@@ -534,6 +588,15 @@ def _get_metrics(hosts, metrics, data=None):
             List in the form [(function, arg1, arg2, ...), ...]
         data (dict):
             Used for logging success/fail outcomes of the form {host: {}}
+        timeout (float):
+            Stop waiting for hosts after this many seconds.
+        quorum (int):
+            Stop waiting for hosts once this many "good" hosts have returned.
+        is_good (callable):
+            Function(host, {metric: result}) which returns True for "good"
+            hosts (all hosts are good if not provided).
+        cache_duration (float):
+            Use (and update) cached metrics up to this old (seconds).
 
     Examples:
         Command failure (no such attribute of psutil):
@@ -546,9 +609,31 @@ def _get_metrics(hosts, metrics, data=None):
     """
     host_stats = {}
     proc_map = {}
+    raw_results = {}
+    n_good = 0
     if not data:
         data = {host: {} for host in hosts}
 
+    def _add_result(host, raw):
+        nonlocal n_good
+        host_stats[host] = dict(zip(
+            metrics,
+            # convert JSON dicts -> namedtuples
+            _deserialise(metrics, list(raw))
+        ))
+        if is_good is None or is_good(host, host_stats[host]):
+            n_good += 1
+
+    if cache_duration:
+        for host, raw in _read_metrics_cache(
+            hosts, metrics, cache_duration
+        ).items():
+            _add_result(host, raw)
+            data[host]['cached'] = True
+
+    if quorum and n_good >= quorum:
+        return host_stats, data
+
     # Start up commands on hosts
     cmd = ['psutil']
     kwargs = {
@@ -556,6 +641,8 @@ def _get_metrics(hosts, metrics, data=None):
         'capture_process': True
     }
     for host in hosts:
+        if host in host_stats:
+            continue
         if is_remote_host(host):
             try:
                 proc_map[host] = cylc_server_cmd(cmd, host=host, **kwargs)
@@ -564,29 +651,119 @@ def _get_metrics(hosts, metrics, data=None):
                 continue
         else:
             proc_map[host] = run_cmd(['cylc'] + cmd, **kwargs)
+    if not proc_map:
+        return host_stats, data
+
+    # Collect results from commands as they return
+    deadline = None
+    if timeout:
+        deadline = time() + timeout
+    with ThreadPoolExecutor(len(proc_map)) as executor:
+        futures = {
+            executor.submit(proc.communicate): host
+            for host, proc in proc_map.items()
+        }
+        pending = set(futures)
+        while pending and not (quorum and n_good >= quorum):
+            done, pending = wait(
+                pending,
+                timeout=None if deadline is None else deadline - time(),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for future in done:
+                host = futures[future]
+                proc = proc_map[host]
+                out, err = (stream.strip() for stream in future.result())
+                if proc.wait():
+                    # Command failed
+                    LOG.warning(
+                        'Error evaluating ranking expression on'
+                        f' {host}: \n{err}'
+                    )
+                else:
+                    raw_results[host] = parse_dirty_json(out)
+                    _add_result(host, raw_results[host])
+                data[host]['returncode'] = proc.returncode
+
+        # Abandon the rest
+        for future in pending:
+            host = futures[future]
+            with suppress(OSError):
+                proc_map[host].kill()
+            if not (quorum and n_good >= quorum):
+                LOG.warning(f'Timed out getting metrics from {host}')
+                data[host]['timed out'] = True
+    for future in pending:
+        # (reap the killed processes)
+        proc_map[futures[future]].wait()
+
+    if cache_duration and raw_results:
+        _write_metrics_cache(metrics, raw_results, cache_duration)
+    return host_stats, data
+
+
+def _read_metrics_cache(hosts, metrics, max_age):
+    """Return cached metrics for hosts, if no older than max_age (seconds).
+
+    Returns:
+        dict - {host: [result, ...]} results in the order of metrics.
 
-    # Collect results from commands
-    while proc_map:
-        for host, proc in list(proc_map.copy().items()):
-            if proc.poll() is None:
+    """
+    try:
+        with open(expand_path(METRICS_CACHE_FILE)) as handle:
+            cache = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    ret = {}
+    now = time()
+    keys = [json.dumps(list(metric)) for metric in metrics]
+    for host in hosts:
+        try:
+            entry = cache[host]
+            if now - entry['time'] > max_age:
                 continue
-            del proc_map[host]
-            out, err = (stream.strip() for stream in proc.communicate())
-            if proc.wait():
-                # Command failed
-                LOG.warning(
-                    'Error evaluating ranking expression on'
-                    f' {host}: \n{err}'
-                )
-            else:
-                host_stats[host] = dict(zip(
-                    metrics,
-                    # convert JSON dicts -> namedtuples
-                    _deserialise(metrics, parse_dirty_json(out))
-                ))
-            data[host]['returncode'] = proc.returncode
-        sleep(0.01)
-    return host_stats, data
+            ret[host] = [entry['metrics'][key] for key in keys]
+        except (KeyError, TypeError):
+            continue
+    return ret
+
+
+def _write_metrics_cache(metrics, raw_results, max_age):
+    """Add host metrics to the cache, drop entries older than max_age."""
+    path = expand_path(METRICS_CACHE_FILE)
+    try:
+        with open(path) as handle:
+            cache = json.load(handle)
+        if not isinstance(cache, dict):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    now = time()
+    cache = {
+        host: entry
+        for host, entry in cache.items()
+        if isinstance(entry, dict) and now - entry.get('time', 0) <= max_age
+    }
+    for host, results in raw_results.items():
+        cache[host] = {
+            'time': now,
+            'metrics': {
+                json.dumps(list(metric)): result
+                for metric, result in zip(metrics, results)
+            },
+        }
+    tmp_path = f'{path}.{os.getpid()}'
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w') as handle:
+            json.dump(cache, handle)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        LOG.debug(f'Could not write host metrics cache: {exc}')
+        with suppress(OSError):
+            os.unlink(tmp_path)
 
 
 def _reformat_expr(key, expression):
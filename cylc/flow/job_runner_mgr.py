@@ -23,17 +23,22 @@ Please update this file as the interface changes.
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from contextvars import copy_context
+from functools import partial
 import json
 import os
 from pathlib import Path
 import shlex
 import stat
 import sys
+from threading import Lock
 import traceback
 from shutil import rmtree
 from signal import SIGKILL
 from subprocess import DEVNULL  # nosec
+from typing import Dict, Tuple
 
 from cylc.flow.task_message import (
     CYLC_JOB_PID, CYLC_JOB_INIT_TIME, CYLC_JOB_EXIT_TIME, CYLC_JOB_EXIT,
@@ -102,6 +107,13 @@ class JobPollContext():
         return '%s|%s' % (self.job_log_dir, json.dumps(ret))
 
 
+# Parsed job status files {path: ((st_mtime_ns, st_size), JobPollContext)}
+# (saves re-reading unchanged files in the jobs agent, which polls jobs
+# in-process; a "cylc jobs-poll" process starts with an empty cache)
+_STATUS_FILE_CACHE: Dict[str, Tuple[Tuple[int, int], JobPollContext]] = {}
+_STATUS_FILE_CACHE_LOCK = Lock()
+
+
 class JobRunnerManager():
     """Job submission, poll and kill.
 
@@ -118,6 +130,10 @@ class JobRunnerManager():
     LINE_PREFIX_JOB_RUNNER_CMD_TMPL = "# Job runner command template: "
     LINE_PREFIX_EXECUTION_TIME_LIMIT = "# Execution time limit: "
     LINE_PREFIX_EOF = "#EOF: "
+    # Number of threads used to read job status files
+    POLL_STATUS_FILE_THREADS = 8
+    # Max number of parsed job status files to cache
+    POLL_STATUS_FILE_CACHE_SIZE = 10000
     LINE_PREFIX_JOB_LOG_DIR = "# Job log directory: "
     OUT_PREFIX_COMMAND = "[TASK JOB COMMAND]"
     OUT_PREFIX_MESSAGE = "[TASK JOB MESSAGE]"
@@ -223,19 +239,37 @@ class JobRunnerManager():
         job_log_root -- The log/job/ sub-directory of the workflow.
         job_log_dirs -- A list containing point/name/submit_num for jobs.
 
+        The job status files are read concurrently. Results for jobs which
+        do not need to be polled via their job runner are written (and
+        flushed) first, the rest follow once the job runners have been
+        polled.
+
         """
         if "$" in job_log_root:
             job_log_root = os.path.expandvars(job_log_root)
         self.configure_workflow_run_dir(job_log_root.rsplit(os.sep, 2)[0])
 
-        ctx_list = []  # Contexts for all relevant jobs
+        ctx_list = []  # Contexts for jobs to poll via their job runner
         ctx_list_by_job_runner = {}  # {job_runner_name1: [ctx1, ...], ...}
 
-        for job_log_dir in job_log_dirs:
-            ctx = self._jobs_poll_status_files(job_log_root, job_log_dir)
+        read_status_file = partial(self._jobs_poll_status_files, job_log_root)
+        if len(job_log_dirs) > 1:
+            # (run in copies of this context so the jobs agent can redirect
+            # the STDERR of each command)
+            context = copy_context()
+            with ThreadPoolExecutor(self.POLL_STATUS_FILE_THREADS) as pool:
+                futures = [
+                    pool.submit(context.copy().run, read_status_file, d)
+                    for d in job_log_dirs
+                ]
+                ctxs = [future.result() for future in futures]
+        else:
+            ctxs = [read_status_file(job_log_dir)
+                    for job_log_dir in job_log_dirs]
+
+        for ctx in ctxs:
             if ctx is None:
                 continue
-            ctx_list.append(ctx)
 
             if not ctx.job_runner_name or not ctx.job_id:
                 # Lost job runner information for some reason.
@@ -250,28 +284,35 @@ class JobRunnerManager():
             # * Jobs succeeded or failed with ERR/EXIT.
             if (ctx.job_runner_exit_polled or ctx.run_status == 0 or
                     ctx.run_signal in ["ERR", "EXIT"]):
+                self._jobs_poll_write(ctx)
                 continue
 
+            ctx_list.append(ctx)
             if ctx.job_runner_name not in ctx_list_by_job_runner:
                 ctx_list_by_job_runner[ctx.job_runner_name] = []
             ctx_list_by_job_runner[ctx.job_runner_name].append(ctx)
+        sys.stdout.flush()
 
         for job_runner_name, my_ctx_list in ctx_list_by_job_runner.items():
             self._jobs_poll_runner(
                 job_log_root, job_runner_name, my_ctx_list)
 
-        cur_time_str = get_current_time_string()
         for ctx in ctx_list:
-            for message in ctx.messages:
-                sys.stdout.write("%s%s|%s|%s\n" % (
-                    self.OUT_PREFIX_MESSAGE,
-                    cur_time_str,
-                    ctx.job_log_dir,
-                    message))
-            sys.stdout.write("%s%s|%s\n" % (
-                self.OUT_PREFIX_SUMMARY,
+            self._jobs_poll_write(ctx)
+
+    def _jobs_poll_write(self, ctx):
+        """Write the messages and summary of a polled job to STDOUT."""
+        cur_time_str = get_current_time_string()
+        for message in ctx.messages:
+            sys.stdout.write("%s%s|%s|%s\n" % (
+                self.OUT_PREFIX_MESSAGE,
                 cur_time_str,
-                ctx.get_summary_str()))
+                ctx.job_log_dir,
+                message))
+        sys.stdout.write("%s%s|%s\n" % (
+            self.OUT_PREFIX_SUMMARY,
+            cur_time_str,
+            ctx.get_summary_str()))
 
     def jobs_submit(self, job_log_root, job_log_dirs, remote_mode=False,
                     utc_mode=False):
@@ -432,12 +473,23 @@ class JobRunnerManager():
         return out, err, job_id
 
     def _jobs_poll_status_files(self, job_log_root, job_log_dir):
-        """Helper 1 for self.jobs_poll(job_log_root, job_log_dirs)."""
+        """Helper 1 for self.jobs_poll(job_log_root, job_log_dirs).
+
+        Status files which have not changed since they were last read by
+        this process are not read again.
+        """
         ctx = JobPollContext(job_log_dir)
+        path = os.path.join(job_log_root, ctx.job_log_dir, JOB_LOG_STATUS)
         try:
-            with open(
-                os.path.join(job_log_root, ctx.job_log_dir, JOB_LOG_STATUS)
-            ) as handle:
+            with open(path) as handle:
+                # (stat the open file so the key matches the content read)
+                stat_result = os.fstat(handle.fileno())
+                file_key = (stat_result.st_mtime_ns, stat_result.st_size)
+                cached = _STATUS_FILE_CACHE.get(path)
+                if cached is not None and cached[0] == file_key:
+                    ctx.update(cached[1])
+                    ctx.messages = list(ctx.messages)
+                    return ctx
                 for line in handle:
                     if "=" not in line:
                         continue
@@ -468,6 +520,15 @@ class JobRunnerManager():
             sys.stderr.write(f"{exc}\n")
             return
 
+        cached_ctx = JobPollContext(job_log_dir)
+        cached_ctx.update(ctx)
+        cached_ctx.messages = list(ctx.messages)
+        with _STATUS_FILE_CACHE_LOCK:
+            _STATUS_FILE_CACHE.pop(path, None)
+            if len(_STATUS_FILE_CACHE) >= self.POLL_STATUS_FILE_CACHE_SIZE:
+                # drop the least recently read
+                del _STATUS_FILE_CACHE[next(iter(_STATUS_FILE_CACHE))]
+            _STATUS_FILE_CACHE[path] = (file_key, cached_ctx)
         return ctx
 
     def _jobs_poll_runner(self, job_log_root, job_runner_name, my_ctx_list):
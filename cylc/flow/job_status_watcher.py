@@ -0,0 +1,207 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Watch job status files for changes using Linux inotify.
+
+See "[scheduler]watch job status files".
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+from contextlib import suppress
+import os
+import struct
+from typing import Callable, Dict, Optional, Set
+
+from cylc.flow.task_job_logs import JOB_LOG_STATUS
+
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# struct inotify_event {int wd; uint32_t mask, cookie, len; char name[];}
+EVENT_HEADER = struct.Struct('iIII')
+
+_LIBC = None
+
+
+def _get_libc():
+    """Return the C library, raise OSError if it has no inotify."""
+    global _LIBC
+    if _LIBC is None:
+        libc = ctypes.CDLL(
+            ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        for func in ('inotify_init1', 'inotify_add_watch', 'inotify_rm_watch'):
+            if not hasattr(libc, func):
+                raise OSError(f'{func} not available')
+        _LIBC = libc
+    return _LIBC
+
+
+def _check(ret: int) -> int:
+    """Raise OSError if a libc call failed."""
+    if ret < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return ret
+
+
+def parse_events(data: bytes):
+    """Yield (watch descriptor, mask, name) from inotify output.
+
+    Examples:
+        >>> name = b'job.status\\0\\0'
+        >>> data = EVENT_HEADER.pack(1, IN_CLOSE_WRITE, 0, len(name)) + name
+        >>> list(parse_events(data * 2))
+        [(1, 8, 'job.status'), (1, 8, 'job.status')]
+
+    """
+    offset = 0
+    while offset + EVENT_HEADER.size <= len(data):
+        wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+        offset += EVENT_HEADER.size
+        name = data[offset:offset + length].rstrip(b'\0').decode(
+            errors='replace')
+        offset += length
+        yield wd, mask, name
+
+
+class JobStatusWatcher:
+    """Watch job log directories for changes to their job status files.
+
+    Directories are identified by their path relative to the job log root,
+    e.g. "1/foo/01".
+
+    Args:
+        job_log_root: The workflow job log directory.
+        wakeup: Function to call when a job status file has changed.
+
+    Raises:
+        OSError: If inotify is not available.
+
+    """
+
+    # Max amount of inotify output to read at once (bytes)
+    READ_SIZE = 65536
+
+    def __init__(
+        self,
+        job_log_root: str,
+        wakeup: Optional[Callable[[], None]] = None,
+    ):
+        self.job_log_root = job_log_root
+        self.wakeup = wakeup
+        self._libc = _get_libc()
+        self.fd: Optional[int] = _check(
+            self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC))
+        # {job_log_dir: wd}, {wd: job_log_dir}
+        self.watches: Dict[str, int] = {}
+        self._dirs: Dict[int, str] = {}
+        self._changed: Set[str] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        with suppress(RuntimeError):
+            self._loop = asyncio.get_running_loop()
+            self._loop.add_reader(self.fd, self._on_readable)
+
+    def watch(self, job_log_dir: str) -> bool:
+        """Start watching a job log directory.
+
+        Returns False if the directory cannot be watched, e.g. if it does
+        not exist.
+        """
+        if self.fd is None:
+            return False
+        if job_log_dir in self.watches:
+            return True
+        path = os.path.join(self.job_log_root, job_log_dir)
+        wd = self._libc.inotify_add_watch(
+            self.fd,
+            os.fsencode(path),
+            IN_CLOSE_WRITE | IN_MOVED_TO | IN_ONLYDIR,
+        )
+        if wd < 0:
+            return False
+        self.watches[job_log_dir] = wd
+        self._dirs[wd] = job_log_dir
+        return True
+
+    def unwatch(self, job_log_dir: str) -> None:
+        """Stop watching a job log directory."""
+        wd = self.watches.pop(job_log_dir, None)
+        if wd is None:
+            return
+        self._dirs.pop(wd, None)
+        self._changed.discard(job_log_dir)
+        if self.fd is not None:
+            # (fails harmlessly if the directory has been removed)
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def _read(self) -> None:
+        """Read pending inotify events."""
+        if self.fd is None:
+            return
+        while True:
+            try:
+                data = os.read(self.fd, self.READ_SIZE)
+            except BlockingIOError:
+                return
+            if not data:
+                return
+            for wd, mask, name in parse_events(data):
+                if mask & IN_Q_OVERFLOW:
+                    # events lost, assume everything has changed
+                    self._changed.update(self.watches)
+                elif mask & IN_IGNORED:
+                    # watch removed, e.g. the directory has been deleted
+                    job_log_dir = self._dirs.pop(wd, None)
+                    if (
+                        job_log_dir is not None
+                        and self.watches.get(job_log_dir) == wd
+                    ):
+                        del self.watches[job_log_dir]
+                elif name == JOB_LOG_STATUS and wd in self._dirs:
+                    self._changed.add(self._dirs[wd])
+
+    def _on_readable(self) -> None:
+        self._read()
+        if self._changed and self.wakeup:
+            self.wakeup()
+
+    def get_changed(self) -> Set[str]:
+        """Return the watched directories with changed job status files."""
+        self._read()
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def close(self) -> None:
+        """Stop watching all directories."""
+        if self.fd is None:
+            return
+        if self._loop is not None:
+            with suppress(RuntimeError):
+                # (RuntimeError if the loop is closed)
+                self._loop.remove_reader(self.fd)
+        os.close(self.fd)
+        self.fd = None
+        self.watches.clear()
+        self._dirs.clear()
+        self._changed.clear()
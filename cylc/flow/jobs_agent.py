@@ -0,0 +1,450 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Run job commands on remote platforms via long-lived agents.
+
+A "cylc jobs-agent" process is started on a remote platform host over SSH
+and kept running for the life of the scheduler. It runs the "jobs-submit",
+"jobs-poll" and "jobs-kill" commands in-process, so that each command pays
+for neither an SSH connection, a login shell nor a Python start-up.
+
+The scheduler and the agent exchange JSON messages over the STDIN/STDOUT of
+the SSH connection. Each message is preceded by a line containing its length
+in bytes.
+
+* On start-up the agent sends ``{"version": <cylc version>}``.
+* Requests: ``{"id": <int>, "cmd": [<arg>, ...], "stdin": <str>}``.
+* Responses: ``{"id": <int>, "ret_code": <int>, "out": <str>, "err": <str>}``.
+
+The agent runs each command in its own thread, so a slow command (e.g. a
+"jobs-submit" to a busy job runner) does not hold up the others. Responses are
+returned as the commands finish, which may not be the order they were received.
+"""
+
+import asyncio
+from contextlib import suppress
+from contextvars import ContextVar
+from importlib import import_module
+from io import StringIO
+from itertools import count
+import json
+import os
+from signal import SIGKILL
+from subprocess import PIPE  # nosec
+import sys
+from threading import Lock, Thread
+from time import time
+import traceback
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from cylc.flow import LOG, __version__ as CYLC_VERSION
+from cylc.flow.cylc_subproc import aprocopen
+from cylc.flow.exceptions import JobsAgentError
+from cylc.flow.remote import construct_ssh_cmd
+
+if TYPE_CHECKING:
+    from asyncio.subprocess import Process
+
+
+# the commands an agent will run
+AGENT_COMMANDS = {'jobs-submit', 'jobs-poll', 'jobs-kill'}
+
+# the STDIN, STDOUT and STDERR of the command running in the current context
+_STREAMS: 'Dict[str, ContextVar[IO[str]]]' = {
+    name: ContextVar(f'jobs_agent_{name}')
+    for name in ('stdin', 'stdout', 'stderr')
+}
+
+
+class _StreamProxy:
+    """Stand-in for sys.stdin/stdout/stderr which redirects per context.
+
+    This allows commands to run concurrently in threads, each with its own
+    STDIN, STDOUT and STDERR. Threads started by a command must be run in a
+    copy of its context (see contextvars.copy_context) to share its streams.
+
+    Args:
+        var: Holds the stream of the current context.
+        default: The stream to use outside of commands.
+
+    """
+
+    def __init__(self, var: 'ContextVar[IO[str]]', default: IO[str]):
+        self._var = var
+        self._default = default
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._var.get(self._default), name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._var.get(self._default))
+
+
+def encode_frame(msg: Dict[str, Any]) -> bytes:
+    """Encode a message for sending.
+
+    Examples:
+        >>> encode_frame({'id': 1})
+        b'9\\n{"id": 1}'
+
+    """
+    data = json.dumps(msg).encode()
+    return b'%d\n%s' % (len(data), data)
+
+
+def _parse_header(line: bytes) -> Optional[int]:
+    """Return the message length from a header line.
+
+    Returns None for anything else, e.g. output from a login shell.
+
+    Examples:
+        >>> _parse_header(b'42\\n')
+        42
+        >>> _parse_header(b'Welcome to the HPC!\\n')
+
+    """
+    line = line.strip()
+    if line.isdigit():
+        return int(line)
+    return None
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[dict]:
+    """Read a message from a stream, return None at EOF."""
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        length = _parse_header(line)
+        if length is not None:
+            break
+    try:
+        return json.loads(await reader.readexactly(length))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def read_frame_sync(stream: IO[bytes]) -> Optional[dict]:
+    """Read a message from a binary file, return None at EOF."""
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        length = _parse_header(line)
+        if length is not None:
+            break
+    data = stream.read(length)
+    if len(data) < length:
+        return None
+    return json.loads(data)
+
+
+def run_command(cmd: List[str], stdin: str = '') -> Tuple[int, str, str]:
+    """Run a "cylc jobs-*" command in this process.
+
+    Args:
+        cmd: The command, e.g. ["jobs-poll", "--", ...].
+        stdin: Content for the STDIN of the command.
+
+    Returns:
+        (ret_code, out, err)
+
+    """
+    name, *args = cmd
+    if name not in AGENT_COMMANDS:
+        return 1, '', f'jobs-agent: command not supported: {name}\n'
+    for stream_name, var in _STREAMS.items():
+        if not isinstance(getattr(sys, stream_name), _StreamProxy):
+            setattr(
+                sys, stream_name, _StreamProxy(var, getattr(sys, stream_name))
+            )
+    out = StringIO()
+    err = StringIO()
+    tokens = [
+        (var, var.set(stream))
+        for var, stream in (
+            (_STREAMS['stdin'], StringIO(stdin)),
+            (_STREAMS['stdout'], out),
+            (_STREAMS['stderr'], err),
+        )
+    ]
+    try:
+        module = import_module(
+            f'cylc.flow.scripts.{name.replace("-", "_")}')
+        module.main(*args)
+        ret_code = 0
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            ret_code = exc.code or 0
+        else:
+            print(exc.code, file=sys.stderr)
+            ret_code = 1
+    except Exception:
+        traceback.print_exc()
+        ret_code = 1
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+    return ret_code, out.getvalue(), err.getvalue()
+
+
+def serve() -> None:
+    """Run commands received on STDIN until EOF ("cylc jobs-agent").
+
+    Each command runs in its own thread. At EOF, any running commands are
+    allowed to finish before returning.
+
+    The STDIN and STDOUT file descriptors are moved out of the way first so
+    that commands (and any job runner commands they run) cannot read from or
+    write to the message stream.
+    """
+    stream_in = os.fdopen(os.dup(0), 'rb')
+    stream_out = os.fdopen(os.dup(1), 'wb')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    write_lock = Lock()
+
+    def _run(msg: dict) -> None:
+        ret_code, out, err = run_command(msg['cmd'], msg.get('stdin', ''))
+        with write_lock:
+            stream_out.write(encode_frame({
+                'id': msg['id'],
+                'ret_code': ret_code,
+                'out': out,
+                'err': err,
+            }))
+            stream_out.flush()
+
+    stream_out.write(encode_frame({'version': CYLC_VERSION}))
+    stream_out.flush()
+    threads: List[Thread] = []
+    while True:
+        msg = read_frame_sync(stream_in)
+        if msg is None:
+            break
+        threads = [thread for thread in threads if thread.is_alive()]
+        thread = Thread(target=_run, args=(msg,), daemon=True)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+
+class JobsAgent:
+    """A "cylc jobs-agent" process on a remote platform host.
+
+    The agent is started on first use. If it cannot be started it is not
+    tried again until RESTART_DELAY has passed.
+
+    Args:
+        platform: The platform to run the agent on.
+        host: The platform host to run the agent on.
+
+    """
+
+    # Max time (s) for the agent to start
+    START_TIMEOUT = 60.0
+    # Min time (s) between attempts to start an agent
+    RESTART_DELAY = 300.0
+    # Amount of agent STDERR to keep for error messages (bytes)
+    STDERR_TAIL = 4096
+
+    def __init__(self, platform: dict, host: str):
+        self.platform = platform
+        self.host = host
+        self.proc: 'Optional[Process]' = None
+        self.failed_at: Optional[float] = None
+        self.closed = False
+        self._ready: 'Optional[asyncio.Future[bool]]' = None
+        self._requests: 'Dict[int, asyncio.Future]' = {}
+        self._ids = count()
+        self._stderr = b''
+        self._tasks: 'List[asyncio.Task]' = []
+
+    def __str__(self) -> str:
+        return f'jobs-agent {self.platform["name"]}:{self.host}'
+
+    async def run(
+        self, cmd: List[str], stdin: str = ''
+    ) -> Tuple[int, str, str]:
+        """Run a command via the agent.
+
+        Args:
+            cmd: The command, e.g. ["jobs-poll", "--", ...].
+            stdin: Content for the STDIN of the command.
+
+        Returns:
+            (ret_code, out, err)
+
+        Raises:
+            JobsAgentError:
+                If the agent is not available (sent=False) or if it died
+                before it returned the result (sent=True).
+
+        """
+        if self.closed:
+            raise JobsAgentError(f'{self} closed')
+        if self._ready is None:
+            if (
+                self.failed_at is not None
+                and time() < self.failed_at + self.RESTART_DELAY
+            ):
+                raise JobsAgentError(f'{self} not available')
+            self._ready = asyncio.get_running_loop().create_future()
+            self._tasks = [asyncio.ensure_future(self._start())]
+        if (
+            not await asyncio.shield(self._ready)
+            or self.proc is None
+            or self.proc.stdin is None
+        ):
+            raise JobsAgentError(f'{self} not available')
+        proc_stdin = self.proc.stdin
+
+        id_ = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._requests[id_] = future
+        try:
+            try:
+                proc_stdin.write(
+                    encode_frame({'id': id_, 'cmd': cmd, 'stdin': stdin})
+                )
+                await proc_stdin.drain()
+            except OSError as exc:
+                raise JobsAgentError(f'{self} not available: {exc}')
+            return await future
+        finally:
+            # (a response which arrives after a time out is ignored)
+            self._requests.pop(id_, None)
+
+    async def _start(self) -> None:
+        """Start the agent and read its responses until it exits."""
+        ready = self._ready
+        if ready is None:
+            return
+        cmd = construct_ssh_cmd(['jobs-agent'], self.platform, self.host)
+        LOG.debug(f'[{self}] starting: {" ".join(cmd)}')
+        try:
+            self.proc = proc = await aprocopen(
+                cmd, stdin=PIPE, preexec_fn=os.setpgrp)
+            if proc.stdout is None:
+                raise JobsAgentError('no STDOUT')
+            stdout = proc.stdout
+            self._tasks.append(asyncio.ensure_future(self._read_stderr()))
+            hello = await asyncio.wait_for(
+                read_frame(stdout), self.START_TIMEOUT)
+            if not hello or 'version' not in hello:
+                raise JobsAgentError('no response')
+        except (
+            OSError, ValueError, asyncio.TimeoutError, JobsAgentError
+        ) as exc:
+            self._fail(f'failed to start ({exc!r})')
+            return
+        if hello['version'] != CYLC_VERSION:
+            LOG.warning(
+                f'[{self}] remote version {hello["version"]}'
+                f' != {CYLC_VERSION}'
+            )
+        LOG.debug(f'[{self}] started')
+        if ready.done():
+            # (killed whilst starting)
+            return
+        ready.set_result(True)
+        while self.proc is not None:
+            try:
+                msg = await read_frame(stdout)
+            except ValueError as exc:
+                self._fail(f'bad response ({exc!r})')
+                return
+            if msg is None:
+                # (the agent exits when closed)
+                self._fail('connection lost', kill=not self.closed)
+                return
+            id_ = msg.get('id')
+            future = None if id_ is None else self._requests.get(id_)
+            if future is not None and not future.done():
+                future.set_result(
+                    (msg['ret_code'], msg['out'], msg['err'])
+                )
+
+    async def _read_stderr(self) -> None:
+        """Keep the tail of the agent STDERR for error messages."""
+        if self.proc is None or self.proc.stderr is None:
+            return
+        stream = self.proc.stderr
+        while True:
+            data = await stream.read(self.STDERR_TAIL)
+            if not data:
+                return
+            self._stderr = (self._stderr + data)[-self.STDERR_TAIL:]
+
+    def _fail(self, reason: str, kill: bool = True) -> None:
+        """Handle failure of the agent.
+
+        Fails any outstanding requests and kills the agent, a new one will
+        be started on demand after RESTART_DELAY.
+        """
+        if not self.closed:
+            msg = f'[{self}] {reason}'
+            if self._stderr.strip():
+                msg += f'\n{self._stderr.decode(errors="replace").strip()}'
+            LOG.warning(msg)
+        self.failed_at = time()
+        if self._ready is not None and not self._ready.done():
+            self._ready.set_result(False)
+        self._ready = None
+        for future in self._requests.values():
+            if not future.done():
+                future.set_exception(JobsAgentError(
+                    f'{self} {reason}', sent=True))
+        self._requests.clear()
+        if kill:
+            self._kill()
+        self.proc = None
+
+    def _kill(self) -> None:
+        """Kill the agent SSH process."""
+        proc, self.proc = self.proc, None
+        if proc is not None and proc.returncode is None:
+            with suppress(ProcessLookupError, PermissionError):
+                os.killpg(proc.pid, SIGKILL)
+
+    def kill(self, reason: str) -> None:
+        """Kill the agent, failing any outstanding requests."""
+        if self._ready is not None:
+            self._fail(reason)
+
+    def close(self) -> None:
+        """Stop the agent, once any running command has returned."""
+        self.closed = True
+        if self.proc is not None and self.proc.stdin is not None:
+            self.proc.stdin.close()
+
+    def terminate(self) -> None:
+        """Kill the agent now."""
+        self.closed = True
+        self.kill('terminated')
+        for task in self._tasks:
+            task.cancel()
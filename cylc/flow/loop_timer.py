@@ -0,0 +1,191 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Time the phases of the scheduler main loop.
+
+The main loop calls :meth:`LoopTimer.lap` at the end of each phase. The time
+spent in each phase in each loop is kept for a window of recent loops, from
+which statistics and histograms are computed on request (see
+"cylc loop-timings").
+"""
+
+from bisect import bisect_right
+from collections import deque
+from math import ceil
+from time import perf_counter
+from typing import Any, Deque, Dict, List, Optional
+
+
+# main loop phases
+PHASE_COMMANDS = 'command queue'
+PHASE_PROC_POOL = 'proc pool'
+PHASE_XTRIGGERS = 'xtriggers'
+PHASE_RELEASE = 'release'
+PHASE_MESSAGES = 'task messages'
+PHASE_EVENTS = 'task events'
+PHASE_DATA_STORE = 'data store'
+PHASE_DATABASE = 'database'
+PHASE_PLUGINS = 'plugins'
+PHASE_OTHER = 'other'
+# time spent waiting for something to do (not included in the loop time)
+PHASE_SLEEP = 'sleep'
+# the total time spent in all phases except sleep
+PHASE_LOOP = 'loop'
+
+PHASES = (
+    PHASE_COMMANDS,
+    PHASE_PROC_POOL,
+    PHASE_XTRIGGERS,
+    PHASE_RELEASE,
+    PHASE_MESSAGES,
+    PHASE_EVENTS,
+    PHASE_DATA_STORE,
+    PHASE_DATABASE,
+    PHASE_PLUGINS,
+    PHASE_OTHER,
+)
+
+
+class PhaseTimes:
+    """The times spent in a main loop phase.
+
+    Args:
+        window: The number of recent loops to keep times for.
+
+    """
+
+    __slots__ = ('count', 'total', 'times')
+
+    def __init__(self, window: int):
+        # since start-up
+        self.count = 0
+        self.total = 0.0
+        # recent loops
+        self.times: Deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.times.append(seconds)
+
+
+def percentile(times: List[float], fraction: float) -> float:
+    """Return a percentile of sorted times (nearest rank).
+
+    Examples:
+        >>> percentile([1, 2, 3, 4], 0.5)
+        2
+        >>> percentile([1, 2, 3, 4], 0.99)
+        4
+        >>> percentile([], 0.5)
+        0.0
+
+    """
+    if not times:
+        return 0.0
+    index = ceil(fraction * len(times)) - 1
+    return times[min(max(index, 0), len(times) - 1)]
+
+
+class LoopTimer:
+    """Time the phases of the scheduler main loop.
+
+    Call :meth:`start` at the start of each loop, :meth:`lap` at the end of
+    each phase and :meth:`stop` at the end of the loop. A phase may be
+    lapped more than once in a loop, the times are added together.
+
+    Args:
+        window: The number of recent loops to keep times for.
+
+    """
+
+    # The number of recent loops to keep times for
+    WINDOW = 1000
+    # Histogram bucket upper bounds (s)
+    BUCKETS = (
+        0.0001, 0.0002, 0.0005,
+        0.001, 0.002, 0.005,
+        0.01, 0.02, 0.05,
+        0.1, 0.2, 0.5,
+        1.0, 2.0, 5.0,
+        10.0,
+    )
+
+    def __init__(self, window: Optional[int] = None):
+        window = window or self.WINDOW
+        self.phases: Dict[str, PhaseTimes] = {
+            phase: PhaseTimes(window)
+            for phase in (PHASE_LOOP, *PHASES, PHASE_SLEEP)
+        }
+        self._laps: Dict[str, float] = {}
+        self._last = 0.0
+
+    def start(self) -> None:
+        """Start timing a loop."""
+        self._laps.clear()
+        self._last = perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """Record the time since the last lap against a phase."""
+        now = perf_counter()
+        self._laps[phase] = self._laps.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def stop(self) -> None:
+        """Finish timing a loop."""
+        loop = 0.0
+        for phase in PHASES:
+            seconds = self._laps.get(phase, 0.0)
+            loop += seconds
+            self.phases[phase].add(seconds)
+        self.phases[PHASE_SLEEP].add(self._laps.get(PHASE_SLEEP, 0.0))
+        self.phases[PHASE_LOOP].add(loop)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Return statistics for each phase over the recent loops.
+
+        Times are in seconds. The "share" is the fraction of the loop time
+        (excluding sleep) spent in the phase.
+        """
+        loop_total = sum(self.phases[PHASE_LOOP].times)
+        ret = []
+        for name, phase in self.phases.items():
+            times = sorted(phase.times)
+            window_total = sum(times)
+            histogram: List[Dict[str, Optional[float]]] = []
+            below = 0
+            for bound in self.BUCKETS:
+                count = bisect_right(times, bound)
+                histogram.append({'le': bound, 'count': count - below})
+                below = count
+            histogram.append({'le': None, 'count': len(times) - below})
+            ret.append({
+                'name': name,
+                'count': phase.count,
+                'total': phase.total,
+                'loops': len(times),
+                'mean': window_total / len(times) if times else 0.0,
+                'max': times[-1] if times else 0.0,
+                'p50': percentile(times, 0.5),
+                'p90': percentile(times, 0.9),
+                'p99': percentile(times, 0.99),
+                'share': (
+                    window_total / loop_total
+                    if loop_total and name != PHASE_SLEEP
+                    else None
+                ),
+                'histogram': histogram,
+            })
+        return ret
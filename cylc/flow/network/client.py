@@ -21,7 +21,7 @@ import os
 from shutil import which
 import socket
 import sys
-from typing import Any, Optional, Union, Dict
+from typing import Any, Optional, Set, Union, Dict
 
 import zmq
 import zmq.asyncio
@@ -42,6 +42,10 @@ from cylc.flow.network import (
     ZMQSocketBase
 )
 from cylc.flow.network.client_factory import CommsMeth
+from cylc.flow.network.graphql import (
+    PERSISTED_QUERY_NOT_FOUND,
+    get_query_hash,
+)
 from cylc.flow.network.server import PB_METHOD_MAP
 from cylc.flow.workflow_files import (
     detect_old_contact_file,
@@ -76,6 +80,9 @@ class WorkflowRuntimeClientBase(metaclass=ABCMeta):
         self.timeout = (
             float(timeout) if timeout is not None else self.DEFAULT_TIMEOUT
         )
+        # hashes of queries registered with the scheduler,
+        # None if the scheduler does not support persisted queries
+        self._persisted_queries: Optional[Set[str]] = set()
 
     @abstractmethod
     async def async_request(
@@ -125,6 +132,56 @@ class WorkflowRuntimeClientBase(metaclass=ABCMeta):
 
     __call__ = serial_request
 
+    async def graphql_request(
+        self,
+        request_string: str,
+        variables: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> object:
+        """Send a GraphQL request as a persisted query.
+
+        The first time a request is sent it is registered with the scheduler,
+        after that only its hash is sent. Use this for requests which are
+        sent repeatedly.
+
+        Has the same return values as ``serial_request``.
+
+        """
+        if self._persisted_queries is None:
+            return await self.async_request(
+                'graphql',
+                {'request_string': request_string, 'variables': variables},
+                timeout,
+            )
+        query_hash = get_query_hash(request_string)
+        args = {'variables': variables, 'query_hash': query_hash}
+        if query_hash in self._persisted_queries:
+            ret = await self.async_request('graphql', args, timeout)
+            if ret != [{'error': {'message': PERSISTED_QUERY_NOT_FOUND}}]:
+                return ret
+            # the scheduler has forgotten the query (e.g. it has restarted)
+            self._persisted_queries.discard(query_hash)
+        try:
+            ret = await self.async_request(
+                'graphql',
+                {**args, 'request_string': request_string},
+                timeout,
+            )
+        except ClientError as exc:
+            if 'query_hash' not in str(exc.message):
+                raise
+            # BACK COMPAT: scheduler without persisted queries
+            # from:
+            #     8.3.0
+            # remove at:
+            #     9.0?
+            self._persisted_queries = None
+            return await self.graphql_request(
+                request_string, variables, timeout
+            )
+        self._persisted_queries.add(query_hash)
+        return ret
+
     def timeout_handler(self) -> None:
         """Handle the eventuality of a communication timeout with the workflow.
 
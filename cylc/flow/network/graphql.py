@@ -19,9 +19,23 @@ GraphQL Middleware defined here also.
 
 """
 
+from collections import OrderedDict
 from functools import partial
+from hashlib import sha256
 import logging
-from typing import TYPE_CHECKING, Any, Tuple, Union
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from inspect import isclass, iscoroutinefunction
 
@@ -34,6 +48,8 @@ from graphql.language.base import parse, print_ast
 from graphql.language import ast
 from graphql.backend.base import GraphQLBackend, GraphQLDocument
 from graphql.backend.core import execute_and_validate
+from graphql.execution import ExecutionResult, execute
+from graphql.validation import validate
 from graphql.utils.base import type_from_ast
 from graphql.type import get_named_type
 from promise import Promise
@@ -42,7 +58,6 @@ from rx import Observable
 from cylc.flow.network.schema import NODE_MAP, get_type_str
 
 if TYPE_CHECKING:
-    from graphql.execution import ExecutionResult
     from graphql.language.ast import Document
     from graphql.type import GraphQLSchema
 
@@ -53,6 +68,115 @@ STRIP_ARG = 'strip_null'
 NULL_VALUE = None
 EMPTY_VALUES: Tuple[list, dict] = ([], {})
 STRIP_OPS = {'query', 'subscription'}
+# returned in place of a result if a persisted query hash is unknown
+PERSISTED_QUERY_NOT_FOUND = 'PersistedQueryNotFound'
+
+T = TypeVar('T')
+
+
+class LRUCache(Generic[T]):
+    """A thread safe mapping which discards the least recently used items.
+
+    Examples:
+        >>> cache = LRUCache(2)
+        >>> cache.put('a', 1)
+        >>> cache.put('b', 2)
+        >>> cache.get('a')
+        1
+        >>> cache.put('c', 3)
+        >>> cache.get('b') is None
+        True
+        >>> len(cache)
+        2
+
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: 'OrderedDict[Hashable, T]' = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[T]:
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return None
+            return self._items[key]
+
+    def put(self, key: Hashable, value: T) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def get_query_hash(request_string: str) -> str:
+    """Return the hash used to identify a persisted query.
+
+    Examples:
+        >>> get_query_hash('query { workflows { id } }')[:16]
+        'd89294350288d488'
+
+    """
+    return sha256(request_string.encode()).hexdigest()
+
+
+def is_query(document_ast: 'Document') -> bool:
+    """Return True if a document only contains queries.
+
+    Examples:
+        >>> is_query(parse('query { workflows { id } }'))
+        True
+        >>> is_query(parse('{ workflows { id } }'))
+        True
+        >>> is_query(parse('mutation { stop(workflows: []) { result } }'))
+        False
+
+    """
+    return all(
+        definition.operation == 'query'
+        for definition in document_ast.definitions
+        if isinstance(definition, ast.OperationDefinition)
+    )
+
+
+def get_field_names(document_ast: 'Document') -> Set[str]:
+    """Return the names of all fields selected in a document.
+
+    Includes the fields selected in fragments.
+
+    Examples:
+        >>> sorted(get_field_names(parse('{ workflows { id } }')))
+        ['id', 'workflows']
+        >>> sorted(get_field_names(parse(
+        ...     '{ ...f } fragment f on Query { workflows { ... on Workflow'
+        ...     ' { name } } }'
+        ... )))
+        ['name', 'workflows']
+
+    """
+    names: Set[str] = set()
+    selection_sets = [
+        definition.selection_set
+        for definition in document_ast.definitions
+        if getattr(definition, 'selection_set', None)
+    ]
+    while selection_sets:
+        for selection in selection_sets.pop().selections:
+            if isinstance(selection, ast.Field):
+                names.add(selection.name.value)
+            if getattr(selection, 'selection_set', None):
+                selection_sets.append(selection.selection_set)
+    return names
 
 
 def grow_tree(tree, path, leaves=None):
@@ -253,11 +377,21 @@ def execute_and_validate_and_strip(
     schema: 'GraphQLSchema',
     document_ast: 'Document',
     *args: Any,
+    validation_errors: Optional[List[Exception]] = None,
     **kwargs: Any
 ) -> Union['ExecutionResult', Observable]:
     """Wrapper around graphql ``execute_and_validate()`` that adds
-    null stripping."""
-    result = execute_and_validate(schema, document_ast, *args, **kwargs)
+    null stripping.
+
+    If the document has already been validated, the validation errors can be
+    provided to skip validating it again.
+    """
+    if validation_errors is None:
+        result = execute_and_validate(schema, document_ast, *args, **kwargs)
+    elif validation_errors and kwargs.get('validate', True):
+        result = ExecutionResult(errors=validation_errors, invalid=True)
+    else:
+        result = execute(schema, document_ast, *args, **kwargs)
     # Search request document to determine if 'stripNull: true' is set
     # as and argument. It can not be done in the middleware, as they
     # can be Promises/futures (so may not been resolved at this point).
@@ -277,6 +411,9 @@ class CylcGraphQLBackend(GraphQLBackend):
     The null value stripping of result is triggered by the presence
     of argument & value "stripNull: true" in any field.
 
+    Documents are parsed and validated once, then cached for reuse by
+    subsequent requests with the same document string.
+
     This is a modification of GraphQLCoreBackend found within:
         https://github.com/graphql-python/graphql-core-legacy
     (graphql-core==2.3.2)
@@ -284,11 +421,17 @@ class CylcGraphQLBackend(GraphQLBackend):
     Args:
 
         executor (object): Executor used in evaluating the resolvers.
+        cache_size (int): Max number of documents to cache.
 
     """
 
-    def __init__(self, executor=None):
+    CACHE_SIZE = 100
+
+    def __init__(self, executor=None, cache_size=None):
         self.execute_params = {"executor": executor}
+        self.documents: LRUCache[GraphQLDocument] = LRUCache(
+            cache_size or self.CACHE_SIZE
+        )
 
     def document_from_string(self, schema, document_string):
         """Parse string and setup request document for execution.
@@ -308,10 +451,24 @@ class CylcGraphQLBackend(GraphQLBackend):
         if isinstance(document_string, ast.Document):
             document_ast = document_string
             document_string = print_ast(document_ast)
-        else:
-            if not isinstance(document_string, str):
-                logger.error("The query must be a string")
+            return self._document(schema, document_string, document_ast)
+        if not isinstance(document_string, str):
+            logger.error("The query must be a string")
+        document = self.documents.get((schema, document_string))
+        if document is None:
             document_ast = parse(document_string)
+            document = self._document(
+                schema,
+                document_string,
+                document_ast,
+                validate(schema, document_ast),
+            )
+            self.documents.put((schema, document_string), document)
+        return document
+
+    def _document(
+        self, schema, document_string, document_ast, validation_errors=None
+    ):
         return GraphQLDocument(
             schema=schema,
             document_string=document_string,
@@ -320,6 +477,7 @@ class CylcGraphQLBackend(GraphQLBackend):
                 execute_and_validate_and_strip,
                 schema,
                 document_ast,
+                validation_errors=validation_errors,
                 **self.execute_params
             ),
         )
@@ -19,6 +19,7 @@ import asyncio
 from typing import Callable, Optional, Set, Union
 
 import zmq
+import zmq.asyncio
 
 from cylc.flow import LOG
 from cylc.flow.network import ZMQSocketBase
@@ -45,6 +46,9 @@ class WorkflowPublisher(ZMQSocketBase):
 
     """
 
+    # socket not None - gets assigned by self.start():
+    socket: zmq.asyncio.Socket
+
     def __init__(self, workflow: str, context: Optional[zmq.Context] = None):
         super().__init__(zmq.PUB, workflow, bind=True, context=context)
         self.topics: Set[bytes] = set()
@@ -80,7 +84,7 @@ class WorkflowPublisher(ZMQSocketBase):
         """
         if self.socket:
             self.topics.add(topic)
-            self.socket.send_multipart(
+            await self.socket.send_multipart(
                 [topic, serialize_data(data, serializer)]
             )
         # else we are in the process of shutting down - don't send anything
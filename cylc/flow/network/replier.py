@@ -15,10 +15,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Server for workflow runtime API."""
 
-from queue import Queue
-from typing import TYPE_CHECKING, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Set
 
 import zmq
+import zmq.asyncio
 
 from cylc.flow import LOG
 from cylc.flow.network import encode_, decode_, ZMQSocketBase
@@ -27,20 +29,32 @@ if TYPE_CHECKING:
     from cylc.flow.network.server import WorkflowRuntimeServer
 
 
+def _init_worker() -> None:
+    """Give each worker thread an event loop.
+
+    Endpoints are run synchronously, GraphQL runs its asyncio executor to
+    completion in the worker's loop.
+    """
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
 class WorkflowReplier(ZMQSocketBase):
     """Initiate the REP part of a ZMQ REQ-REP pattern.
 
-    This class contains the logic for the ZMQ message replier. The REQ/REP
-    pattern is serial, in that it cannot REQ or REP twice in a row. After
-    receiving you must send a response.
+    This class contains the logic for the ZMQ message replier. A ROUTER
+    socket is used so that requests from different clients can be served
+    concurrently, clients use REQ sockets so see a normal REQ-REP exchange.
 
     Usage:
         * Start the replier.
-        * Call the listener to process incoming REQ and send the REP.
+        * Run the listener in the server's event loop to process incoming
+          REQ and send the REP, cancel it to stop.
 
     Message Processing:
-        * Calls the server's receiver to process the command and
-            obtain a response.
+        * Calls the server's receiver in a worker thread to process the
+            command and obtain a response. Requests which may change the
+            scheduler state are served one at a time (see the server's
+            mutation_lock).
 
     Message interface:
         * Expects requests of the format: {"command": CMD, "args": {...}}
@@ -49,77 +63,107 @@ class WorkflowReplier(ZMQSocketBase):
 
     """
 
+    # socket not None - gets assigned by self.start():
+    socket: zmq.asyncio.Socket
+
+    # Max number of requests to process at once
+    MAX_WORKERS = 4
+
     def __init__(
         self,
         server: 'WorkflowRuntimeServer',
         context: Optional[zmq.Context] = None
     ):
         super().__init__(
-            zmq.REP, server.schd.workflow, bind=True, context=context
+            zmq.ROUTER, server.schd.workflow, bind=True, context=context
         )
         self.server = server
-        self.queue: 'Queue[str]' = Queue()
+        self.executor: Optional[ThreadPoolExecutor] = None
+        # requests being served
+        self.requests: Set[asyncio.Future] = set()
+
+    def _bespoke_start(self) -> None:
+        """Start the worker threads.
+
+        Overwrites Base method.
+
+        """
+        super()._bespoke_start()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS,
+            thread_name_prefix='cylc-replier',
+            initializer=_init_worker,
+        )
 
     def _bespoke_stop(self) -> None:
-        """Stop the listener and Authenticator.
+        """Stop serving requests.
 
         Overwrites Base method.
 
         """
         LOG.debug('stopping zmq replier...')
-        self.queue.put('STOP')
+        self.stopping = True
+        for request in self.requests:
+            request.cancel()
+        if self.executor:
+            self.executor.shutdown(wait=False)
 
-    def listener(self):
+    async def listener(self) -> None:
         """The server main loop, listen for and serve requests.
 
-        When called, this method will receive and respond until there are no
-        more messages then break to the caller.
+        Each request is served in a worker thread as it arrives, this
+        coroutine runs until it is cancelled or the replier is stopped.
 
         """
         # Note: we are using CurveZMQ to secure the messages (see
         # self.curve_auth, self.socket.curve_...key etc.). We have set up
         # public-key cryptography on the ZMQ messaging and sockets, so
         # there is no need to encrypt messages ourselves before sending.
-        while True:
-            # process any commands passed to the listener by its parent process
-            if self.queue.qsize():
-                command = self.queue.get()
-                if command == 'STOP':
-                    break
-                raise ValueError('Unknown command "%s"' % command)
-
+        while not self.stopping:
             try:
-                # Check for messages
-                msg = self.socket.recv_string(zmq.NOBLOCK)
-            except zmq.error.Again:
-                # No messages, break to parent loop/caller.
-                break
+                # [client identity, b'', message]
+                *envelope, msg = await self.socket.recv_multipart()
             except zmq.error.ZMQError as exc:
+                if self.stopping or self.socket.closed:
+                    break
                 LOG.exception('unexpected error: %s', exc)
                 continue
-            # attempt to decode the message, authenticating the user in the
-            # process
-            try:
-                message = decode_(msg)
-            except Exception as exc:  # purposefully catch generic exception
-                # failed to decode message, possibly resulting from failed
-                # authentication
-                LOG.exception('failed to decode message: "%s"', exc)
-                import traceback
-                response = encode_(
-                    {
-                        'error': {
-                            'message': 'failed to decode message: "%s"' % msg,
-                            'traceback': traceback.format_exc(),
-                        }
+            request = asyncio.ensure_future(self._serve(envelope, msg))
+            self.requests.add(request)
+            request.add_done_callback(self.requests.discard)
+
+    async def _serve(self, envelope: List[bytes], msg: bytes) -> None:
+        """Serve a request and send the response."""
+        response = await asyncio.get_running_loop().run_in_executor(
+            self.executor, self._respond, msg
+        )
+        if not self.socket.closed:
+            await self.socket.send_multipart([*envelope, response])
+
+    def _respond(self, msg: bytes) -> bytes:
+        """Return the response to a request."""
+        # attempt to decode the message, authenticating the user in the
+        # process
+        try:
+            message = decode_(msg.decode())
+        except Exception as exc:  # purposefully catch generic exception
+            # failed to decode message, possibly resulting from failed
+            # authentication
+            LOG.exception('failed to decode message: "%s"', exc)
+            import traceback
+            return encode_(
+                {
+                    'error': {
+                        'message': 'failed to decode message: "%s"' % (
+                            msg.decode(errors='replace')
+                        ),
+                        'traceback': traceback.format_exc(),
                     }
-                ).encode()
-            else:
-                # success case - serve the request
-                res = self.server.receiver(message)
-                # send back the string to bytes response
-                if isinstance(res.get('data'), bytes):
-                    response = res['data']
-                else:
-                    response = encode_(res).encode()
-            self.socket.send(response)
+                }
+            ).encode()
+        # success case - serve the request
+        res = self.server.receiver(message)
+        # send back the string to bytes response
+        if isinstance(res.get('data'), bytes):
+            return res['data']
+        return encode_(res).encode()
@@ -18,17 +18,22 @@
 
 from abc import ABCMeta, abstractmethod
 import asyncio
+from collections import deque
 from contextlib import suppress
 from fnmatch import fnmatchcase
 import logging
 import queue
+from threading import Lock
 from time import time
 from typing import (
     Any,
+    Callable,
+    Deque,
     Dict,
     List,
     NamedTuple,
     Optional,
+    Set,
     Tuple,
     TYPE_CHECKING,
     Union,
@@ -39,8 +44,8 @@ from graphene.utils.str_converters import to_snake_case
 
 from cylc.flow import LOG
 from cylc.flow.data_store_mgr import (
-    EDGES, FAMILY_PROXIES, TASK_PROXIES, WORKFLOW,
-    DELTA_ADDED, create_delta_store
+    EDGES, FAMILIES, FAMILY_PROXIES, JOBS, TASKS, TASK_PROXIES, WORKFLOW,
+    DELTA_ADDED, create_delta_store, merge_delta_stores
 )
 from cylc.flow.id import Tokens
 from cylc.flow.network.schema import (
@@ -73,6 +78,24 @@ DELTA_SLEEP_INTERVAL = 0.5
 # Delay before carrying on with the next delta,
 # roughly DELTA_PROC_WAIT*DELTA_SLEEP_INTERVAL seconds (if queue is empty).
 DELTA_PROC_WAIT = 10
+# Max number of deltas queued for a subscription, if a subscriber falls
+# further behind than this it is sent a snapshot of the workflow instead.
+DELTA_QUEUE_SIZE = 100
+
+# Subscriptions which yield elements of a single type (from the delta store)
+SUB_NODE_TYPES = {
+    'job': JOBS,
+    'jobs': JOBS,
+    'task': TASKS,
+    'tasks': TASKS,
+    'task_proxy': TASK_PROXIES,
+    'task_proxies': TASK_PROXIES,
+    'family': FAMILIES,
+    'families': FAMILIES,
+    'family_proxy': FAMILY_PROXIES,
+    'family_proxies': FAMILY_PROXIES,
+    'edges': EDGES,
+}
 
 
 def filter_none(dictionary):
@@ -302,6 +325,133 @@ def node_filter(node, node_type, args, state):
     )
 
 
+def get_delta_filter(
+    field_name: str,
+    args: Dict[str, Any],
+) -> Optional[Callable[[dict], bool]]:
+    """Return a function which tells if a delta store is of use to a
+    subscription.
+
+    Subscriptions to elements of a single type, resolved from the delta
+    store, only yield the elements of the delta store which match their
+    arguments. Delta stores with no such elements need not be queued.
+
+    Returns None if all delta stores are of use.
+
+    """
+    node_type = SUB_NODE_TYPES.get(field_name)
+    if node_type is None or not args.get('delta_store'):
+        return None
+    delta_type = args.get('delta_type', DELTA_ADDED)
+
+    if args.get('id'):
+        def _id_filter(delta_store: dict) -> bool:
+            return args['id'] in delta_store[delta_type].get(node_type, ())
+
+        return _id_filter
+
+    filter_args = dict(args)
+    try:
+        for arg in ('ids', 'exids'):
+            if node_type in DEF_TYPES:
+                filter_args[arg] = [
+                    Tokens(cycle=None, task=task, job=None)
+                    for task in args.get(arg) or []
+                ]
+            else:
+                filter_args[arg] = [
+                    Tokens(n_id, relative=True)
+                    for n_id in args.get(arg) or []
+                ]
+    except ValueError:
+        # (reported by the subscription resolver)
+        return None
+
+    def _filter(delta_store: dict) -> bool:
+        elements = delta_store[delta_type].get(node_type)
+        if not elements:
+            return False
+        if not isinstance(elements, dict):
+            # pruned IDs
+            return True
+        return any(
+            node_filter(
+                node,
+                node_type,
+                filter_args,
+                # the state may not be in the delta, don't filter on it
+                getattr(node, 'state', None) or None,
+            )
+            for node in elements.values()
+        )
+
+    return _filter
+
+
+class DeltaQueue:
+    """Bounded queue of deltas for a subscription.
+
+    Producers put (workflow_id, topic, delta_store) items, these are dropped
+    if they are of no use to the subscription (see get_delta_filter).
+
+    Putting never blocks. If the queue is full the queued deltas for the
+    workflow are dropped and the workflow is marked for resync, i.e. the
+    subscriber should be sent a snapshot of the workflow instead.
+
+    Args:
+        maxsize: Max number of deltas to queue.
+        delta_filter: Function which returns True for useful delta stores.
+
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DELTA_QUEUE_SIZE,
+        delta_filter: Optional[Callable[[dict], bool]] = None,
+    ):
+        self.maxsize = maxsize
+        self.delta_filter = delta_filter
+        self._deltas: Deque[Tuple[str, str, dict]] = deque()
+        self._resync: Set[str] = set()
+        self._lock = Lock()
+
+    def put(self, item: Tuple[str, str, dict]) -> None:
+        w_id, topic, delta_store = item
+        if topic == 'shutdown':
+            # always deliver shutdown deltas
+            with self._lock:
+                self._deltas.append(item)
+            return
+        if self.delta_filter and not self.delta_filter(delta_store):
+            return
+        with self._lock:
+            if w_id in self._resync:
+                # (covered by the snapshot)
+                return
+            if len(self._deltas) >= self.maxsize:
+                self._resync.add(w_id)
+                self._deltas = deque(
+                    delta
+                    for delta in self._deltas
+                    if delta[0] != w_id or delta[1] == 'shutdown'
+                )
+                return
+            self._deltas.append(item)
+
+    def get_all(self) -> Tuple[List[Tuple[str, str, dict]], Set[str]]:
+        """Remove and return all queued deltas and workflows to resync."""
+        with self._lock:
+            deltas, self._deltas = list(self._deltas), deque()
+            resync, self._resync = self._resync, set()
+        return deltas, resync
+
+    def qsize(self) -> int:
+        return len(self._deltas)
+
+    def empty(self) -> bool:
+        return not self._deltas
+
+
 def get_flow_data_from_ids(data_store, native_ids):
     """Return workflow data by id."""
     w_ids = []
@@ -349,6 +499,10 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
         except KeyError:
             return None
 
+    async def get_loop_timings(self, args):
+        """Return scheduler main loop timings (see Resolvers)."""
+        return []
+
     async def get_workflows_data(self, args: Dict[str, Any]):
         """Return list of data from workflows."""
         # Both cases just as common so 'if' not 'try'
@@ -544,6 +698,11 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
         Async generator mapping the incoming protobuf deltas to
         yielded GraphQL subscription objects.
 
+        Deltas which the subscription has no use for are not queued, deltas
+        from the same workflow which arrive whilst the previous one is being
+        processed are merged into one. If the subscriber falls too far
+        behind it is sent a snapshot of the workflow (see DeltaQueue).
+
         """
         # NOTE: we don't expect workflows to be returned in definition order
         # so it is ok to use `set` here
@@ -560,16 +719,20 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
         self.delta_processing_flows[sub_id] = set()
         delta_processing_flows = self.delta_processing_flows[sub_id]
 
+        field_name = to_snake_case(info.field_name)
         delta_queues = self.data_store_mgr.delta_queues
-        deltas_queue = queue.Queue()
+        deltas_queue = DeltaQueue(
+            delta_filter=get_delta_filter(field_name, args)
+        )
 
         counters = {}
         delta_yield_queue = queue.Queue()
-        flow_delta_queues = {}
+        # deltas waiting to be yielded for each workflow
+        flow_delta_queues: Dict[str, Deque[Tuple[str, dict]]] = {}
         try:
             # Iterate over the queue yielding deltas
             w_ids = workflow_ids
-            sub_resolver = SUB_RESOLVERS.get(to_snake_case(info.field_name))
+            sub_resolver = SUB_RESOLVERS.get(field_name)
             interval = args['ignore_interval']
             old_time = 0.0
             while True:
@@ -587,37 +750,59 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
                             delta_queues[w_id][sub_id] = deltas_queue
                             # On new yield workflow data-store as added delta
                             if args.get('initial_burst'):
-                                delta_store = create_delta_store(
-                                    workflow_id=w_id)
-                                delta_store[DELTA_ADDED] = (
-                                    self.data_store_mgr.data[w_id])
-                                delta_store[DELTA_ADDED][
-                                    WORKFLOW
-                                ].reloaded = True
-                                deltas_queue.put(
-                                    (w_id, 'initial_burst', delta_store))
+                                deltas_queue.put((
+                                    w_id,
+                                    'initial_burst',
+                                    self._get_snapshot(w_id),
+                                ))
                     elif w_id in self.delta_store[sub_id]:
                         del self.delta_store[sub_id][w_id]
                 try:
-                    with suppress(queue.Empty):
-                        w_id, topic, delta_store = deltas_queue.get(False)
-
+                    deltas, resync = deltas_queue.get_all()
+                    for w_id in resync:
+                        if w_id not in self.data_store_mgr.data:
+                            continue
+                        # the snapshot replaces any pending deltas
+                        counters.setdefault(w_id, 0)
+                        flow_delta_queues[w_id] = deque([
+                            ('resync', self._get_snapshot(w_id)),
+                            *(
+                                item
+                                for item in flow_delta_queues.get(w_id, ())
+                                if item[0] == 'shutdown'
+                            ),
+                        ])
+                    for w_id, topic, delta_store in deltas:
                         if w_id not in flow_delta_queues:
                             counters[w_id] = 0
-                            flow_delta_queues[w_id] = queue.Queue()
-                        flow_delta_queues[w_id].put((topic, delta_store))
+                            flow_delta_queues[w_id] = deque()
+                        flow_queue = flow_delta_queues[w_id]
+                        if (
+                            flow_queue
+                            and topic != 'shutdown'
+                            and flow_queue[-1][0] != 'shutdown'
+                        ):
+                            # coalesce with the delta waiting to be yielded
+                            flow_queue[-1] = (
+                                topic,
+                                merge_delta_stores(
+                                    flow_queue[-1][1], delta_store
+                                ),
+                            )
+                        else:
+                            flow_queue.append((topic, delta_store))
 
                     # Only yield deltas from the same workflow if previous
                     # delta has finished processing.
                     for flow_id, flow_queue in flow_delta_queues.items():
-                        if flow_queue.empty():
+                        if not flow_queue:
                             continue
                         elif flow_id in delta_processing_flows:
                             if counters[flow_id] < DELTA_PROC_WAIT:
                                 continue
                             delta_processing_flows.remove(flow_id)
                         counters[flow_id] = 0
-                        topic, delta_store = flow_queue.get()
+                        topic, delta_store = flow_queue.popleft()
                         delta_yield_queue.put((flow_id, topic, delta_store))
 
                     w_id, topic, delta_store = delta_yield_queue.get(False)
@@ -659,6 +844,13 @@ class BaseResolvers(metaclass=ABCMeta):  # noqa: SIM119
                 del self.delta_store[sub_id]
             yield None
 
+    def _get_snapshot(self, w_id: str) -> dict:
+        """Return the workflow data-store as an added delta."""
+        delta_store = create_delta_store(workflow_id=w_id)
+        delta_store[DELTA_ADDED] = self.data_store_mgr.data[w_id]
+        delta_store[DELTA_ADDED][WORKFLOW].reloaded = True
+        return delta_store
+
     async def flow_delta_processed(self, context, op_id):
         if 'ops_queue' in context:
             with suppress(queue.Empty, KeyError):
@@ -686,6 +878,13 @@ class Resolvers(BaseResolvers):
         super().__init__(data)
         self.schd = schd
 
+    # Queries
+    async def get_loop_timings(self, args):
+        """Return main loop phase timings, see cylc.flow.loop_timer."""
+        if args['workflow'] != self.schd.id:
+            return []
+        return self.schd.loop_timer.get_stats()
+
     # Mutations
     async def mutator(
         self,
@@ -755,6 +954,7 @@ class Resolvers(BaseResolvers):
                 kwargs,
             )
         )
+        self.schd.wakeup()
         return (True, cmd_uuid)
 
     def broadcast(
@@ -808,6 +1008,7 @@ class Resolvers(BaseResolvers):
 
         """
         self.schd.ext_trigger_queue.put((message, id))
+        self.schd.wakeup()
         return (True, 'Event queued')
 
     def put_messages(
@@ -837,8 +1038,33 @@ class Resolvers(BaseResolvers):
             self.schd.message_queue.put(
                 TaskMsg(task_job, event_time, severity, message)
             )
+        self.schd.wakeup()
         return (True, f'Messages queued: {len(messages)}')
 
+    def put_messages_batch(
+        self,
+        messages: List[list]
+    ) -> Tuple[bool, str]:
+        """Put task messages from many jobs in queue for processing later.
+
+        Arguments:
+            messages:
+                List in the format
+                ``[[job_id, event_time, severity, message], ...]``.
+
+        Returns:
+            outcome:
+                True if command successfully queued.
+            message:
+                Information about outcome.
+
+        """
+        task_msgs = [TaskMsg(*item) for item in messages]
+        for task_msg in task_msgs:
+            self.schd.message_queue.put(task_msg)
+        self.schd.wakeup()
+        return (True, f'Messages queued: {len(task_msgs)}')
+
     def set_graph_window_extent(
         self, n_edge_distance: int
     ) -> Tuple[bool, str]:
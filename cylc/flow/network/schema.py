@@ -551,6 +551,12 @@ async def resolve_broadcasts(root, info, **args):
     return result
 
 
+async def resolve_loop_timings(root, info, **args):
+    """Resolve main loop phase timings from the scheduler."""
+    resolvers = info.context.get('resolvers')
+    return await resolvers.get_loop_timings({'workflow': root.id})
+
+
 def resolve_json_dump(root, info, **args):
     field = getattr(root, to_snake_case(info.field_name), '{}') or '{}'
     return json.loads(field)
@@ -597,6 +603,60 @@ class TimeZone(ObjectType):
     string_extended = String()
 
 
+class LoopTimingBucket(ObjectType):
+    class Meta:
+        description = """Main loop phase time histogram bucket."""
+    le = Float(
+        description=sstrip('''
+            The upper bound of the bucket in seconds (null for the last
+            bucket).
+        '''),
+    )
+    count = Int(
+        description='The number of loops with times in this bucket.',
+    )
+
+
+class LoopTiming(ObjectType):
+    class Meta:
+        description = sstrip("""
+            The time spent in a phase of the scheduler main loop.
+
+            Statistics are for a window of recent loops unless stated
+            otherwise. Times are in seconds.
+        """)
+    name = String(
+        description=sstrip('''
+            The main loop phase, or "loop" for the total time spent in all
+            phases except "sleep".
+        '''),
+    )
+    count = Int(
+        description='The number of loops timed since the scheduler started.',
+    )
+    total = Float(
+        description='The total time since the scheduler started.',
+    )
+    loops = Int(
+        description='The number of loops in the window.',
+    )
+    mean = Float()
+    max = Float()  # noqa: A003 (required for definition)
+    p50 = Float(description='The median time.')
+    p90 = Float(description='The 90th percentile time.')
+    p99 = Float(description='The 99th percentile time.')
+    share = Float(
+        description=sstrip('''
+            The fraction of the loop time spent in this phase
+            (null for "sleep").
+        '''),
+    )
+    histogram = graphene.List(
+        LoopTimingBucket,
+        description='Histogram of the times.',
+    )
+
+
 class Workflow(ObjectType):
     class Meta:
         description = """Global workflow info."""
@@ -786,6 +846,15 @@ class Workflow(ObjectType):
             of the data-store graph window.
         '''),
     )
+    loop_timings = graphene.List(
+        LoopTiming,
+        description=sstrip('''
+            Time spent in each phase of the scheduler main loop.
+
+            Only available from the scheduler.
+        '''),
+        resolver=resolve_loop_timings,
+    )
 
 
 class RuntimeSetting(ObjectType):
@@ -16,20 +16,40 @@
 """Server for workflow runtime API."""
 
 import asyncio
+from contextlib import nullcontext, suppress
+import json
 from queue import Queue
 from textwrap import dedent
-from time import sleep
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+from threading import Lock
+from time import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from graphql.execution.executors.asyncio import AsyncioExecutor
 import zmq
+import zmq.asyncio
 from zmq.auth.thread import ThreadAuthenticator
 
 from cylc.flow import LOG, workflow_files
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.network.authorisation import authorise
 from cylc.flow.network.graphql import (
-    CylcGraphQLBackend, IgnoreFieldMiddleware, instantiate_middleware
+    PERSISTED_QUERY_NOT_FOUND,
+    CylcGraphQLBackend,
+    IgnoreFieldMiddleware,
+    LRUCache,
+    get_field_names,
+    get_query_hash,
+    instantiate_middleware,
+    is_query,
 )
 from cylc.flow.network.publisher import WorkflowPublisher
 from cylc.flow.network.replier import WorkflowReplier
@@ -124,8 +144,13 @@ class WorkflowRuntimeServer:
     """
     endpoints: Dict[str, object]
 
-    OPERATE_SLEEP_INTERVAL = 0.2
-    STOP_SLEEP_INTERVAL = 0.2
+    # Max number of persisted queries to remember
+    PERSISTED_QUERIES_SIZE = 1000
+    # Max number of query results to cache
+    RESULT_CACHE_SIZE = 100
+    # Fields which are not resolved from the data store, queries which
+    # select these are not cached (the data version does not track them)
+    UNCACHED_FIELDS = frozenset({'loopTimings'})
 
     def __init__(self, schd):
 
@@ -147,25 +172,47 @@ class WorkflowRuntimeServer:
         self.middleware = [
             IgnoreFieldMiddleware,
         ]
+        self.graphql_backend = CylcGraphQLBackend()
+        # {query_hash: request_string}
+        self.persisted_queries: LRUCache[str] = LRUCache(
+            self.PERSISTED_QUERIES_SIZE
+        )
+        # {(request_string, variables, data_version): (expiry_time, result)}
+        self.results: LRUCache[Tuple[float, Any]] = LRUCache(
+            self.RESULT_CACHE_SIZE
+        )
+        self.result_cache_ttl: float = glbl_cfg().get(
+            ['scheduler', 'graphql result cache ttl']
+        )
+
+        # requests are served concurrently by the replier's worker threads,
+        # requests which may change the scheduler state hold this lock so
+        # they are served one at a time (queries can run alongside them)
+        self.mutation_lock = Lock()
 
         self.publish_queue: 'Queue[Iterable[tuple]]' = Queue()
-        self.waiting_to_stop = False
+        # set (in the server's event loop) when there is something to do
+        self._publish_event: Optional[asyncio.Event] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._stop_reason: Union[BaseException, str] = ''
         self.stopped = True
 
         self.register_endpoints()
 
     def start(self, barrier):
-        """Start the TCP servers."""
-        # set asyncio loop on thread
+        """Start the TCP servers and serve until stopped.
+
+        The server runs its own event loop, call this in a separate thread.
+        """
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
         try:
-            self.loop = asyncio.get_running_loop()
-        except RuntimeError:
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-
-        # TODO: this in zmq asyncio context?
-        # Requires the scheduler main loop in asyncio first
-        # And use of concurrent.futures.ThreadPoolExecutor?
+            self.loop.run_until_complete(self.operate(barrier))
+        finally:
+            self.loop.close()
+
+    def _start_sockets(self):
+        """Create the ZMQ sockets and authenticator."""
         self.zmq_context = zmq.Context()
         # create an authenticator for the ZMQ context
         self.curve_auth = ThreadAuthenticator(self.zmq_context, log=LOG)
@@ -189,77 +236,100 @@ class WorkflowRuntimeServer:
             location=(self.client_pub_key_dir)
         )
 
+        # asyncio sockets sharing the authenticated context
+        context = zmq.asyncio.Context.shadow(self.zmq_context.underlying)
         min_, max_ = glbl_cfg().get(['scheduler', 'run hosts', 'ports'])
-        self.replier = WorkflowReplier(self, context=self.zmq_context)
+        self.replier = WorkflowReplier(self, context=context)
         self.replier.start(min_, max_)
         self.publisher = WorkflowPublisher(
-            self.schd.workflow, context=self.zmq_context
+            self.schd.workflow, context=context
         )
         self.publisher.start(min_, max_)
         self.port = self.replier.port
         self.pub_port = self.publisher.port
         self.schd.data_store_mgr.delta_workflow_ports()
 
-        # wait for threads to setup socket ports before continuing
-        barrier.wait()
-
-        self.stopped = False
-
-        self.operate()
-
     async def stop(self, reason: Union[BaseException, str]) -> None:
         """Stop the TCP servers, and clean up authentication.
 
         This method must be called/awaited from a different thread to the
-        server's self.thread in order to interrupt the self.operate() loop
-        and wait for self.thread to terminate.
+        server's self.thread, it waits for self.thread to terminate.
         """
-        self.waiting_to_stop = True
         if self.thread and self.thread.is_alive():
-            # Wait for self.operate() loop to finish:
-            while self.waiting_to_stop:
-                # Non-async sleep - yield to other threads rather than
-                # event loop (allows self.operate() running in different
-                # thread to return)
-                sleep(self.STOP_SLEEP_INTERVAL)
+            self._stop_reason = reason
+            if self.loop and self._stop_event:
+                with suppress(RuntimeError):
+                    # RuntimeError: the server loop has already been closed
+                    self.loop.call_soon_threadsafe(self._stop_event.set)
+            # wait for self.operate() to finish without blocking this loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.thread.join
+            )
+        else:
+            # the server failed to start or did not start in a thread
+            self._stop_sockets()
+        self.stopped = True
 
+    def _stop_sockets(self) -> None:
+        """Close the sockets, stop the authenticator."""
         if self.replier:
             self.replier.stop(stop_loop=False)
         if self.publisher:
-            await self.publish_queued_items()
-            await self.publisher.publish(
-                (b'shutdown', str(reason).encode('utf-8'))
-            )
             self.publisher.stop(stop_loop=False)
             self.publisher = None
         if self.curve_auth:
             self.curve_auth.stop()  # stop the authentication thread
-        if self.loop and self.loop.is_running():
-            self.loop.stop()
-        if self.thread and self.thread.is_alive():
-            self.thread.join()  # Wait for processes to return
 
-        self.stopped = True
+    async def operate(self, barrier) -> None:
+        """Orchestrate the receive, send, publish of messages.
 
-    def operate(self) -> None:
-        """Orchestrate the receive, send, publish of messages."""
-        # Note: this cannot be an async method because the response part
-        # of the listener runs the event loop synchronously
-        # (in graphql AsyncioExecutor)
-        while True:
-            if self.waiting_to_stop:
-                # The self.stop() method is waiting for us to signal that we
-                # have finished here
-                self.waiting_to_stop = False
-                return
+        Requests are served as they arrive and queued items are published
+        as soon as they are queued, until the server is stopped.
+        """
+        self._publish_event = publish_event = asyncio.Event()
+        self._stop_event = stop_event = asyncio.Event()
+        self._start_sockets()
+
+        # wait for threads to setup socket ports before continuing
+        barrier.wait()
+        self.stopped = False
+
+        tasks = [
+            asyncio.ensure_future(self.replier.listener()),
+            asyncio.ensure_future(self._publish_loop(publish_event)),
+        ]
+        try:
+            await stop_event.wait()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            await self.publish_queued_items()
+            await self.publisher.publish(
+                (b'shutdown', str(self._stop_reason).encode('utf-8'))
+            )
+        finally:
+            self._stop_sockets()
 
-            # Gather and respond to any requests.
-            self.replier.listener()
-            # Publish all requested/queued.
-            self.loop.run_until_complete(self.publish_queued_items())
+    def queue_publish(self, articles: Iterable[tuple]) -> None:
+        """Queue items to be published, may be called from any thread.
 
-            # Yield control to other threads
-            sleep(self.OPERATE_SLEEP_INTERVAL)
+        Args:
+            articles: [(topic, data, serializer), ...]
+
+        """
+        self.publish_queue.put(articles)
+        if self.loop and self._publish_event:
+            with suppress(RuntimeError):
+                # RuntimeError: the server loop has been closed
+                self.loop.call_soon_threadsafe(self._publish_event.set)
+
+    async def _publish_loop(self, publish_event: asyncio.Event) -> None:
+        """Publish items as they are queued."""
+        while True:
+            publish_event.clear()
+            await self.publish_queued_items()
+            await publish_event.wait()
 
     async def publish_queued_items(self) -> None:
         """Publish all queued items."""
@@ -355,7 +425,8 @@ class WorkflowRuntimeServer:
         self,
         request_string: Optional[str] = None,
         variables: Optional[Dict[str, Any]] = None,
-        meta: Optional[Dict[str, Any]] = None
+        meta: Optional[Dict[str, Any]] = None,
+        query_hash: Optional[str] = None,
     ):
         """Return the GraphQL schema execution result.
 
@@ -363,24 +434,46 @@ class WorkflowRuntimeServer:
             request_string: GraphQL request passed to Graphene.
             variables: Dict of variables passed to Graphene.
             meta: Dict containing auth user etc.
+            query_hash:
+                SHA256 hash of the request (persisted queries). If sent with
+                the request, the request is stored under this hash, later
+                requests can then send the hash without the request.
 
         Returns:
             object: Execution result, or a list with errors.
         """
+        if query_hash:
+            if request_string:
+                if get_query_hash(request_string) != query_hash:
+                    return 'ERROR: query hash does not match the request'
+                self.persisted_queries.put(query_hash, request_string)
+            else:
+                request_string = self.persisted_queries.get(query_hash)
+                if request_string is None:
+                    return [{'error': {'message': PERSISTED_QUERY_NOT_FOUND}}]
+        read_only = self._is_query(request_string)
+        cache_key = None
+        if self.result_cache_ttl and read_only:
+            cache_key = self._result_cache_key(request_string, variables)
+            cached = self.results.get(cache_key) if cache_key else None
+            if cached and cached[0] > time():
+                return cached[1]
         try:
-            executed: 'ExecutionResult' = schema.execute(
-                request_string,
-                variable_values=variables,
-                context_value={
-                    'resolvers': self.resolvers,
-                    'meta': meta or {},
-                },
-                backend=CylcGraphQLBackend(),
-                middleware=list(instantiate_middleware(self.middleware)),
-                executor=AsyncioExecutor(),
-                validate=True,  # validate schema (dev only? default is True)
-                return_promise=False,
-            )
+            with nullcontext() if read_only else self.mutation_lock:
+                executed: 'ExecutionResult' = schema.execute(
+                    request_string,
+                    variable_values=variables,
+                    context_value={
+                        'resolvers': self.resolvers,
+                        'meta': meta or {},
+                    },
+                    backend=self.graphql_backend,
+                    middleware=list(instantiate_middleware(self.middleware)),
+                    executor=AsyncioExecutor(),
+                    # validate schema (dev only? default is True)
+                    validate=True,
+                    return_promise=False,
+                )
         except Exception as exc:
             return 'ERROR: GraphQL execution error \n%s' % exc
         if executed.errors:
@@ -402,8 +495,80 @@ class WorkflowRuntimeServer:
                     continue
                 errors.append(getattr(error, 'message', None))
             return errors
+        if cache_key:
+            self.results.put(
+                cache_key, (time() + self.result_cache_ttl, executed.data)
+            )
         return executed.data
 
+    def _is_query(self, request_string: Optional[str]) -> bool:
+        """Return True if a GraphQL request only contains queries.
+
+        Returns False for requests which cannot be parsed.
+        """
+        try:
+            document = self.graphql_backend.document_from_string(
+                schema, request_string
+            )
+        except Exception:
+            # (any errors are reported when the request is executed)
+            return False
+        return is_query(document.document_ast)
+
+    def _result_cache_key(
+        self,
+        request_string: Optional[str],
+        variables: Optional[Dict[str, Any]],
+    ) -> Optional[tuple]:
+        """Return the key to cache the result of a query under.
+
+        The result depends only on the request and the data store, which
+        is identified by its data version. The request "meta" is left out
+        of the key deliberately: it identifies the client (e.g. the user),
+        which does not affect the result of a query.
+
+        Returns None if the result should not be cached.
+        """
+        try:
+            document = self.graphql_backend.document_from_string(
+                schema, request_string
+            )
+            variables_key = json.dumps(variables, sort_keys=True)
+        except Exception:
+            # (any errors are reported when the request is executed)
+            return None
+        if get_field_names(document.document_ast) & self.UNCACHED_FIELDS:
+            return None
+        return (
+            request_string,
+            variables_key,
+            self.schd.data_store_mgr.data_version,
+        )
+
+    @authorise()
+    @expose
+    def put_messages(
+        self,
+        messages: Optional[List[list]] = None,
+        **_kwargs
+    ) -> Tuple[bool, str]:
+        """Put task job messages in the queue for the scheduler to process.
+
+        A compact alternative to the GraphQL "message" mutation which
+        accepts messages from any number of jobs in a single request.
+
+        Args:
+            messages:
+                List in the format
+                ``[[job_id, event_time, severity, message], ...]``.
+
+        Returns:
+            tuple: (outcome, message)
+
+        """
+        with self.mutation_lock:
+            return self.resolvers.put_messages_batch(messages or [])
+
     # UIServer Data Commands
     @authorise()
     @expose
@@ -18,7 +18,16 @@
 
 import math
 import re
-from typing import Iterable, Set, TYPE_CHECKING
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+    Union,
+)
 
 from cylc.flow.cycling.loader import get_point
 from cylc.flow.exceptions import TriggerExpressionError
@@ -32,6 +41,186 @@ if TYPE_CHECKING:
     from cylc.flow.id import Tokens
 
 
+# A node of a compiled condition: (is_and, leaf_mask, sub_nodes).
+_Node = Tuple[bool, int, tuple]
+
+
+class CompiledCondition:
+    """A conditional trigger expression compiled for fast evaluation.
+
+    The expression is compiled into a tree of "&" and "|" nodes whose leaves
+    are term numbers. It is evaluated against a bitmask of satisfied terms
+    where bit "n" represents term "n" (no eval() required).
+
+    As the expression is independent of cycle point, one compiled condition
+    can be shared by all the prerequisites generated from a dependency.
+    Results are cached by bitmask.
+
+    Args:
+        expr:
+            The expression as a (nested) list of term numbers (int),
+            operators ("&", "|") and sub-expressions (list).
+
+    Examples:
+        >>> cond = CompiledCondition([0, '|', [1, '&', 2]])
+        >>> cond.evaluate(0b001), cond.evaluate(0b010), cond.evaluate(0b110)
+        (True, False, True)
+
+        # & takes precedence over |
+        >>> cond = CompiledCondition([0, '&', 1, '|', 2])
+        >>> cond.evaluate(0b011), cond.evaluate(0b100), cond.evaluate(0b001)
+        (True, True, False)
+
+        >>> CompiledCondition([0, '|', '@wall_clock']).error
+        "invalid term '@wall_clock'"
+
+    """
+
+    __slots__ = ('tree', 'error', '_results')
+
+    # Max number of cached results per condition.
+    MAX_CACHED_RESULTS = 1024
+
+    def __init__(self, expr: list):
+        self.tree: Optional[_Node] = None
+        self.error: Optional[str] = None
+        self._results: Dict[int, bool] = {}
+        try:
+            self.tree = self._compile(expr)
+        except ValueError as exc:
+            self.error = str(exc)
+
+    @classmethod
+    def _compile(cls, expr: list) -> _Node:
+        """Compile a (nested) list expression into a tree.
+
+        Raises:
+            ValueError: If the expression is not valid.
+
+        """
+        if not expr or len(expr) % 2 == 0:
+            raise ValueError('incomplete expression')
+        # split into "|" separated groups of "&" separated operands
+        groups: List[List[Union[int, list]]] = [[]]
+        for ind, item in enumerate(expr):
+            if ind % 2:
+                if item == '|':
+                    groups.append([])
+                elif item != '&':
+                    raise ValueError(f'invalid operator {item!r}')
+            elif isinstance(item, (int, list)) and not isinstance(item, bool):
+                groups[-1].append(item)
+            else:
+                raise ValueError(f'invalid term {item!r}')
+        nodes = [cls._compile_group(group) for group in groups]
+        if len(nodes) == 1:
+            return nodes[0]
+        leaf_mask = 0
+        sub_nodes: List[_Node] = []
+        for node in nodes:
+            is_and, mask, sub = node
+            if is_and and bin(mask).count('1') == 1 and not sub:
+                # single term
+                leaf_mask |= mask
+            else:
+                sub_nodes.append(node)
+        return (False, leaf_mask, tuple(sub_nodes))
+
+    @classmethod
+    def _compile_group(cls, group: List[Union[int, list]]) -> _Node:
+        """Compile a list of operands to be combined with "&"."""
+        leaf_mask = 0
+        sub_nodes: List[_Node] = []
+        for item in group:
+            if isinstance(item, list):
+                node = cls._compile(item)
+                is_and, mask, sub = node
+                if is_and:
+                    # flatten (a & (b & c))
+                    leaf_mask |= mask
+                    sub_nodes.extend(sub)
+                else:
+                    sub_nodes.append(node)
+            else:
+                leaf_mask |= 1 << item
+        if len(sub_nodes) == 1 and not leaf_mask:
+            return sub_nodes[0]
+        return (True, leaf_mask, tuple(sub_nodes))
+
+    @classmethod
+    def _evaluate(cls, node: _Node, mask: int) -> bool:
+        is_and, leaf_mask, sub_nodes = node
+        if is_and:
+            return (mask & leaf_mask) == leaf_mask and all(
+                cls._evaluate(sub_node, mask) for sub_node in sub_nodes
+            )
+        return bool(mask & leaf_mask) or any(
+            cls._evaluate(sub_node, mask) for sub_node in sub_nodes
+        )
+
+    def evaluate(self, mask: int) -> bool:
+        """Evaluate the condition for a bitmask of satisfied terms.
+
+        Raises:
+            ValueError: If the expression is not valid.
+
+        """
+        result = self._results.get(mask)
+        if result is not None:
+            return result
+        if self.tree is None:
+            raise ValueError(self.error)
+        result = self._evaluate(self.tree, mask)
+        if len(self._results) < self.MAX_CACHED_RESULTS:
+            self._results[mask] = result
+        return result
+
+    @classmethod
+    def from_string(
+        cls,
+        expr: str,
+        terms: Iterable[str],
+    ) -> 'CompiledCondition':
+        """Compile an expression string.
+
+        Args:
+            expr:
+                The expression e.g. "1/a succeeded | (1/b x & 1/c x)".
+            terms:
+                The terms in the expression in term number order.
+
+        Examples:
+            >>> cond = CompiledCondition.from_string(
+            ...     '1/a x|(1/b x&1/c x)', ['1/a x', '1/b x', '1/c x'])
+            >>> cond.evaluate(0b001), cond.evaluate(0b010)
+            (True, False)
+
+        """
+        term_numbers = {term: ind for ind, term in enumerate(terms)}
+        stack: List[list] = [[]]
+        for token in re.split(r'([&|()])', expr):
+            token = token.strip()
+            if not token:
+                continue
+            if token == '(':
+                stack.append([])
+            elif token == ')':
+                if len(stack) == 1:
+                    stack = []
+                    break
+                sub_expr = stack.pop()
+                stack[-1].append(sub_expr)
+            elif token in {'&', '|'}:
+                stack[-1].append(token)
+            else:
+                stack[-1].append(term_numbers.get(token, token))
+        if len(stack) != 1:
+            condition = cls([])
+            condition.error = 'unmatched parentheses'
+            return condition
+        return cls(stack[0])
+
+
 class Prerequisite:
     """The concrete result of an abstract logical trigger expression.
 
@@ -48,12 +237,11 @@ class Prerequisite:
     __slots__ = (
         "satisfied",
         "_all_satisfied",
+        "_condition",
         "conditional_expression",
         "point",
     )
 
-    # Extracts T from "foo.T succeeded" etc.
-    SATISFIED_TEMPLATE = 'bool(self.satisfied[("%s", "%s", "%s")])'
     MESSAGE_TEMPLATE = r'%s/%s %s'
 
     DEP_STATE_SATISFIED = 'satisfied naturally'
@@ -70,8 +258,11 @@ class Prerequisite:
         self.satisfied = {}
 
         # Expression present only when conditions are used.
-        # '1/foo failed & 1/bar succeeded'
+        # '1/foo failed|1/bar succeeded'
         self.conditional_expression = None
+        # The compiled conditional expression (terms are numbered in the
+        # order of the satisfied dict).
+        self._condition: Optional[CompiledCondition] = None
 
         # The cached state of this prerequisite:
         # * `None` (no cached state)
@@ -117,47 +308,48 @@ class Prerequisite:
         Returns None if this prerequisite is not a conditional one.
 
         """
-        expr = self.conditional_expression
-        if not expr:
-            return None
-        for message in self.satisfied:
-            expr = expr.replace(self.SATISFIED_TEMPLATE % message,
-                                self.MESSAGE_TEMPLATE % message)
-        return expr
+        return self.conditional_expression or None
 
-    def set_condition(self, expr):
+    def set_condition(
+        self,
+        expr: str,
+        condition: Optional[CompiledCondition] = None,
+    ) -> None:
         """Set the conditional expression for this prerequisite.
         Resets the cached state (self._all_satisfied).
 
+        Args:
+            expr:
+                The expression in the format "1/foo succeeded|1/bar x".
+            condition:
+                The compiled expression if already known, terms must be
+                numbered in the order of the satisfied dict. If not provided
+                the expression string will be compiled.
+
         Examples:
             # GH #3644 construct conditional expression when one task name
             # is a substring of another: foo | xfoo => bar.
-            # Add 'foo' to the 'satisfied' dict before 'xfoo'.
             >>> preq = Prerequisite(1)
             >>> preq.satisfied = {
             ...    ('1', 'foo', 'succeeded'): False,
             ...    ('1', 'xfoo', 'succeeded'): False
             ... }
             >>> preq.set_condition("1/foo succeeded|1/xfoo succeeded")
-            >>> expr = preq.conditional_expression
-            >>> expr.split('|')  # doctest: +NORMALIZE_WHITESPACE
-            ['bool(self.satisfied[("1", "foo", "succeeded")])',
-            'bool(self.satisfied[("1", "xfoo", "succeeded")])']
+            >>> preq.satisfied[('1', 'xfoo', 'succeeded')] = True
+            >>> preq.is_satisfied()
+            True
 
         """
         self._all_satisfied = None
         if '|' in expr:
-            # Make a Python expression so we can eval() the logic.
-            for message in self.satisfied:
-                # Use '\b' in case one task name is a substring of another
-                # and escape special chars ('.', timezone '+') in task IDs.
-                expr = re.sub(
-                    fr"\b{re.escape(self.MESSAGE_TEMPLATE % message)}\b",
-                    self.SATISFIED_TEMPLATE % message,
-                    expr
+            if condition is None:
+                condition = CompiledCondition.from_string(
+                    expr,
+                    (self.MESSAGE_TEMPLATE % message
+                     for message in self.satisfied)
                 )
-
             self.conditional_expression = expr
+            self._condition = condition
 
     def is_satisfied(self):
         """Return True if prerequisite is satisfied.
@@ -185,18 +377,21 @@ class Prerequisite:
         Does not cache the result.
 
         """
+        mask = 0
+        bit = 1
+        for value in self.satisfied.values():
+            if value:
+                mask |= bit
+            bit <<= 1
         try:
-            res = eval(self.conditional_expression)  # nosec
-            # * the expression is constructed internally
-            # * https://github.com/cylc/cylc-flow/issues/4403
-        except (SyntaxError, ValueError) as exc:
+            return self._condition.evaluate(mask)
+        except ValueError as exc:
             err_msg = str(exc)
-            if str(exc).find("unexpected EOF") != -1:
+            if err_msg in {"incomplete expression", "unmatched parentheses"}:
                 err_msg += (
                     " (could be unmatched parentheses in the graph string?)")
             raise TriggerExpressionError(
                 '"%s":\n%s' % (self.get_raw_conditional_expression(), err_msg))
-        return res
 
     def satisfy_me(self, outputs: Iterable['Tokens']) -> 'Set[Tokens]':
         """Attempt to satisfy me with given outputs.
@@ -212,6 +407,9 @@ class Prerequisite:
                 continue
             valid.add(output)
             self.satisfied[prereq] = self.DEP_STATE_SATISFIED
+            if self._all_satisfied:
+                # satisfying more outputs cannot unsatisfy the prerequisite
+                continue
             if self.conditional_expression is None:
                 self._all_satisfied = all(self.satisfied.values())
             else:
@@ -17,6 +17,7 @@
 
 from contextlib import suppress
 from dataclasses import dataclass
+import os
 from os.path import expandvars
 from pprint import pformat
 import sqlite3
@@ -179,6 +180,7 @@ class CylcWorkflowDAOTable:
 class CylcWorkflowDAO:
     """Data access object for the workflow runtime database."""
 
+    CACHED_STATEMENTS = 256
     CONN_TIMEOUT = 0.2
     DB_FILE_BASE_NAME = "db"
     MAX_TRIES = 100
@@ -344,7 +346,8 @@ class CylcWorkflowDAO:
         self,
         db_file_name: Union['Path', str],
         is_public: bool = False,
-        create_tables: bool = False
+        create_tables: bool = False,
+        persistent: bool = False,
     ):
         """Initialise database access object.
 
@@ -356,12 +359,21 @@ class CylcWorkflowDAO:
             is_public: If True, allow retries.
             create_tables: If True, create the tables if they
                 don't already exist.
+            persistent: If True, keep the connection open between calls
+                to execute_queued_items and use write-ahead logging.
+                Intended for the scheduler's private database where
+                there is a single writer, see
+                "global.cylc[scheduler]database journal mode". The journal
+                mode is restored when the connection is closed.
 
         """
         self.db_file_name = expandvars(db_file_name)
         self.is_public = is_public
+        self.persistent = persistent
         self.conn: Optional[sqlite3.Connection] = None
         self.n_tries = 0
+        # (st_dev, st_ino) of the DB file when the connection was opened
+        self._db_file_id: Optional[Tuple[int, int]] = None
 
         self.tables = {
             name: CylcWorkflowDAOTable(name, attrs)
@@ -410,21 +422,67 @@ class CylcWorkflowDAO:
         """
         self.tables[table_name].add_update_item(set_args, where_args)
 
+    def clear_queued_items(self) -> None:
+        """Discard queued items for each table."""
+        for table in self.tables.values():
+            table.delete_queues.clear()
+            table.insert_queue.clear()
+            table.update_queues.clear()
+
     def close(self) -> None:
         """Explicitly close the connection."""
         if self.conn is not None:
             try:
+                if self.persistent:
+                    # checkpoint the WAL and leave a rollback-journal DB
+                    # behind for other readers
+                    self.conn.execute("PRAGMA journal_mode=DELETE")
                 self.conn.close()
             except sqlite3.Error as exc:
                 LOG.debug(f"Error closing connection to DB: {exc}")
             self.conn = None
+            self._db_file_id = None
 
     def connect(self) -> sqlite3.Connection:
         """Connect to the database."""
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_file_name, self.CONN_TIMEOUT)
+            self.conn = sqlite3.connect(
+                self.db_file_name,
+                self.CONN_TIMEOUT,
+                cached_statements=self.CACHED_STATEMENTS,
+            )
+            if self.persistent:
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                # WAL is safe against corruption with synchronous=NORMAL,
+                # a power loss may only roll back the last transactions
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+                self._db_file_id = self._get_db_file_id()
         return self.conn
 
+    def _get_db_file_id(self) -> Optional[Tuple[int, int]]:
+        """Return the (device, inode) of the DB file, None if missing."""
+        try:
+            stat = os.stat(self.db_file_name)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def _check_db_file(self) -> None:
+        """Check a persistent connection still points at the DB file.
+
+        A persistent connection would carry on writing to an unlinked
+        file if the workflow run directory were removed, raise instead.
+        """
+        if (
+            self.persistent
+            and self.conn is not None
+            and self._get_db_file_id() != self._db_file_id
+        ):
+            self.close()
+            raise sqlite3.OperationalError(
+                f"database file removed or replaced: {self.db_file_name}"
+            )
+
     def create_tables(self):
         """Create tables."""
         names = []
@@ -465,6 +523,8 @@ class CylcWorkflowDAO:
 
         # execute the statements and commit the transaction
         try:
+            if sql_queue:
+                self._check_db_file()
             for stmt, stmt_args in sql_queue:
                 self._execute_stmt(stmt, stmt_args)
             # Connection should only be opened if we have executed something.
@@ -494,11 +554,7 @@ class CylcWorkflowDAO:
             return
 
         else:
-            # Clear the queues
-            for table in self.tables.values():
-                table.delete_queues.clear()
-                table.insert_queue.clear()
-                table.update_queues.clear()
+            self.clear_queued_items()
             # Report public database retry recovery if necessary
             if self.n_tries:
                 LOG.warning(
@@ -510,7 +566,9 @@ class CylcWorkflowDAO:
             # Note: This is not strictly necessary. But if the workflow run
             # directory is removed, a forced reconnection to the private
             # database will ensure that the workflow dies.
-            self.close()
+            # (Persistent connections check the DB file instead.)
+            if not self.persistent:
+                self.close()
 
     def _execute_stmt(self, stmt, stmt_args_list):
         """Helper for "self.execute_queued_items".
@@ -51,6 +51,7 @@ from metomi.isodatetime.parsers import TimePointParser
 from cylc.flow import (
     LOG, main_loop, __version__ as CYLC_VERSION
 )
+from cylc.flow.async_util import ThreadSafeEvent
 from cylc.flow.broadcast_mgr import BroadcastMgr
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.config import WorkflowConfig
@@ -88,6 +89,20 @@ from cylc.flow.log_level import (
     verbosity_to_env,
     verbosity_to_opts,
 )
+from cylc.flow.loop_timer import (
+    PHASE_COMMANDS,
+    PHASE_DATA_STORE,
+    PHASE_DATABASE,
+    PHASE_EVENTS,
+    PHASE_MESSAGES,
+    PHASE_OTHER,
+    PHASE_PLUGINS,
+    PHASE_PROC_POOL,
+    PHASE_RELEASE,
+    PHASE_SLEEP,
+    PHASE_XTRIGGERS,
+    LoopTimer,
+)
 from cylc.flow.network import API
 from cylc.flow.network.authentication import key_housekeeping
 from cylc.flow.network.schema import WorkflowStopMode
@@ -179,8 +194,9 @@ class Scheduler:
     EVENT_INACTIVITY_TIMEOUT = WorkflowEventHandler.EVENT_INACTIVITY_TIMEOUT
 
     # Intervals in seconds
+    # (max time between main loop passes, the loop is woken sooner if there
+    # are task messages, commands or subprocesses to deal with)
     INTERVAL_MAIN_LOOP = 1.0
-    INTERVAL_MAIN_LOOP_QUICK = 0.5
     INTERVAL_STOP_KILL = 10.0
     INTERVAL_STOP_PROCESS_POOL_EMPTY = 0.5
     INTERVAL_AUTO_RESTART_ERROR = 5
@@ -223,6 +239,7 @@ class Scheduler:
     flow_mgr: FlowMgr
 
     # queues
+    wakeup_event: ThreadSafeEvent
     command_queue: 'Queue[Tuple[str, str, list, dict]]'
     message_queue: 'Queue[TaskMsg]'
     ext_trigger_queue: Queue
@@ -289,6 +306,7 @@ class Scheduler:
         # mutable defaults
         self._profile_amounts = {}
         self._profile_update_times = {}
+        self.loop_timer = LoopTimer()
         self.bad_hosts: Set[str] = set()
 
         self.restored_stop_task_id: Optional[str] = None
@@ -367,7 +385,8 @@ class Scheduler:
 
         self.server = WorkflowRuntimeServer(self)
 
-        self.proc_pool = SubProcPool()
+        self.wakeup_event = ThreadSafeEvent()
+        self.proc_pool = SubProcPool(wakeup=self.wakeup)
         self.command_queue = Queue()
         self.message_queue = Queue()
         self.ext_trigger_queue = Queue()
@@ -647,8 +666,7 @@ class Scheduler:
                     self
                 )
             )
-            self.server.publish_queue.put(
-                self.data_store_mgr.publish_deltas)
+            self.server.queue_publish(self.data_store_mgr.publish_deltas)
             # Non-async sleep - yield to other threads rather than event loop
             sleep(0)
             self.profiler.start()
@@ -875,11 +893,21 @@ class Scheduler:
         except (KeyError, ValueError, AttributeError):
             return
 
+    def wakeup(self) -> None:
+        """Wake the main loop to run another pass as soon as possible.
+
+        This is thread safe, call it after putting anything in the command,
+        message or external trigger queues.
+        """
+        self.wakeup_event.set()
+
     def process_queued_task_messages(self) -> None:
         """Process incoming task messages for each task proxy.
 
         """
         messages: 'Dict[str, List[Tuple[Optional[int], TaskMsg]]]' = {}
+        # {job_id: (task_id, job)} - jobs often send several messages at once
+        job_ids: 'Dict[Any, Tuple[str, Optional[int]]]' = {}
 
         # Retrieve queued messages
         while self.message_queue.qsize():
@@ -888,24 +916,27 @@ class Scheduler:
             except Empty:
                 break
             self.message_queue.task_done()
-            tokens = Tokens(task_msg.job_id, relative=True)
-            # task ID (job stripped)
-            task_id = tokens.duplicate(job=None).relative_id
-            messages.setdefault(task_id, [])
-            # job may be None (e.g. simulation mode)
-            job = int(tokens['job']) if tokens['job'] else None
-            messages[task_id].append(
+            try:
+                task_id, job = job_ids[task_msg.job_id]
+            except KeyError:
+                tokens = Tokens(task_msg.job_id, relative=True)
+                # task ID (job stripped)
+                task_id = tokens.duplicate(job=None).relative_id
+                # job may be None (e.g. simulation mode)
+                job = int(tokens['job']) if tokens['job'] else None
+                job_ids[task_msg.job_id] = (task_id, job)
+            messages.setdefault(task_id, []).append(
                 (job, task_msg)
             )
 
         # Poll tasks for which messages caused a backward state change.
         to_poll_tasks = []
-        for itask in self.pool.get_tasks():
-            message_items = messages.get(itask.identity)
-            if message_items is None:
+        for task_id in list(messages):
+            itask = self.pool.get_task_by_id(task_id)
+            if itask is None:
                 continue
             should_poll = False
-            del messages[itask.identity]
+            message_items = messages.pop(task_id)
             for submit_num, tm in message_items:
                 if self.task_events_mgr.process_message(
                     itask, tm.severity, tm.message, tm.event_time,
@@ -1133,7 +1164,7 @@ class Scheduler:
             await self.update_data_structure()
             self.update_data_store()
             # give commands time to complete
-            sleep(1)  # give any remove-init's time to complete
+            await asyncio.sleep(1)  # give any remove-init's time to complete
 
         # reload the workflow definition
         self.reload_pending = 'loading the workflow definition'
@@ -1482,10 +1513,9 @@ class Scheduler:
             )
         ):
             # don't release queued tasks, finish processing preparing tasks
-            pre_prep_tasks = [
-                itask for itask in self.pool.get_tasks()
-                if itask.state(TASK_STATUS_PREPARING)
-            ]
+            pre_prep_tasks = self.pool.get_tasks_by_status(
+                TASK_STATUS_PREPARING
+            )
 
         # Return, if no tasks to submit.
         else:
@@ -1527,28 +1557,37 @@ class Scheduler:
         self.workflow_db_mgr.process_queued_ops()
 
     def database_health_check(self):
-        """If public database is stuck, blast it away by copying the content
-        of the private database into it."""
+        """If public database is stuck, rebuild it from the content of the
+        private database (a chunk per main loop iteration)."""
         self.workflow_db_mgr.recover_pub_from_pri()
 
     def late_tasks_check(self):
-        """Report tasks that are never active and are late."""
+        """Report tasks that are never active and are late.
+
+        Only tasks which have reached their late time are checked, see
+        TaskPool.late_task_deadlines.
+        """
         now = time()
-        for itask in self.pool.get_tasks():
+        for task_id in self.pool.late_task_deadlines.pop_due(now):
+            itask = self.pool.get_task_by_id(task_id)
             if (
-                    not itask.is_late
-                    and itask.get_late_time()
-                    and itask.state(*TASK_STATUSES_NEVER_ACTIVE)
-                    and now > itask.get_late_time()
+                itask is None
+                or itask.is_late
+                or not itask.state(*TASK_STATUSES_NEVER_ACTIVE)
             ):
-                msg = '%s (late-time=%s)' % (
-                    self.task_events_mgr.EVENT_LATE,
-                    time2str(itask.get_late_time()))
-                itask.is_late = True
-                LOG.warning(f"[{itask}] {msg}")
-                self.task_events_mgr.setup_event_handlers(
-                    itask, self.task_events_mgr.EVENT_LATE, msg)
-                self.workflow_db_mgr.put_insert_task_late_flags(itask)
+                continue
+            late_time = itask.get_late_time()
+            if now <= late_time:
+                self.pool.late_task_deadlines.add(task_id, late_time)
+                continue
+            msg = '%s (late-time=%s)' % (
+                self.task_events_mgr.EVENT_LATE,
+                time2str(late_time))
+            itask.is_late = True
+            LOG.warning(f"[{itask}] {msg}")
+            self.task_events_mgr.setup_event_handlers(
+                itask, self.task_events_mgr.EVENT_LATE, msg)
+            self.workflow_db_mgr.put_insert_task_late_flags(itask)
 
     def reset_inactivity_timer(self):
         """Reset inactivity timer - method passed to task event manager."""
@@ -1561,6 +1600,10 @@ class Scheduler:
         # check submission and execution timeout and polling timers
         if not self.config.run_mode('simulation'):
             self.task_job_mgr.check_task_jobs(self.workflow, self.pool)
+            self.task_job_mgr.check_job_status_files(self.workflow, self.pool)
+        else:
+            # (there are no jobs to time out or poll)
+            self.task_events_mgr.job_timer_deadlines.pop_due()
 
     async def workflow_shutdown(self):
         """Determines if the workflow can be shutdown yet."""
@@ -1586,7 +1629,8 @@ class Scheduler:
                     "Waiting for the command process pool to empty" +
                     " for shutdown")
                 while self.proc_pool.is_not_done():
-                    sleep(self.INTERVAL_STOP_PROCESS_POOL_EMPTY)
+                    await asyncio.sleep(
+                        self.INTERVAL_STOP_PROCESS_POOL_EMPTY)
                     if stop_process_pool_empty_msg:
                         LOG.info(stop_process_pool_empty_msg)
                         stop_process_pool_empty_msg = None
@@ -1711,28 +1755,28 @@ class Scheduler:
 
     async def main_loop(self) -> None:
         """The scheduler main loop."""
+        timer = self.loop_timer
         while True:  # MAIN LOOP
             tinit = time()
+            timer.start()
+            # Anything which arrives from here on gets another pass.
+            self.wakeup_event.clear()
 
             # Useful for debugging core scheduler issues:
             # import logging
             # self.pool.log_task_pool(logging.CRITICAL)
             if self.incomplete_ri_map:
                 self.manage_remote_init()
+            timer.lap(PHASE_OTHER)
 
             await self.process_command_queue()
+            timer.lap(PHASE_COMMANDS)
             self.proc_pool.process()
+            timer.lap(PHASE_PROC_POOL)
 
             # Unqueued tasks with satisfied prerequisites must be waiting on
             # xtriggers or ext_triggers. Check these and queue tasks if ready.
-            for itask in self.pool.get_tasks():
-                if (
-                    not itask.state(TASK_STATUS_WAITING)
-                    or itask.state.is_queued
-                    or itask.state.is_runahead
-                ):
-                    continue
-
+            for itask in self.pool.get_waiting_unqueued_tasks():
                 if (
                     itask.state.xtriggers
                     and not itask.state.xtriggers_all_satisfied()
@@ -1754,15 +1798,17 @@ class Scheduler:
 
             if self.xtrigger_mgr.do_housekeeping:
                 self.xtrigger_mgr.housekeep(self.pool.get_tasks())
+            timer.lap(PHASE_XTRIGGERS)
 
             self.pool.clock_expire_tasks()
             self.release_queued_tasks()
+            timer.lap(PHASE_RELEASE)
 
             if (
                 self.pool.config.run_mode('simulation')
                 and sim_time_check(
                     self.task_events_mgr,
-                    self.pool.get_tasks(),
+                    self.pool.get_tasks_by_status(TASK_STATUS_RUNNING),
                     self.workflow_db_mgr,
                 )
             ):
@@ -1771,17 +1817,21 @@ class Scheduler:
 
             self.broadcast_mgr.expire_broadcast(self.pool.get_min_point())
             self.late_tasks_check()
+            timer.lap(PHASE_OTHER)
 
             self.process_queued_task_messages()
+            timer.lap(PHASE_MESSAGES)
             await self.process_command_queue()
+            timer.lap(PHASE_COMMANDS)
             self.task_events_mgr.process_events(self)
+            timer.lap(PHASE_EVENTS)
 
             # Update state summary, database, and uifeed
             self.workflow_db_mgr.put_task_event_timers(self.task_events_mgr)
+            timer.lap(PHASE_DATABASE)
 
             # List of task whose states have changed.
-            updated_task_list = [
-                t for t in self.pool.get_tasks() if t.state.is_updated]
+            updated_task_list = self.pool.get_updated_tasks()
             has_updated = updated_task_list or self.is_updated
 
             if updated_task_list and self.is_restart_timeout_wait:
@@ -1793,6 +1843,7 @@ class Scheduler:
             if has_updated or self.data_store_mgr.updates_pending:
                 # Update the datastore.
                 await self.update_data_structure()
+            timer.lap(PHASE_DATA_STORE)
 
             if has_updated:
                 if not self.is_reloaded:
@@ -1802,8 +1853,7 @@ class Scheduler:
 
                 # Reset workflow and task updated flags.
                 self.is_updated = False
-                for itask in updated_task_list:
-                    itask.state.is_updated = False
+                self.pool.reset_updated_tasks()
 
                 if not self.is_stalled:
                     # Stop the stalled timer.
@@ -1812,9 +1862,10 @@ class Scheduler:
 
             self.process_workflow_db_queue()
 
-            # If public database is stuck, blast it away by copying the content
-            # of the private database into it.
+            # If public database is stuck, rebuild it from the content of the
+            # private database.
             self.database_health_check()
+            timer.lap(PHASE_DATABASE)
 
             # Shutdown workflow if timeouts have occurred
             self.timeout_check()
@@ -1824,6 +1875,7 @@ class Scheduler:
 
             if self.options.profile_mode:
                 self.update_profiler_logs(tinit)
+            timer.lap(PHASE_OTHER)
 
             # Run plugin functions
             await asyncio.gather(
@@ -1833,30 +1885,41 @@ class Scheduler:
                     self
                 )
             )
+            timer.lap(PHASE_PLUGINS)
 
             if not has_updated and not self.stop_mode:
                 # Has the workflow stalled?
                 self.check_workflow_stalled()
-
-            # Sleep a bit for things to catch up.
-            # Quick sleep if there are items pending in process pool.
-            # (Should probably use quick sleep logic for other queues?)
-            elapsed = time() - tinit
-            quick_mode = self.proc_pool.is_not_done()
-            if (elapsed >= self.INTERVAL_MAIN_LOOP or
-                    quick_mode and elapsed >= self.INTERVAL_MAIN_LOOP_QUICK):
-                # Main loop has taken quite a bit to get through
-                # Still yield control to other threads by sleep(0.0)
-                duration: float = 0
-            elif quick_mode:
-                duration = self.INTERVAL_MAIN_LOOP_QUICK - elapsed
-            else:
-                duration = self.INTERVAL_MAIN_LOOP - elapsed
-            await asyncio.sleep(duration)
+            timer.lap(PHASE_OTHER)
+
+            # Sleep until woken by task messages, commands or subprocess
+            # activity, or until the next timer is due. Other time based
+            # checks (clock triggers, etc) are made at least every
+            # INTERVAL_MAIN_LOOP.
+            now = time()
+            timeout = self.INTERVAL_MAIN_LOOP - (now - tinit)
+            next_deadline = self.get_next_deadline()
+            if next_deadline is not None:
+                timeout = min(timeout, next_deadline - now)
+            await self.wakeup_event.wait(timeout)
+            timer.lap(PHASE_SLEEP)
+            timer.stop()
             # Record latest main loop interval
             self.main_loop_intervals.append(time() - tinit)
             # END MAIN LOOP
 
+    def get_next_deadline(self) -> Optional[float]:
+        """Return the time the next task or workflow timer is due, if any."""
+        deadlines = [
+            self.task_events_mgr.next_deadline(),
+            self.pool.late_task_deadlines.next_deadline(),
+            *(timer.timeout for timer in self.timers.values()),
+        ]
+        return min(
+            (deadline for deadline in deadlines if deadline is not None),
+            default=None,
+        )
+
     def _update_workflow_state(self):
         """Update workflow state in the data store and push out any deltas.
 
@@ -1883,8 +1946,7 @@ class Scheduler:
         """Publish pending deltas."""
         if self.data_store_mgr.publish_pending:
             self.data_store_mgr.publish_pending = False
-            self.server.publish_queue.put(
-                self.data_store_mgr.publish_deltas)
+            self.server.queue_publish(self.data_store_mgr.publish_deltas)
             # Non-async sleep - yield to other threads rather
             # than event loop
             sleep(0)
@@ -1957,6 +2019,9 @@ class Scheduler:
             except Exception as exc:
                 LOG.exception(exc)
 
+        if hasattr(self, 'task_job_mgr'):
+            self.task_job_mgr.close()
+
         if hasattr(self, 'pool'):
             try:
                 if not self.is_stalled:
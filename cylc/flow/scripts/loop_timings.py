@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""cylc loop-timings [OPTIONS] ARGS
+
+Show the time a running workflow spends in each phase of its main loop.
+
+The scheduler times every main loop. This command shows statistics for the
+recent loops (the "loops" column) for each phase:
+  share  the fraction of the loop time spent in the phase
+  mean, p50, p90, p99, max  the time spent in the phase per loop
+
+The "loop" row is the total for all phases except "sleep", which is the time
+spent waiting for something to do.
+
+Examples:
+  $ cylc loop-timings WORKFLOW
+  $ cylc loop-timings --histogram WORKFLOW
+"""
+
+from functools import partial
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from cylc.flow.network.client_factory import get_client
+from cylc.flow.network.multi import call_multi
+from cylc.flow.option_parsers import (
+    WORKFLOW_ID_MULTI_ARG_DOC,
+    CylcOptionParser as COP,
+)
+from cylc.flow.terminal import cli_function
+
+if TYPE_CHECKING:
+    from optparse import Values
+
+
+QUERY = '''
+query ($wFlows: [ID]) {
+  workflows(ids: $wFlows) {
+    id
+    loopTimings {
+      name
+      count
+      total
+      loops
+      mean
+      max
+      p50
+      p90
+      p99
+      share
+      histogram {
+        le
+        count
+      }
+    }
+  }
+}
+'''
+
+COLUMNS = ('share', 'mean', 'p50', 'p90', 'p99', 'max')
+
+
+def get_option_parser() -> COP:
+    parser = COP(
+        __doc__,
+        comms=True,
+        multiworkflow=True,
+        argdoc=[WORKFLOW_ID_MULTI_ARG_DOC],
+    )
+    parser.add_option(
+        '--histogram',
+        action='store_true',
+        default=False,
+        help='Also print a histogram of the times for each phase.',
+    )
+    parser.add_option(
+        '--json',
+        action='store_true',
+        default=False,
+        help='Print output in JSON format.',
+    )
+    return parser
+
+
+def _format_time(seconds: float) -> str:
+    """Format a time for display.
+
+    Examples:
+        >>> _format_time(0.00012)
+        '0.1ms'
+        >>> _format_time(1.5)
+        '1500.0ms'
+
+    """
+    return f'{seconds * 1000:.1f}ms'
+
+
+def _format_share(share: Optional[float]) -> str:
+    """Format a fraction of the loop time for display.
+
+    Examples:
+        >>> _format_share(0.125)
+        '12.5%'
+        >>> _format_share(None)
+        '-'
+
+    """
+    if share is None:
+        return '-'
+    return f'{share * 100:.1f}%'
+
+
+def format_timings(timings: List[Dict[str, Any]], histogram: bool) -> str:
+    """Format the loop timings as a table."""
+    rows = [('phase', 'loops', *COLUMNS)]
+    for timing in timings:
+        rows.append((
+            timing['name'],
+            str(timing['loops']),
+            _format_share(timing['share']),
+            *(_format_time(timing[key]) for key in COLUMNS[1:]),
+        ))
+    widths = [max(len(value) for value in column) for column in zip(*rows)]
+    lines = [
+        '  '.join(
+            [row[0].ljust(widths[0])]
+            + [
+                value.rjust(width)
+                for value, width in zip(row[1:], widths[1:])
+            ]
+        )
+        for row in rows
+    ]
+    if histogram:
+        for timing in timings:
+            lines.append(f'\n{timing["name"]}:')
+            for bucket in timing['histogram']:
+                if not bucket['count']:
+                    continue
+                if bucket['le'] is None:
+                    label = 'more'
+                else:
+                    label = f'<= {_format_time(bucket["le"])}'
+                lines.append(f'  {label:>12}  {bucket["count"]}')
+    return '\n'.join(lines)
+
+
+async def run(options: 'Values', workflow_id: str, *_) -> str:
+    pclient = get_client(workflow_id, timeout=options.comms_timeout)
+    query_kwargs = {
+        'request_string': QUERY,
+        'variables': {'wFlows': [workflow_id]},
+    }
+    result = await pclient.async_request('graphql', query_kwargs)
+    for workflow in result['workflows']:
+        if options.json:
+            return json.dumps(workflow['loopTimings'], indent=4)
+        return format_timings(workflow['loopTimings'], options.histogram)
+    return ''
+
+
+@cli_function(get_option_parser)
+def main(parser: COP, options: 'Values', *ids: str) -> None:
+    call_multi(
+        partial(run, options),
+        *ids,
+        report=print,
+        constraint='workflows',
+    )
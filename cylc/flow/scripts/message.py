@@ -60,6 +60,10 @@ Examples:
   > WARNING:Hey!
   >__STDIN__
 
+  # Send messages from STDIN as they arrive, in batches:
+  $ my-app | cylc message --batch-window=0.2 -- \
+  >     "${CYLC_WORKFLOW_ID}" "${CYLC_TASK_JOB}" -
+
 Note "${CYLC_WORKFLOW_ID}" and "${CYLC_TASK_JOB}" are available in job
 environments - you do not need to write their actual values in task scripting.
 
@@ -86,6 +90,10 @@ Note:
     cylc__job_abort 'message...'
   (For technical reasons this is a shell function, not a cylc sub-command).
 
+By default messages read from STDIN are sent when STDIN is closed. With
+--batch-window, each message is recorded as soon as it is read and messages
+are sent to the scheduler in batches, no more than SECONDS after they are read.
+
 For backward compatibility, if number of arguments is less than or equal to 2,
 the command assumes the classic interface, where all arguments are messages.
 Otherwise, the first 2 arguments are assumed to be workflow ID and job
@@ -96,14 +104,14 @@ identifier.
 from logging import getLevelName, INFO
 import os
 import sys
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator, List
 
 from cylc.flow.id_cli import parse_id
 from cylc.flow.option_parsers import (
     WORKFLOW_ID_ARG_DOC,
     CylcOptionParser as COP
 )
-from cylc.flow.task_message import record_messages
+from cylc.flow.task_message import MessageBatcher, record_messages
 from cylc.flow.terminal import cli_function
 from cylc.flow.exceptions import InputError
 from cylc.flow.unicode_rules import TaskMessageValidator
@@ -133,6 +141,16 @@ def get_option_parser() -> COP:
         help='Set severity levels for messages that do not have one',
         action='store', dest='severity')
 
+    parser.add_option(
+        '--batch-window',
+        metavar='SECONDS',
+        help=(
+            'Record messages read from STDIN as they arrive and send them'
+            ' to the scheduler in batches, waiting up to SECONDS for more'
+            ' messages before sending each batch.'
+        ),
+        action='store', type='float', dest='batch_window')
+
     return parser
 
 
@@ -163,38 +181,60 @@ def main(parser: COP, options: 'Values', *args: str) -> None:
             workflow_id,
             constraint='workflows',
         )
-    # Read messages from STDIN
-    if '-' in message_strs:
-        current_message_str = ''
-        while True:  # Note: `for line in sys.stdin:` can hang
-            message_str = sys.stdin.readline()
-            if message_str.strip():
-                # non-empty line
-                current_message_str += message_str
-            elif message_str:
-                # empty line, start next message
-                if current_message_str:
-                    message_strs.append(current_message_str)
-                current_message_str = ''  # reset
-            else:
-                # end of file
-                if current_message_str:
-                    message_strs.append(current_message_str)
-                break
     # Separate "severity: message"
-    messages = []  # [(severity, message_str), ...]
-    for message_str in message_strs:
-        if message_str == '-':
-            pass
-        elif ':' in message_str:
-            valid, err_msg = TaskMessageValidator.validate(message_str)
-            if not valid:
-                raise InputError(
-                    f'Invalid task message "{message_str}" - {err_msg}')
-            messages.append(
-                [item.strip() for item in message_str.split(':', 1)])
-        elif options.severity:
-            messages.append([options.severity, message_str.strip()])
+    messages = [  # [(severity, message_str), ...]
+        _parse_message(options, message_str)
+        for message_str in message_strs
+        if message_str != '-'
+    ]
+    if '-' not in message_strs:
+        record_messages(workflow_id, job_id, messages)
+    elif options.batch_window is not None:
+        # Record messages as they are read from STDIN
+        batcher = MessageBatcher(workflow_id, job_id, options.batch_window)
+        try:
+            if messages:
+                batcher.add(messages)
+            for message_str in _read_stdin():
+                batcher.add([_parse_message(options, message_str)])
+        finally:
+            batcher.flush()
+    else:
+        messages.extend(
+            _parse_message(options, message_str)
+            for message_str in _read_stdin()
+        )
+        record_messages(workflow_id, job_id, messages)
+
+
+def _read_stdin() -> Iterator[str]:
+    """Yield messages from STDIN, messages are separated by empty lines."""
+    current_message_str = ''
+    while True:  # Note: `for line in sys.stdin:` can hang
+        message_str = sys.stdin.readline()
+        if message_str.strip():
+            # non-empty line
+            current_message_str += message_str
+        elif message_str:
+            # empty line, start next message
+            if current_message_str:
+                yield current_message_str
+            current_message_str = ''  # reset
         else:
-            messages.append([getLevelName(INFO), message_str.strip()])
-    record_messages(workflow_id, job_id, messages)
+            # end of file
+            if current_message_str:
+                yield current_message_str
+            break
+
+
+def _parse_message(options: 'Values', message_str: str) -> List[str]:
+    """Return [severity, message] for a "[SEVERITY:]MESSAGE" string."""
+    if ':' in message_str:
+        valid, err_msg = TaskMessageValidator.validate(message_str)
+        if not valid:
+            raise InputError(
+                f'Invalid task message "{message_str}" - {err_msg}')
+        return [item.strip() for item in message_str.split(':', 1)]
+    if options.severity:
+        return [options.severity, message_str.strip()]
+    return [getLevelName(INFO), message_str.strip()]
@@ -69,6 +69,12 @@ class SubProcContext:  # noqa: SIM119 (not really relevant to this case)
                     Default STDERR content.
                 out (str):
                     Default STDOUT content.
+                platform (dict):
+                    The platform the command runs on.
+                remote_cmd (list):
+                    The "cylc" command that cmd runs on a remote platform
+                    (i.e. without the SSH command). If the platform has a
+                    jobs agent, this command may be run by it instead.
                 ret_code (int):
                     Default return code.
                 shell (boolean):
@@ -86,6 +92,9 @@ class SubProcContext:  # noqa: SIM119 (not really relevant to this case)
             Content of the command's STDOUT.
         .ret_code (int):
             Return code of the command.
+        .timeout (float):
+            Time (seconds since the epoch) at which the command is killed if
+            it is still running, set when the command is started.
         .timestamp (str):
             Time string of latest update.
         .proc_pool_timeout (float):
@@ -107,6 +116,7 @@ class SubProcContext:  # noqa: SIM119 (not really relevant to this case)
         self.ret_code = cmd_kwargs.get('ret_code')
         self.out = cmd_kwargs.get('out')
         self.host = host
+        self.timeout: Optional[float] = None
 
     def __str__(self):
         ret = ''
@@ -156,6 +166,9 @@ class SubFuncContext(SubProcContext):
             external trigger)
         .ret_val
             function return: (satisfied?, result to pass to trigger tasks)
+        .workflow_run_dir:
+            workflow run directory (local xtrigger modules are found under
+            lib/python in here)
     """
 
     DEFAULT_INTVL = 10.0
@@ -180,12 +193,14 @@ class SubFuncContext(SubProcContext):
         self.ret_val: Tuple[
             bool, Optional[dict]
         ] = (False, None)  # (satisfied, broadcast)
+        self.workflow_run_dir: Optional[str] = None
         super(SubFuncContext, self).__init__(
             'xtrigger-func', cmd=[], shell=False
         )
 
     def update_command(self, workflow_run_dir):
         """Update the function wrap command after changes."""
+        self.workflow_run_dir = workflow_run_dir
         self.cmd = ['cylc', 'function-run', self.func_name,
                     json.dumps(self.func_args),
                     json.dumps(self.func_kwargs),
@@ -15,7 +15,9 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Manage queueing and pooling of subprocesses for the scheduler."""
 
+import asyncio
 from collections import deque
+import inspect
 import json
 import os
 import select
@@ -26,27 +28,37 @@ from tempfile import SpooledTemporaryFile
 from threading import RLock
 from time import time
 from subprocess import DEVNULL, run  # nosec
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from cylc.flow import LOG, iter_entry_points
 from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
-from cylc.flow.cylc_subproc import procopen
-from cylc.flow.exceptions import PlatformLookupError
+from cylc.flow.cylc_subproc import aprocopen, procopen
+from cylc.flow.exceptions import JobsAgentError, PlatformLookupError
 from cylc.flow.hostuserutil import is_remote_host
+from cylc.flow.jobs_agent import JobsAgent
 from cylc.flow.platforms import (
     log_platform_event,
     get_platform,
 )
+from cylc.flow.subprocctx import SubFuncContext
 from cylc.flow.task_events_mgr import TaskJobLogsRetrieveContext
 from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.wallclock import get_current_time_string
+from cylc.flow.xtrigger_executor import XtriggerExecutor
 
 _XTRIG_MOD_CACHE: dict = {}
 _XTRIG_FUNC_CACHE: dict = {}
 
 
-def _killpg(proc, signal):
-    """Kill a process group."""
+def _killpg(proc, signal, cmd):
+    """Kill a process group.
+
+    Args:
+        proc: The process group leader (Popen or asyncio Process).
+        signal: The signal to send.
+        cmd: The command the process is running (for logging).
+
+    """
     try:
         os.killpg(proc.pid, signal)
     except ProcessLookupError:
@@ -61,7 +73,7 @@ def _killpg(proc, signal):
         # problem that shouldn't happen (it's really a bug in the Cylc subproc)
         LOG.error(
             f'Could not kill process group: {proc.pid}'
-            f'\nCommand: {" ".join(proc.args)}'
+            f'\nCommand: {" ".join(cmd)}'
         )
         return False
     return True
@@ -121,6 +133,19 @@ def get_xtrig_func(mod_name, func_name, src_dir):
     return _XTRIG_FUNC_CACHE[(mod_name, func_name)]
 
 
+async def _await(awaitable):
+    return await awaitable
+
+
+async def _read_stream(stream, chunks):
+    """Read an asyncio stream to EOF, appending the data to chunks."""
+    while True:
+        data = await stream.read(65536)  # 64K
+        if not data:
+            return
+        chunks.append(data)
+
+
 def run_function(func_name, json_args, json_kwargs, src_dir):
     """Run a Python function in the process pool.
 
@@ -143,6 +168,9 @@ def run_function(func_name, json_args, json_kwargs, src_dir):
     orig_stdout = sys.stdout
     sys.stdout = sys.stderr
     res = func(*func_args, **func_kwargs)
+    if inspect.isawaitable(res):
+        # Coroutine function.
+        res = asyncio.run(_await(res))
 
     # Restore stdout.
     sys.stdout = orig_stdout
@@ -169,6 +197,16 @@ class SubProcPool:
     SubProcContext object as they are read. STDIN can also be specified for the
     command. This is currently fed into the command using a temporary file.
 
+    When the pool is used from a running event loop (i.e. by the scheduler)
+    commands are run as asyncio subprocesses: their output is read, their
+    exit is detected and their timeout is enforced by the event loop, and the
+    wakeup function is called as soon as they are done. The callbacks are
+    called by "process" so that they run in step with the rest of the main
+    loop. Otherwise, commands are run with Popen and polled by "process".
+
+    Job commands for platforms with "use jobs agent" set are sent to a
+    cylc.flow.jobs_agent.JobsAgent for the platform host where possible.
+
     Note: For a cylc command that uses
     `cylc.flow.option_parsers.CylcOptionParser`, the default logging handler
     writes to the STDERR via a StreamHandler. Therefore, log messages will
@@ -181,17 +219,44 @@ class SubProcPool:
     JOBS_SUBMIT = 'jobs-submit'
     POLLREAD = select.POLLIN | select.POLLPRI
     RET_CODE_WORKFLOW_STOPPING = 999
+    # Max time (s) to read the remaining output of a command killed on timeout
+    KILL_READ_TIMEOUT = 1.0
+
+    def __init__(self, wakeup: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            wakeup:
+                Function to call when the pool has work to do, i.e. a command
+                has been queued or a running command has exited.
+
+                If provided, commands are run as asyncio subprocesses when
+                the pool is used from a running event loop.
 
-    def __init__(self):
+        """
         self.size = glbl_cfg().get(['scheduler', 'process pool size'])
         self.proc_pool_timeout = glbl_cfg().get(
             ['scheduler', 'process pool timeout'])
+        # xtrigger functions are run by long-lived workers if configured
+        self.xtrigger_executor: Optional[XtriggerExecutor] = None
+        xtrigger_pool_size = glbl_cfg().get(
+            ['scheduler', 'xtrigger pool size'])
+        if xtrigger_pool_size:
+            self.xtrigger_executor = XtriggerExecutor(
+                xtrigger_pool_size, self.proc_pool_timeout, wakeup)
         self.closed = False  # Close queue
         self.stopping = False  # No more job submit if True
         # .stopping may be set by an API command in a different thread
         self.stopping_lock = RLock()
-        self.queuings = deque()
-        self.runnings = []
+        self.queuings: Deque[list] = deque()
+        self.runnings: List[list] = []
+        self.wakeup = wakeup
+        # remote jobs agents {(platform_name, host): agent}
+        self.jobs_agents: Dict[Tuple[str, str], JobsAgent] = {}
+        # asyncio subprocesses of running commands
+        self._procs: Dict[
+            'asyncio.Task', 'asyncio.subprocess.Process'
+        ] = {}
+        self.pipepoller: Optional['select.poll']
         try:
             self.pipepoller = select.poll()
         except AttributeError:  # select.poll not implemented for this OS
@@ -201,6 +266,10 @@ class SubProcPool:
         """Close pool."""
         self.set_stopping()
         self.closed = True
+        if self.xtrigger_executor:
+            self.xtrigger_executor.close()
+        for agent in self.jobs_agents.values():
+            agent.close()
 
     @staticmethod
     def get_temporary_file():
@@ -209,7 +278,9 @@ class SubProcPool:
 
     def is_not_done(self):
         """Return True if queuings or runnings not empty."""
-        return self.queuings or self.runnings
+        return self.queuings or self.runnings or (
+            self.xtrigger_executor and self.xtrigger_executor.runnings
+        )
 
     def _is_stopping(self):
         """Return whether .stopping is True or not.
@@ -244,6 +315,13 @@ class SubProcPool:
 
     def process(self):
         """Process done child processes and submit more."""
+        # Handle xtrigger function calls that are done
+        if self.xtrigger_executor:
+            for _, ctx, callback, callback_args in (
+                self.xtrigger_executor.process()
+            ):
+                self._run_command_exit(
+                    ctx, callback=callback, callback_args=callback_args)
         # Handle child processes that are done
         runnings = []
         for running in self.runnings:
@@ -252,6 +330,26 @@ class SubProcPool:
                 callback, callback_args,
                 callback_255, callback_255_args
             ) = running
+            if isinstance(proc, asyncio.Task):
+                # Asyncio subprocess, the task sets ret_code, out and err
+                if proc.done():
+                    exc = None if proc.cancelled() else proc.exception()
+                    if exc is not None:
+                        LOG.error(
+                            f'{ctx.cmd_key}: command failed: {exc}',
+                            exc_info=exc,
+                        )
+                        ctx.ret_code = 1
+                        ctx.err = (ctx.err or '') + str(exc)
+                    self._run_command_exit(
+                        ctx, bad_hosts=bad_hosts,
+                        callback=callback, callback_args=callback_args,
+                        callback_255=callback_255,
+                        callback_255_args=callback_255_args
+                    )
+                else:
+                    runnings.append(running)
+                continue
             # Command completed/exited
             if proc.poll() is not None:
                 self._proc_exit(
@@ -265,7 +363,7 @@ class SubProcPool:
             # Command timed out, kill it
             if time() > ctx.timeout:
                 err_xtra = ""
-                if _killpg(proc, SIGKILL):
+                if _killpg(proc, SIGKILL, ctx.cmd):
                     err_xtra = (
                         f"\nkilled on timeout ({self.proc_pool_timeout})"
                     )
@@ -287,6 +385,7 @@ class SubProcPool:
         self.runnings[:] = runnings
         # Create more child processes, if items in queue and space in pool
         stopping = self._is_stopping()
+        loop = self._get_loop()
         while self.queuings and len(self.runnings) < self.size:
             (
                 ctx, bad_hosts, callback, callback_args,
@@ -296,6 +395,14 @@ class SubProcPool:
                 ctx.err = self.ERR_WORKFLOW_STOPPING
                 ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
                 self._run_command_exit(ctx)
+            elif loop:
+                ctx.timeout = time() + self.proc_pool_timeout
+                task = loop.create_task(self._run_command_async(ctx))
+                task.add_done_callback(self._on_task_done)
+                self.runnings.append([
+                    task, ctx, bad_hosts, callback, callback_args,
+                    callback_255, callback_255_args
+                ])
             else:
                 proc = self._run_command_init(
                     ctx, bad_hosts, callback, callback_args,
@@ -333,6 +440,8 @@ class SubProcPool:
                 callback=callback, callback_args=callback_args,
                 callback_255=callback_255, callback_255_args=callback_255_args
             )
+        elif self.xtrigger_executor and isinstance(ctx, SubFuncContext):
+            self.xtrigger_executor.put_command(ctx, callback, callback_args)
         else:
             self.queuings.append(
                 [
@@ -340,6 +449,8 @@ class SubProcPool:
                     callback_255, callback_255_args
                 ]
             )
+            if self.wakeup:
+                self.wakeup()
 
     @classmethod
     def run_command(cls, ctx):
@@ -370,13 +481,177 @@ class SubProcPool:
             ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
             self._run_command_exit(ctx)
         # Kill remaining processes
-        for value in self.runnings:
-            proc = value[0]
-            if proc:
-                _killpg(proc, SIGKILL)
+        if self.xtrigger_executor:
+            for _, ctx, callback, callback_args in (
+                self.xtrigger_executor.terminate(
+                    self.ERR_WORKFLOW_STOPPING,
+                    self.RET_CODE_WORKFLOW_STOPPING,
+                )
+            ):
+                self._run_command_exit(
+                    ctx, callback=callback, callback_args=callback_args)
+        for agent in self.jobs_agents.values():
+            agent.terminate()
+        runnings = []
+        for running in self.runnings:
+            proc, ctx, _, callback, callback_args = running[:5]
+            if isinstance(proc, asyncio.Task):
+                # Kill and handle the command now rather than wait for the
+                # event loop to run the cancelled task
+                if not proc.done():
+                    if proc in self._procs:
+                        _killpg(self._procs[proc], SIGKILL, ctx.cmd)
+                    proc.cancel()
+                    ctx.err = self.ERR_WORKFLOW_STOPPING
+                    ctx.ret_code = self.RET_CODE_WORKFLOW_STOPPING
+                    self._run_command_exit(
+                        ctx, callback=callback, callback_args=callback_args)
+                    continue
+            elif proc:
+                _killpg(proc, SIGKILL, ctx.cmd)
+            runnings.append(running)
+        self.runnings[:] = runnings
         # Wait for child processes
         self.process()
 
+    def _get_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Return the running event loop if commands should use it."""
+        if self.wakeup is None:
+            return None
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _on_task_done(self, _task: 'asyncio.Task') -> None:
+        """Call wakeup when the task running a command is done."""
+        if self.wakeup:
+            self.wakeup()
+
+    async def _run_command_async(self, ctx) -> None:
+        """Run the command in ctx as an asyncio subprocess.
+
+        Sets ctx.ret_code, ctx.out and ctx.err. The command is killed if it
+        is still running at ctx.timeout.
+        """
+        agent = self._get_jobs_agent(ctx)
+        if agent is not None:
+            try:
+                await self._run_command_agent(ctx, agent)
+                return
+            except JobsAgentError as exc:
+                if exc.sent:
+                    # the command may have run, treat like a lost connection
+                    ctx.ret_code = 255
+                    ctx.err = (ctx.err or '') + f'{exc}\n'
+                    return
+                # fall back to running the command over a new SSH connection
+        try:
+            proc = await aprocopen(
+                ctx.cmd, stdin=self._get_stdin_file(ctx),
+                # Execute command as a process group leader,
+                # so we can use "os.killpg" to kill the whole group.
+                preexec_fn=os.setpgrp,
+                env=ctx.cmd_kwargs.get('env'),
+                usesh=ctx.cmd_kwargs.get('shell'))
+        except OSError as exc:
+            if exc.filename is None:
+                exc.filename = ctx.cmd[0]
+            LOG.exception(exc)
+            ctx.ret_code = 1
+            ctx.err = str(exc)
+            return
+        LOG.debug(ctx.cmd)
+        task = asyncio.current_task()
+        if task is not None:
+            self._procs[task] = proc
+        out: List[bytes] = []
+        err: List[bytes] = []
+        err_xtra = ''
+        futures = [
+            asyncio.ensure_future(_read_stream(proc.stdout, out)),
+            asyncio.ensure_future(_read_stream(proc.stderr, err)),
+            asyncio.ensure_future(proc.wait()),
+        ]
+        try:
+            _, pending = await asyncio.wait(
+                futures, timeout=max(ctx.timeout - time(), 0))
+            if pending:
+                if _killpg(proc, SIGKILL, ctx.cmd):
+                    err_xtra = (
+                        f"\nkilled on timeout ({self.proc_pool_timeout})"
+                    )
+                # read what is left in the pipes
+                _, pending = await asyncio.wait(
+                    pending, timeout=self.KILL_READ_TIMEOUT)
+                for future in pending:
+                    future.cancel()
+        except asyncio.CancelledError:
+            # pool terminated
+            _killpg(proc, SIGKILL, ctx.cmd)
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            if task is not None:
+                self._procs.pop(task, None)
+        ctx.ret_code = await proc.wait()
+        if out:
+            ctx.out = (ctx.out or '') + b''.join(out).decode()
+        if err or err_xtra:
+            ctx.err = (ctx.err or '') + b''.join(err).decode() + err_xtra
+
+    def _get_jobs_agent(self, ctx) -> Optional[JobsAgent]:
+        """Return the jobs agent which should run the command in ctx."""
+        platform = ctx.cmd_kwargs.get('platform')
+        if (
+            not ctx.cmd_kwargs.get('remote_cmd')
+            or not platform
+            or not platform.get('use jobs agent')
+        ):
+            return None
+        key = (platform['name'], ctx.host)
+        agent = self.jobs_agents.get(key)
+        if agent is None:
+            agent = JobsAgent(platform, ctx.host)
+            self.jobs_agents[key] = agent
+        return agent
+
+    async def _run_command_agent(self, ctx, agent: JobsAgent) -> None:
+        """Run the command in ctx via a jobs agent.
+
+        Sets ctx.ret_code, ctx.out and ctx.err. If the command has not
+        returned by ctx.timeout it is failed. The agent is left running as
+        it may be running other commands (this one may yet complete).
+
+        Raises:
+            JobsAgentError: If the agent could not run the command.
+
+        """
+        stdin_file = self._get_stdin_file(ctx)
+        if stdin_file == DEVNULL:
+            stdin = ''
+        else:
+            stdin = stdin_file.read().decode()
+            stdin_file.seek(0)  # (for the fallback)
+        LOG.debug(f'[{agent}] {ctx.cmd_kwargs["remote_cmd"]}')
+        try:
+            ret_code, out, err = await asyncio.wait_for(
+                agent.run(ctx.cmd_kwargs['remote_cmd'], stdin),
+                max(ctx.timeout - time(), 0),
+            )
+        except asyncio.TimeoutError:
+            ret_code = 1
+            out = ''
+            err = (
+                f"\ntimed out ({self.proc_pool_timeout}) waiting for {agent}"
+            )
+        ctx.ret_code = ret_code
+        if out:
+            ctx.out = (ctx.out or '') + out
+        if err:
+            ctx.err = (ctx.err or '') + err
+
     def _poll_proc_pipes(self, proc, ctx):
         """Poll STDOUT/ERR of proc and read some data if possible.
 
@@ -429,6 +704,34 @@ class SubProcPool:
         self.pipepoller.unregister(proc.stdout.fileno())
         self.pipepoller.unregister(proc.stderr.fileno())
 
+    @classmethod
+    def _get_stdin_file(cls, ctx):
+        """Return the STDIN for the command in ctx."""
+        if ctx.cmd_kwargs.get('stdin_files'):
+            if len(ctx.cmd_kwargs['stdin_files']) > 1:
+                stdin_file = cls.get_temporary_file()
+                for file_ in ctx.cmd_kwargs['stdin_files']:
+                    if hasattr(file_, 'read'):
+                        stdin_file.write(file_.read())
+                    else:
+                        with open(file_, 'rb') as openfile:
+                            stdin_file.write(openfile.read())
+                stdin_file.seek(0)
+            elif hasattr(ctx.cmd_kwargs['stdin_files'][0], 'read'):
+                stdin_file = ctx.cmd_kwargs['stdin_files'][0]
+            else:
+                stdin_file = open(  # noqa: SIM115
+                    # (nasty use of file handles, should avoid in future)
+                    ctx.cmd_kwargs['stdin_files'][0], 'rb'
+                )
+        elif ctx.cmd_kwargs.get('stdin_str'):
+            stdin_file = cls.get_temporary_file()
+            stdin_file.write(ctx.cmd_kwargs.get('stdin_str').encode())
+            stdin_file.seek(0)
+        else:
+            stdin_file = DEVNULL
+        return stdin_file
+
     @classmethod
     def _run_command_init(
         cls, ctx, bad_hosts=None, callback=None, callback_args=None,
@@ -436,31 +739,9 @@ class SubProcPool:
     ):
         """Prepare and launch shell command in ctx."""
         try:
-            if ctx.cmd_kwargs.get('stdin_files'):
-                if len(ctx.cmd_kwargs['stdin_files']) > 1:
-                    stdin_file = cls.get_temporary_file()
-                    for file_ in ctx.cmd_kwargs['stdin_files']:
-                        if hasattr(file_, 'read'):
-                            stdin_file.write(file_.read())
-                        else:
-                            with open(file_, 'rb') as openfile:
-                                stdin_file.write(openfile.read())
-                    stdin_file.seek(0)
-                elif hasattr(ctx.cmd_kwargs['stdin_files'][0], 'read'):
-                    stdin_file = ctx.cmd_kwargs['stdin_files'][0]
-                else:
-                    stdin_file = open(  # noqa: SIM115
-                        # (nasty use of file handles, should avoid in future)
-                        ctx.cmd_kwargs['stdin_files'][0], 'rb'
-                    )
-            elif ctx.cmd_kwargs.get('stdin_str'):
-                stdin_file = cls.get_temporary_file()
-                stdin_file.write(ctx.cmd_kwargs.get('stdin_str').encode())
-                stdin_file.seek(0)
-            else:
-                stdin_file = DEVNULL
             proc = procopen(
-                ctx.cmd, stdin=stdin_file, stdoutpipe=True, stderrpipe=True,
+                ctx.cmd, stdin=cls._get_stdin_file(ctx),
+                stdoutpipe=True, stderrpipe=True,
                 # Execute command as a process group leader,
                 # so we can use "os.killpg" to kill the whole group.
                 preexec_fn=os.setpgrp,
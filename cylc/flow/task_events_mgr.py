@@ -40,6 +40,7 @@ from typing import (
     NamedTuple,
     Optional,
     Sequence,
+    Set,
     Union,
     cast,
 )
@@ -57,6 +58,7 @@ from cylc.flow.task_action_timer import (
     TaskActionTimer,
     TimerFlags
 )
+from cylc.flow.timer import DeadlineQueue
 from cylc.flow.platforms import (
     get_platform, get_host_from_platform,
     log_platform_event
@@ -458,6 +460,14 @@ class TaskEventsManager():
         # NOTE: do not mutate directly
         # use the {add,remove,unset_waiting}_event_timers methods
         self._event_timers: Dict[EventKey, Any] = {}
+        # event timers that need processing, by when they are due
+        self._event_timer_deadlines = DeadlineQueue()
+        # mail event timers held back until next_mail_time
+        self._held_mail_timers: Set[EventKey] = set()
+        # task job timeouts and poll times by task ID
+        self.job_timer_deadlines = DeadlineQueue()
+        # task retry times by task ID (to wake the scheduler)
+        self.retry_deadlines = DeadlineQueue()
         # NOTE: flag for DB use
         self.event_timers_updated = True
         # To be set by the task pool:
@@ -539,8 +549,14 @@ class TaskEventsManager():
         """
         ctx_groups: dict = {}
         now = time()
-        for id_key, timer in self._event_timers.copy().items():
-            if timer.is_waiting:
+        if schd.stop_mode and self._held_mail_timers:
+            # don't hold back mail on shutdown
+            for id_key in self._held_mail_timers:
+                self._event_timer_deadlines.add(id_key, 0)
+            self._held_mail_timers.clear()
+        for id_key in self._event_timer_deadlines.pop_due(now):
+            timer = self._event_timers.get(id_key)
+            if timer is None or timer.is_waiting:
                 continue
             # Set timer if timeout is None.
             if not timer.is_timeout_set():
@@ -569,7 +585,10 @@ class TaskEventsManager():
                 if msg:
                     LOG.debug("%s %s", id_key.tokens.relative_id, msg)
             # Ready to run?
-            if not timer.is_delay_done() or (
+            if not timer.is_delay_done():
+                self._event_timer_deadlines.add(id_key, timer.timeout)
+                continue
+            if (
                 # Avoid flooding user's mail box with mail notification.
                 # Group together as many notifications as possible within a
                 # given interval.
@@ -578,7 +597,10 @@ class TaskEventsManager():
                 self.next_mail_time is not None and
                 self.next_mail_time > now
             ):
+                self._event_timer_deadlines.add(id_key, self.next_mail_time)
+                self._held_mail_timers.add(id_key)
                 continue
+            self._held_mail_timers.discard(id_key)
 
             timer.set_waiting()
             if isinstance(timer.ctx, CustomTaskEventHandlerContext):
@@ -1188,6 +1210,7 @@ class TaskEventsManager():
             for key in proc_ctx.cmd_kwargs['id_keys']:
                 timer = self._event_timers[key]
                 timer.reset()
+                self._schedule_event_timer(key)
 
     def _job_logs_retrieval_callback(self, proc_ctx, schd) -> None:
         """Call back when log job retrieval completes."""
@@ -1265,6 +1288,7 @@ class TaskEventsManager():
         kwargs = {
             'trigger_time': wallclock_time
         }
+        self.retry_deadlines.add(itask.identity, wallclock_time)
 
         # if this isn't the first retry the xtrigger will already exist
         if label in itask.state.xtriggers:
@@ -1787,6 +1811,7 @@ class TaskEventsManager():
             # Reset, task not active
             itask.timeout = None
             itask.poll_timer = None
+            self.job_timer_deadlines.remove(itask.identity)
             return
         ctx = (itask.submit_num, itask.state.status)
         if itask.poll_timer and itask.poll_timer.ctx == ctx:
@@ -1847,6 +1872,7 @@ class TaskEventsManager():
         LOG.info(f"[{itask}] {message}")
         # Set next poll time
         self.check_poll_time(itask)
+        self.schedule_job_timers(itask)
 
     @staticmethod
     def process_execution_polling_intervals(
@@ -1922,6 +1948,7 @@ class TaskEventsManager():
 
         """
         self._event_timers[id_key] = event_timer
+        self._schedule_event_timer(id_key)
         self.event_timers_updated = True
 
     def remove_event_timer(self, id_key: EventKey) -> None:
@@ -1932,13 +1959,55 @@ class TaskEventsManager():
 
         """
         del self._event_timers[id_key]
+        self._event_timer_deadlines.remove(id_key)
+        self._held_mail_timers.discard(id_key)
         self.event_timers_updated = True
 
     def unset_waiting_event_timer(self, id_key: EventKey) -> None:
         """Invoke unset_waiting on an event timer."""
         self._event_timers[id_key].unset_waiting()
+        self._schedule_event_timer(id_key)
         self.event_timers_updated = True
 
+    def _schedule_event_timer(self, id_key: EventKey) -> None:
+        """Queue an event timer for processing when it is next due."""
+        timer = self._event_timers[id_key]
+        if timer.is_waiting:
+            self._event_timer_deadlines.remove(id_key)
+        else:
+            # (processed immediately if the timeout is not set yet)
+            self._event_timer_deadlines.add(id_key, timer.timeout or 0)
+
+    def schedule_job_timers(self, itask: 'TaskProxy') -> None:
+        """Queue a task for checking when its job timeout or poll is due."""
+        deadlines = [itask.timeout]
+        if itask.poll_timer is not None:
+            deadlines.append(itask.poll_timer.timeout)
+        deadline = min(
+            (deadline for deadline in deadlines if deadline is not None),
+            default=None,
+        )
+        if deadline is None:
+            self.job_timer_deadlines.remove(itask.identity)
+        else:
+            self.job_timer_deadlines.add(itask.identity, deadline)
+
+    def next_deadline(self) -> Optional[float]:
+        """Return the time the next task event timer is due, if any."""
+        self.retry_deadlines.pop_due()
+        return min(
+            (
+                deadline
+                for deadline in (
+                    self._event_timer_deadlines.next_deadline(),
+                    self.job_timer_deadlines.next_deadline(),
+                    self.retry_deadlines.next_deadline(),
+                )
+                if deadline is not None
+            ),
+            default=None,
+        )
+
     def reset_bad_hosts(self):
         """Clear bad_hosts list.
         """
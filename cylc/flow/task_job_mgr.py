@@ -24,8 +24,11 @@ This module provides logic to:
 * Prepare jobs poll/kill, and manage the callbacks.
 """
 
+import asyncio
 from contextlib import suppress
+from dataclasses import dataclass
 import json
+from math import ceil
 import os
 from logging import (
     CRITICAL,
@@ -35,7 +38,7 @@ from logging import (
 )
 from shutil import rmtree
 from time import time
-from typing import TYPE_CHECKING, Any, Union, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, Optional
 
 from cylc.flow import LOG
 from cylc.flow.job_runner_mgr import JobPollContext
@@ -51,11 +54,15 @@ from cylc.flow.hostuserutil import (
     is_remote_platform
 )
 from cylc.flow.job_file import JobFileWriter
+from cylc.flow.job_status_watcher import JobStatusWatcher
 from cylc.flow.parsec.util import (
     pdeepcopy,
     poverride
 )
-from cylc.flow.pathutil import get_remote_workflow_run_job_dir
+from cylc.flow.pathutil import (
+    get_remote_workflow_run_job_dir,
+    get_workflow_run_job_dir,
+)
 from cylc.flow.platforms import (
     get_host_from_platform,
     get_install_target_from_platform,
@@ -110,6 +117,7 @@ from cylc.flow.wallclock import (
     get_time_string_from_unix_time,
     get_utc_mode
 )
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.cfgspec.globalcfg import SYSPATH
 from cylc.flow.util import serialise
 
@@ -117,6 +125,39 @@ if TYPE_CHECKING:
     from cylc.flow.task_proxy import TaskProxy
 
 
+@dataclass
+class BatchSubmitStats:
+    """Job submission batch statistics for a platform."""
+
+    # number of job submission commands
+    batches: int = 0
+    # number of jobs submitted
+    jobs: int = 0
+    # largest number of jobs submitted by one command
+    max_size: int = 0
+    # total time (s) batches were held waiting for more jobs
+    wait: float = 0.0
+    # longest time (s) a batch was held waiting for more jobs
+    max_wait: float = 0.0
+
+    def add(self, size: int, wait: float) -> None:
+        """Record a job submission batch."""
+        self.batches += 1
+        self.jobs += size
+        self.max_size = max(self.max_size, size)
+        self.wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def __str__(self) -> str:
+        return (
+            f'batches={self.batches}'
+            f', mean size={self.jobs / (self.batches or 1):.1f}'
+            f', max size={self.max_size}'
+            f', mean wait={self.wait / (self.batches or 1):.2f}s'
+            f', max wait={self.max_wait:.2f}s'
+        )
+
+
 class TaskJobManager:
     """Manage task job submit, poll and kill.
 
@@ -157,16 +198,39 @@ class TaskJobManager:
         self.bad_hosts_to_clear = set()
         self.task_remote_mgr = TaskRemoteMgr(
             workflow, proc_pool, self.bad_hosts, self.workflow_db_mgr)
+        # {platform_name: time the first held job became ready to submit}
+        self.batch_submit_ready_times: Dict[str, float] = {}
+        self.batch_submit_stats: Dict[str, BatchSubmitStats] = {}
+        self.job_status_watcher: Optional[JobStatusWatcher] = None
+        # {job_log_dir: (number of messages, summary)} for watched jobs
+        self.job_status_seen: Dict[str, Tuple[int, str]] = {}
+        if glbl_cfg().get(['scheduler', 'watch job status files']):
+            try:
+                self.job_status_watcher = JobStatusWatcher(
+                    get_workflow_run_job_dir(workflow),
+                    wakeup=proc_pool.wakeup,
+                )
+            except OSError as exc:
+                LOG.warning(f'Cannot watch job status files: {exc}')
 
     def check_task_jobs(self, workflow, task_pool):
         """Check submission and execution timeout and polling timers.
 
         Poll tasks that have timed out and/or have reached next polling time.
+        Only tasks with timers that are due are checked, see
+        TaskEventsManager.schedule_job_timers.
         """
         now = time()
         poll_tasks = set()
-        for itask in task_pool.get_tasks():
-            if self.task_events_mgr.check_job_time(itask, now):
+        for task_id in self.task_events_mgr.job_timer_deadlines.pop_due(now):
+            itask = task_pool.get_task_by_id(task_id)
+            if itask is None:
+                continue
+            can_poll = self.task_events_mgr.check_job_time(itask, now)
+            # (the poll timer and timeout may have changed)
+            task_pool.set_db_updated(itask)
+            self.task_events_mgr.schedule_job_timers(itask)
+            if can_poll:
                 poll_tasks.add(itask)
                 if itask.poll_timer.delay is not None:
                     LOG.info(
@@ -176,6 +240,78 @@ class TaskJobManager:
         if poll_tasks:
             self.poll_task_jobs(workflow, poll_tasks)
 
+    def check_job_status_files(self, workflow, task_pool):
+        """Process changes to watched job status files.
+
+        Process the new messages and status of the jobs, as if they had
+        been polled. Start watching the status files of new jobs and stop
+        watching those of finished jobs.
+
+        See "[scheduler]watch job status files".
+        """
+        watcher = self.job_status_watcher
+        if watcher is None:
+            return
+        changed = watcher.get_changed()
+        jobs = {}
+        for itask in task_pool.get_tasks_by_status(
+            TASK_STATUS_SUBMITTED, TASK_STATUS_RUNNING
+        ):
+            if not self._is_job_status_watchable(itask):
+                continue
+            job_log_dir = itask.tokens.duplicate(
+                job=str(itask.submit_num)).relative_id
+            jobs[job_log_dir] = itask
+            if job_log_dir not in watcher.watches and watcher.watch(
+                job_log_dir
+            ):
+                # pick up anything written before the watch started
+                changed.add(job_log_dir)
+        for job_log_dir in set(watcher.watches) - set(jobs):
+            watcher.unwatch(job_log_dir)
+        for job_log_dir in set(self.job_status_seen) - set(jobs):
+            del self.job_status_seen[job_log_dir]
+
+        for job_log_dir in sorted(changed):
+            itask = jobs.get(job_log_dir)
+            if itask is None:
+                continue
+            jp_ctx = self.job_runner_mgr._jobs_poll_status_files(
+                watcher.job_log_root, job_log_dir)
+            if jp_ctx is None:
+                continue
+            n_messages, summary = self.job_status_seen.get(
+                job_log_dir, (0, ''))
+            for message in jp_ctx.messages[n_messages:]:
+                try:
+                    event_time, severity, message = message.split('|', 2)
+                except ValueError:
+                    continue
+                self.task_events_mgr.process_message(
+                    itask, severity, message, event_time,
+                    self.task_events_mgr.FLAG_POLLED)
+            new_summary = jp_ctx.get_summary_str()
+            if new_summary != summary:
+                self._poll_task_job_status(itask, jp_ctx)
+            self.job_status_seen[job_log_dir] = (
+                len(jp_ctx.messages), new_summary)
+
+    @staticmethod
+    def _is_job_status_watchable(itask: 'TaskProxy') -> bool:
+        """Return True if the job status file can be watched locally."""
+        return (
+            itask.platform.get('communication method') == 'poll'
+            and (
+                get_install_target_from_platform(itask.platform)
+                == get_localhost_install_target()
+            )
+        )
+
+    def close(self):
+        """Stop watching job status files."""
+        if self.job_status_watcher is not None:
+            self.job_status_watcher.close()
+
     def kill_task_jobs(self, workflow, itasks):
         """Kill jobs of active tasks, and hold the tasks.
 
@@ -436,6 +572,15 @@ class TaskJobManager:
             ):
                 host = get_host()
 
+            if (
+                ri_map[install_target] == REMOTE_FILE_INSTALL_DONE
+                and self._hold_batch_submit(platform, itasks)
+            ):
+                # wait for more jobs to batch together
+                continue
+            batch_wait = time() - self.batch_submit_ready_times.pop(
+                platform['name'], time())
+
             done_tasks.extend(itasks)
             for itask in itasks:
                 # Log and persist
@@ -510,11 +655,9 @@ class TaskJobManager:
             # Chop itasks into a series of shorter lists if it's very big
             # to prevent overloading of stdout and stderr pipes.
             itasks = sorted(itasks, key=lambda itask: itask.identity)
-            chunk_size = (
-                len(itasks) // (
-                    (len(itasks) // platform['max batch submit size']) + 1
-                ) + 1
-            )
+            # (evenly sized batches of up to "max batch submit size")
+            n_batches = ceil(len(itasks) / platform['max batch submit size'])
+            chunk_size = ceil(len(itasks) / n_batches)
             itasks_batches = [
                 itasks[i:i + chunk_size]
                 for i in range(0, len(itasks), chunk_size)
@@ -522,8 +665,15 @@ class TaskJobManager:
             LOG.debug(
                 '%s ... # will invoke in batches, sizes=%s',
                 cmd, [len(b) for b in itasks_batches])
+            stats = self.batch_submit_stats.setdefault(
+                platform['name'], BatchSubmitStats())
+            for itasks_batch in itasks_batches:
+                stats.add(len(itasks_batch), batch_wait)
+            LOG.debug(f'[jobs-submit] {platform["name"]}: {stats}')
 
+            remote_cmd = None
             if remote_mode:
+                remote_cmd = cmd
                 cmd = construct_ssh_cmd(
                     cmd, platform, host
                 )
@@ -560,7 +710,11 @@ class TaskJobManager:
                         cmd + job_log_dirs,
                         stdin_files=stdin_files,
                         job_log_dirs=job_log_dirs,
-                        host=host
+                        host=host,
+                        platform=platform,
+                        remote_cmd=(
+                            remote_cmd + job_log_dirs if remote_cmd else None
+                        ),
                     ),
                     bad_hosts=self.task_remote_mgr.bad_hosts,
                     callback=self._submit_task_jobs_callback,
@@ -569,6 +723,30 @@ class TaskJobManager:
                 )
         return done_tasks
 
+    def _hold_batch_submit(
+        self, platform: dict, itasks: 'List[TaskProxy]'
+    ) -> bool:
+        """Return True if jobs should wait for more to batch together.
+
+        Jobs which are ready to submit are held (i.e. left waiting on job
+        prep) until "max batch submit size" jobs are ready or until the first
+        of them has waited for the platform's "batch submit window".
+        """
+        window = platform['batch submit window']
+        if not window or len(itasks) >= platform['max batch submit size']:
+            return False
+        now = time()
+        ready_time = self.batch_submit_ready_times.get(platform['name'])
+        if ready_time is None:
+            self.batch_submit_ready_times[platform['name']] = now
+            # make sure the main loop comes back here when the window ends
+            if self.proc_pool.wakeup is not None:
+                with suppress(RuntimeError):
+                    asyncio.get_running_loop().call_later(
+                        window, self.proc_pool.wakeup)
+            return True
+        return now < ready_time + window
+
     @staticmethod
     def _create_job_log_path(workflow, itask):
         """Create job log directory for a task job, etc.
@@ -827,7 +1005,10 @@ class TaskJobManager:
             return
         finally:
             log_task_job_activity(ctx, workflow, itask.point, itask.tdef.name)
+        self._poll_task_job_status(itask, jp_ctx)
 
+    def _poll_task_job_status(self, itask, jp_ctx):
+        """Process the polled status of a task job."""
         flag = self.task_events_mgr.FLAG_POLLED
         # Only log at INFO level if manually polling
         log_lvl = DEBUG if (
@@ -938,6 +1119,7 @@ class TaskJobManager:
             cmd.append(get_remote_workflow_run_job_dir(workflow))
             job_log_dirs = []
             host = 'localhost'
+            remote_cmd = cmd
 
             ctx = SubProcContext(cmd_key, cmd, host=host)
             if remote_mode:
@@ -953,7 +1135,10 @@ class TaskJobManager:
                     callback_255(ctx, workflow, itasks)
                     continue
                 else:
-                    ctx = SubProcContext(cmd_key, cmd, host=host)
+                    ctx = SubProcContext(
+                        cmd_key, cmd, host=host,
+                        platform=platform, remote_cmd=remote_cmd,
+                    )
 
             for itask in sorted(itasks, key=lambda task: task.identity):
                 job_log_dirs.append(
@@ -962,6 +1147,8 @@ class TaskJobManager:
                     ).relative_id
                 )
             cmd += job_log_dirs
+            if remote_mode:
+                remote_cmd += job_log_dirs
             LOG.debug(f'{cmd_key} for {platform["name"]} on {host}')
             self.proc_pool.put_command(
                 ctx,
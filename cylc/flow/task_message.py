@@ -24,9 +24,10 @@ Send messages to:
 from logging import getLevelName, WARNING, ERROR, CRITICAL
 import os
 import sys
-from typing import List
+from threading import Lock, Timer
+from typing import Dict, List, Optional, Tuple
 
-from cylc.flow.exceptions import WorkflowStopped
+from cylc.flow.exceptions import ClientError, WorkflowStopped
 import cylc.flow.flags
 from cylc.flow.pathutil import get_workflow_run_job_dir
 from cylc.flow.network.client_factory import (
@@ -82,13 +83,73 @@ def record_messages(workflow: str, job_id: str, messages: List[list]) -> None:
         messages: List of messages "[[severity, message], ...]".
     """
     # Record the event time, in case the message is delayed in some way.
-    event_time = get_current_time_string(
-        override_use_utc=(os.getenv('CYLC_UTC') == 'True'))
+    event_time = _get_event_time()
     write_messages(workflow, job_id, messages, event_time)
     if get_comms_method() != CommsMeth.POLL:
         send_messages(workflow, job_id, messages, event_time)
 
 
+def _get_event_time() -> str:
+    return get_current_time_string(
+        override_use_utc=(os.getenv('CYLC_UTC') == 'True'))
+
+
+class MessageBatcher:
+    """Record task job messages as they arrive, send them in batches.
+
+    Messages are printed and written to the job status file as soon as they
+    are added. Sending them to the workflow is deferred until ``window``
+    seconds after the first unsent message, so that messages issued in quick
+    succession share a single request.
+
+    Call :meth:`flush` to send any remaining messages.
+
+    Arguments:
+        workflow: Workflow ID.
+        job_id: Job identifier "CYCLE/TASK_NAME/SUBMIT_NUM".
+        window: Time to wait for more messages before sending (seconds).
+    """
+
+    def __init__(self, workflow: str, job_id: str, window: float):
+        self.workflow = workflow
+        self.job_id = job_id
+        self.window = window
+        self.send = get_comms_method() != CommsMeth.POLL
+        # [[job_id, event_time, severity, message], ...]
+        self._pending: List[list] = []
+        self._timer: Optional[Timer] = None
+        self._lock = Lock()
+        # held while sending, keeps batches in order
+        self._send_lock = Lock()
+
+    def add(self, messages: List[list]) -> None:
+        """Record messages "[[severity, message], ...]"."""
+        event_time = _get_event_time()
+        write_messages(self.workflow, self.job_id, messages, event_time)
+        if not self.send:
+            return
+        with self._lock:
+            self._pending.extend(
+                [self.job_id, event_time, severity, message]
+                for severity, message in messages
+            )
+            if self._timer is None:
+                self._timer = Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Send any unsent messages now."""
+        with self._send_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if batch:
+                send_batch(self.workflow, batch)
+
+
 def write_messages(workflow, job_id, messages, event_time):
     # Print to stdout/stderr
     for severity, message in messages:
@@ -103,6 +164,23 @@ def write_messages(workflow, job_id, messages, event_time):
 
 
 def send_messages(workflow, job_id, messages, event_time):
+    send_batch(
+        workflow,
+        [
+            [job_id, event_time, severity, message]
+            for severity, message in messages
+        ]
+    )
+
+
+def send_batch(workflow: str, batch: List[list]) -> None:
+    """Send task job messages to the workflow in a single request.
+
+    Arguments:
+        workflow: Workflow ID.
+        batch: List of messages
+            "[[job_id, event_time, severity, message], ...]".
+    """
     workflow = os.path.normpath(workflow)
     try:
         pclient = get_client(workflow)
@@ -118,6 +196,38 @@ def send_messages(workflow, job_id, messages, event_time):
             import traceback
             traceback.print_exc()
     else:
+        try:
+            pclient('put_messages', {'messages': batch})
+        except ClientError as exc:
+            if not exc.message.startswith('No method by the name'):
+                raise
+            # BACK COMPAT: scheduler without the "put_messages" endpoint
+            # from:
+            #     8.3.0
+            # remove at:
+            #     9.0?
+            _send_mutations(pclient, workflow, batch)
+
+
+def _send_mutations(pclient, workflow: str, batch: List[list]) -> None:
+    """Send messages using the GraphQL mutation, one request per job time.
+
+    Examples:
+        >>> sent = []
+        >>> _send_mutations(lambda *args: sent.append(args), 'w', [
+        ...     ['1/a/01', 't1', 'INFO', 'x'],
+        ...     ['1/a/01', 't1', 'INFO', 'y'],
+        ...     ['1/b/01', 't1', 'INFO', 'z'],
+        ... ])
+        >>> [args[1]['variables']['messages'] for args in sent]
+        [[['INFO', 'x'], ['INFO', 'y']], [['INFO', 'z']]]
+
+    """
+    groups: Dict[Tuple[str, str], List[list]] = {}
+    for job_id, event_time, severity, message in batch:
+        groups.setdefault((job_id, event_time), []).append(
+            [severity, message])
+    for (job_id, event_time), messages in groups.items():
         mutation_kwargs = {
             'request_string': MUTATION,
             'variables': {
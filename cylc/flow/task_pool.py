@@ -16,8 +16,10 @@
 
 """Wrangle task proxies to manage the workflow."""
 
+from bisect import bisect_left, insort
 from contextlib import suppress
 from collections import Counter
+from heapq import nsmallest
 import json
 from typing import (
     Dict,
@@ -54,6 +56,8 @@ from cylc.flow.task_proxy import TaskProxy
 from cylc.flow.task_state import (
     TASK_STATUSES_ACTIVE,
     TASK_STATUSES_FINAL,
+    TASK_STATUSES_NEVER_ACTIVE,
+    TASK_STATUSES_ORDERED,
     TASK_STATUS_WAITING,
     TASK_STATUS_EXPIRED,
     TASK_STATUS_PREPARING,
@@ -63,6 +67,7 @@ from cylc.flow.task_state import (
     TASK_STATUS_FAILED,
 )
 from cylc.flow.task_trigger import TaskTrigger
+from cylc.flow.timer import DeadlineQueue
 from cylc.flow.util import (
     serialise,
     deserialise
@@ -136,6 +141,37 @@ class TaskPool:
         self.active_tasks_changed = False
         self.tasks_removed = False
 
+        # Cycle points of the active tasks in ascending order.
+        self._points: List['PointBase'] = []
+
+        # Indexes of the active tasks, kept up to date by add_to_pool, remove
+        # and task state changes (TaskProxy.on_state_change):
+        # * All tasks by ID.
+        self._tasks_by_id: Dict[str, TaskProxy] = {}
+        # * Tasks by status {status: {id: itask}}.
+        self._tasks_by_status: Dict[str, Dict[str, TaskProxy]] = {
+            status: {} for status in TASK_STATUSES_ORDERED
+        }
+        # * Waiting tasks which are neither queued nor runahead limited
+        #   (i.e. those which may be waiting on xtriggers, ext-triggers or
+        #   retry timers).
+        self._waiting_unqueued: Dict[str, TaskProxy] = {}
+        # * Tasks whose state has changed since reset_updated_tasks.
+        self._updated_tasks: Dict[str, TaskProxy] = {}
+        # * Tasks with other changes to write to the DB since
+        #   pop_db_updates (see set_db_updated), and the (cycle, name) of
+        #   tasks removed since.
+        self._db_updated_tasks: Dict[str, TaskProxy] = {}
+        self._db_removed_tasks: Set[Tuple[str, str]] = set()
+        # * Tasks by the outputs their prerequisites depend on
+        #   {(point, name, output): {id: itask}}.
+        self._tasks_by_prereq: Dict[
+            Tuple[str, str, str], Dict[str, TaskProxy]
+        ] = {}
+
+        # Late times of tasks which have not been active yet, by task ID.
+        self.late_task_deadlines = DeadlineQueue()
+
         self.hold_point: Optional['PointBase'] = None
         self.abs_outputs_done: Set[Tuple[str, str, str]] = set()
 
@@ -175,11 +211,25 @@ class TaskPool:
             return True
         return False
 
+    def _schedule_late_check(self, itask: TaskProxy) -> None:
+        """Queue a task to be checked at its late time (if it has one)."""
+        if itask.is_late or not itask.state(*TASK_STATUSES_NEVER_ACTIVE):
+            self.late_task_deadlines.remove(itask.identity)
+            return
+        late_time = itask.get_late_time()
+        if late_time:
+            self.late_task_deadlines.add(itask.identity, late_time)
+        else:
+            self.late_task_deadlines.remove(itask.identity)
+
     def _swap_out(self, itask):
         """Swap old task for new, during reload."""
         if itask.identity in self.active_tasks.get(itask.point, set()):
+            self._index_remove(self.active_tasks[itask.point][itask.identity])
             self.active_tasks[itask.point][itask.identity] = itask
             self.active_tasks_changed = True
+            self._index_add(itask)
+            self._schedule_late_check(itask)
 
     def load_from_point(self):
         """Load the task pool for the workflow start point.
@@ -218,9 +268,13 @@ class TaskPool:
     def add_to_pool(self, itask) -> None:
         """Add a task to the pool."""
 
-        self.active_tasks.setdefault(itask.point, {})
+        if itask.point not in self.active_tasks:
+            insort(self._points, itask.point)
+            self.active_tasks[itask.point] = {}
         self.active_tasks[itask.point][itask.identity] = itask
         self.active_tasks_changed = True
+        self._index_add(itask)
+        self._schedule_late_check(itask)
         LOG.info(f"[{itask}] added to active task pool")
 
         self.create_data_store_elements(itask)
@@ -326,14 +380,14 @@ class TaskPool:
             )
         else:
             # Find the earliest point with incomplete tasks.
-            for point, itasks in sorted(self.get_tasks_by_point().items()):
+            for point in self._points:
                 # All n=0 tasks are incomplete by definition, but Cylc 7
                 # ignores failed ones (it does not ignore submit-failed!).
                 if (
                     cylc.flow.flags.cylc7_back_compat and
                     all(
                         itask.state(TASK_STATUS_FAILED)
-                        for itask in itasks
+                        for itask in self.active_tasks[point].values()
                     )
                 ):
                     continue
@@ -395,7 +449,7 @@ class TaskPool:
 
         if count_cycles:
             # (len(list) may be less than ilimit due to sequence end)
-            limit_point = sorted(sequence_points)[:ilimit + 1][-1]
+            limit_point = nsmallest(ilimit + 1, sequence_points)[-1]
         else:
             limit_point = max(sequence_points)
 
@@ -513,6 +567,7 @@ class TaskPool:
                     itask.set_summary_time('started', time_run)
                 if timeout is not None:
                     itask.timeout = timeout
+                    self.task_events_mgr.schedule_job_timers(itask)
             elif status == TASK_STATUS_PREPARING:
                 # put back to be readied again.
                 status = TASK_STATUS_WAITING
@@ -627,14 +682,15 @@ class TaskPool:
             return
         LOG.info("+ %s/%s %s" % (cycle, name, ctx_key))
         if ctx_key == "poll_timer":
-            itask = self._get_task_by_id(id_)
+            itask = self.get_task_by_id(id_)
             if itask is None:
                 LOG.warning("%(id)s: task not found, skip" % {"id": id_})
                 return
             itask.poll_timer = TaskActionTimer(
                 ctx, delays, num, delay, timeout)
+            self.task_events_mgr.schedule_job_timers(itask)
         elif ctx_key[0] == "try_timers":
-            itask = self._get_task_by_id(id_)
+            itask = self.get_task_by_id(id_)
             if itask is None:
                 LOG.warning("%(id)s: task not found, skip" % {"id": id_})
                 return
@@ -720,7 +776,7 @@ class TaskPool:
 
         It does not add a spawned task proxy to the pool.
         """
-        ntask = self._get_task_by_id(
+        ntask = self.get_task_by_id(
             Tokens(cycle=str(point), task=tdef.name).relative_id
         )
         is_in_pool = False
@@ -825,8 +881,12 @@ class TaskPool:
         else:
             self.tasks_removed = True
             self.active_tasks_changed = True
+            self._index_remove(itask)
+            self.late_task_deadlines.remove(itask.identity)
+            self.task_events_mgr.job_timer_deadlines.remove(itask.identity)
             if not self.active_tasks[itask.point]:
                 del self.active_tasks[itask.point]
+                del self._points[bisect_left(self._points, itask.point)]
             self.task_queue_mgr.remove_task(itask)
             if itask.tdef.max_future_prereq_offset is not None:
                 self.set_max_future_offset()
@@ -860,18 +920,117 @@ class TaskPool:
 
     def get_task(self, point: 'PointBase', name: str) -> Optional[TaskProxy]:
         """Retrieve a task from the pool."""
-        rel_id = f'{point}/{name}'
-        tasks = self.active_tasks.get(point)
-        if tasks and rel_id in tasks:
-            return tasks[rel_id]
-        return None
+        return self._tasks_by_id.get(f'{point}/{name}')
 
-    def _get_task_by_id(self, id_: str) -> Optional[TaskProxy]:
+    def get_task_by_id(self, id_: str) -> Optional[TaskProxy]:
         """Return pool task by ID if it exists, or None."""
-        for itask_ids in self.active_tasks.values():
-            with suppress(KeyError):
-                return itask_ids[id_]
-        return None
+        return self._tasks_by_id.get(id_)
+
+    def get_tasks_by_status(self, *statuses: str) -> List[TaskProxy]:
+        """Return a list of task proxies with any of the given statuses."""
+        return [
+            itask
+            for status in statuses
+            for itask in self._tasks_by_status[status].values()
+        ]
+
+    def get_waiting_unqueued_tasks(self) -> List[TaskProxy]:
+        """Return waiting tasks which are not queued or runahead limited.
+
+        These tasks may be waiting on xtriggers, ext-triggers or retry timers.
+        """
+        return list(self._waiting_unqueued.values())
+
+    def get_updated_tasks(self) -> List[TaskProxy]:
+        """Return tasks whose state has changed since the last reset."""
+        return list(self._updated_tasks.values())
+
+    def reset_updated_tasks(self) -> None:
+        """Reset the updated flag of all updated tasks."""
+        for itask in self._updated_tasks.values():
+            itask.state.is_updated = False
+        self._updated_tasks.clear()
+
+    def set_db_updated(self, itask: TaskProxy) -> None:
+        """Record a change to a task to write to the DB.
+
+        State changes are recorded anyway (see get_updated_tasks), this is
+        for other changes, e.g. to prerequisites, flow numbers or timers.
+        """
+        if itask.identity in self._tasks_by_id:
+            self._db_updated_tasks[itask.identity] = itask
+
+    def pop_db_updates(
+        self
+    ) -> Tuple[List[TaskProxy], Set[Tuple[str, str]]]:
+        """Return and reset the task changes to write to the DB.
+
+        Returns:
+            (tasks, removed): The tasks recorded by set_db_updated or added
+            to the pool, and the (cycle, name) of tasks removed from the
+            pool.
+
+        """
+        tasks = list(self._db_updated_tasks.values())
+        removed = self._db_removed_tasks
+        self._db_updated_tasks = {}
+        self._db_removed_tasks = set()
+        return tasks, removed
+
+    def _index_add(self, itask: TaskProxy) -> None:
+        """Add a task to the pool indexes and watch for state changes."""
+        self._tasks_by_id[itask.identity] = itask
+        self._db_updated_tasks[itask.identity] = itask
+        self._db_removed_tasks.discard((str(itask.point), itask.tdef.name))
+        self._tasks_by_status[itask.state.status][itask.identity] = itask
+        self._index_state(itask)
+        for prereq in (
+            *itask.state.prerequisites,
+            *itask.state.suicide_prerequisites,
+        ):
+            for key in prereq.satisfied:
+                self._tasks_by_prereq.setdefault(key, {})[
+                    itask.identity
+                ] = itask
+        itask.on_state_change = self._on_task_state_change
+
+    def _index_remove(self, itask: TaskProxy) -> None:
+        """Remove a task from the pool indexes."""
+        itask.on_state_change = None
+        self._tasks_by_id.pop(itask.identity, None)
+        self._tasks_by_status[itask.state.status].pop(itask.identity, None)
+        self._waiting_unqueued.pop(itask.identity, None)
+        self._updated_tasks.pop(itask.identity, None)
+        self._db_updated_tasks.pop(itask.identity, None)
+        self._db_removed_tasks.add((str(itask.point), itask.tdef.name))
+        for prereq in (
+            *itask.state.prerequisites,
+            *itask.state.suicide_prerequisites,
+        ):
+            for key in prereq.satisfied:
+                with suppress(KeyError):
+                    tasks = self._tasks_by_prereq[key]
+                    del tasks[itask.identity]
+                    if not tasks:
+                        del self._tasks_by_prereq[key]
+
+    def _on_task_state_change(self, itask: TaskProxy, prev_status: str):
+        """Update the pool indexes after a task state change."""
+        if itask.state.status != prev_status:
+            self._tasks_by_status[prev_status].pop(itask.identity, None)
+            self._tasks_by_status[itask.state.status][itask.identity] = itask
+        self._index_state(itask)
+
+    def _index_state(self, itask: TaskProxy) -> None:
+        """Update the state flag indexes for a task."""
+        if itask.state(
+            TASK_STATUS_WAITING, is_queued=False, is_runahead=False
+        ):
+            self._waiting_unqueued[itask.identity] = itask
+        else:
+            self._waiting_unqueued.pop(itask.identity, None)
+        if itask.state.is_updated:
+            self._updated_tasks[itask.identity] = itask
 
     def queue_task(self, itask: TaskProxy) -> None:
         """Queue a task that is ready to run."""
@@ -935,11 +1094,9 @@ class TaskPool:
 
     def get_min_point(self):
         """Return the minimum cycle point currently in the pool."""
-        cycles = list(self.active_tasks)
-        minc = None
-        if cycles:
-            minc = min(cycles)
-        return minc
+        if self._points:
+            return self._points[0]
+        return None
 
     def set_max_future_offset(self):
         """Calculate the latest required future trigger offset."""
@@ -1310,8 +1467,8 @@ class TaskPool:
         (unless manually forced to spawn with no flow number).
 
         If an absolute output is completed update the store of completed abs
-        outputs, and update the prerequisites of every instance of the child
-        in the pool. (The self.spawn method uses the store of completed abs
+        outputs, and update the prerequisites of every task in the pool that
+        depends on it. (The self.spawn method uses the store of completed abs
         outputs to satisfy any tasks with absolute prerequisites).
 
         Args:
@@ -1351,7 +1508,7 @@ class TaskPool:
                 task=c_name,
             ).relative_id
 
-            c_task = self._get_task_by_id(c_taskid)
+            c_task = self.get_task_by_id(c_taskid)
 
             if c_task is not None and c_task != itask:
                 # (Avoid self-suicide: A => !A)
@@ -1368,9 +1525,12 @@ class TaskPool:
             if c_task is not None:
                 # Have child task, update its prerequisites.
                 if is_abs:
-                    tasks, *_ = self.filter_task_proxies(
-                        [f'*/{c_name}'],
-                        warn=False,
+                    # Update every task in the pool which depends on this
+                    # absolute output.
+                    tasks = list(
+                        self._tasks_by_prereq.get(
+                            (str(itask.point), itask.tdef.name, output), {}
+                        ).values()
                     )
                     if c_task not in tasks:
                         tasks.append(c_task)
@@ -1498,7 +1658,7 @@ class TaskPool:
                     cycle=str(c_point),
                     task=c_name,
                 ).relative_id
-                c_task = self._get_task_by_id(c_taskid)
+                c_task = self.get_task_by_id(c_taskid)
                 if c_task is not None:
                     # already spawned
                     continue
@@ -1947,6 +2107,7 @@ class TaskPool:
         ):
             self.rh_release_and_queue(itask)
         self.data_store_mgr.delta_task_prerequisite(itask)
+        self.set_db_updated(itask)
         return True
 
     def _set_prereqs_tdef(
@@ -2149,7 +2310,7 @@ class TaskPool:
         while self.xtrigger_mgr.sequential_spawn_next:
             taskid = self.xtrigger_mgr.sequential_spawn_next.pop()
             self.xtrigger_mgr.sequential_has_spawned_next.add(taskid)
-            itask = self._get_task_by_id(taskid)
+            itask = self.get_task_by_id(taskid)
             # Will spawn out to RH limit or next parentless clock trigger
             # or non-parentless.
             self.spawn_to_rh_limit(
@@ -2188,6 +2349,7 @@ class TaskPool:
             except KeyError:
                 continue
             else:
+                self.set_db_updated(itask)
                 if (
                     not itask.state(
                         *TASK_STATUSES_ACTIVE, TASK_STATUS_PREPARING)
@@ -2405,6 +2567,7 @@ class TaskPool:
         merge_with_no_flow = not itask.flow_nums
 
         itask.merge_flows(flow_nums)
+        self.set_db_updated(itask)
         # Merged tasks get a new row in the db task_states table.
         self.db_add_new_flow_rows(itask)
 
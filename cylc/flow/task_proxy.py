@@ -167,6 +167,10 @@ class TaskProxy:
         .is_xtrigger_sequential:
             A flag used to determine whether this task needs to wait for
             xtrigger satisfaction to spawn.
+        .on_state_change:
+            Function called as on_state_change(itask, prev_status) after the
+            state of this task is changed by state_reset (used by the task
+            pool to keep its indexes up to date).
 
     Args:
         tdef: The definition object of this task.
@@ -211,6 +215,7 @@ class TaskProxy:
         'mode_settings',
         'transient',
         'is_xtrigger_sequential',
+        'on_state_change',
     ]
 
     def __init__(
@@ -274,6 +279,9 @@ class TaskProxy:
             self.platform = get_platform()
 
         self.transient = transient
+        self.on_state_change: Optional[
+            Callable[['TaskProxy', str], None]
+        ] = None
 
         self.job_vacated = False
         self.poll_timer: Optional['TaskActionTimer'] = None
@@ -538,6 +546,7 @@ class TaskProxy:
 
         """
         before = str(self)
+        prev_status = self.state.status
 
         if status == TASK_STATUS_EXPIRED:
             is_queued = False
@@ -548,6 +557,8 @@ class TaskProxy:
         ):
             if not silent and not self.transient:
                 LOG.info(f"[{before}] => {self.state}")
+            if self.on_state_change is not None:
+                self.on_state_change(self, prev_status)
             return True
 
         return False
@@ -16,7 +16,7 @@
 
 from cylc.flow.cycling.loader import (
     get_point, get_point_relative, get_interval)
-from cylc.flow.prerequisite import Prerequisite
+from cylc.flow.prerequisite import CompiledCondition, Prerequisite
 from cylc.flow.task_qualifiers import ALT_QUALIFIERS
 
 # Task trigger names (e.g. foo:fail => bar).
@@ -172,12 +172,42 @@ class Dependency:
 
     """
 
-    __slots__ = ['_exp', 'task_triggers', 'suicide']
+    __slots__ = ['_exp', 'task_triggers', 'suicide', '_condition']
 
     def __init__(self, exp, task_triggers, suicide):
         self._exp = exp
         self.task_triggers = tuple(task_triggers)  # More memory efficient.
         self.suicide = suicide
+        self._condition = None
+
+    def get_condition(self):
+        """Return the expression compiled for prerequisite evaluation.
+
+        Terms are numbered in the order of self.task_triggers. The compiled
+        condition is shared by all prerequisites generated from this
+        dependency.
+
+        Returns:
+            cylc.flow.prerequisite.CompiledCondition
+
+        """
+        if self._condition is None:
+            self._condition = CompiledCondition(
+                self._number_triggers(self._exp)
+            )
+        return self._condition
+
+    def _number_triggers(self, nested_expr):
+        """Replace TaskTriggers in a nested expression with term numbers."""
+        ret = []
+        for item in nested_expr:
+            if isinstance(item, TaskTrigger):
+                ret.append(self.task_triggers.index(item))
+            elif isinstance(item, list):
+                ret.append(self._number_triggers(item))
+            else:
+                ret.append(item)
+        return ret
 
     def get_prerequisite(self, point, tdef):
         """Generate a Prerequisite object from this dependency.
@@ -228,7 +258,13 @@ class Dependency:
                 cpre.add(task_trigger.task_name,
                          task_trigger.get_point(point),
                          task_trigger.output)
-        cpre.set_condition(self.get_expression(point))
+        expr = self.get_expression(point)
+        if len(cpre.satisfied) == len(self.task_triggers):
+            # (terms are numbered in the same order in both)
+            cpre.set_condition(expr, self.get_condition())
+        else:
+            # some triggers resolve to the same output at this point
+            cpre.set_condition(expr)
         return cpre
 
     def get_expression(self, point):
@@ -14,15 +14,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-"""Simple timer class."""
+"""Simple timer class and deadline queue."""
 
+from heapq import heapify, heappop, heappush
+from itertools import count
 from time import time as now
 from cylc.flow import LOG
 from cylc.flow.wallclock import (
     get_seconds_as_interval_string as get_interval_str
 )
 
-from typing import Callable, Optional
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 
 class Timer:
@@ -62,3 +64,88 @@ class Timer:
             return True
         else:
             return False
+
+
+class DeadlineQueue:
+    """A priority queue of deadlines (unix times) by key.
+
+    Used to find the timers which are due without checking every timer.
+    Each key has at most one deadline, adding a key again replaces its
+    deadline.
+
+    Examples:
+        >>> queue = DeadlineQueue()
+        >>> queue.add('a', 30)
+        >>> queue.add('b', 10)
+        >>> queue.add('c', 20)
+        >>> queue.add('b', 40)  # replaces the deadline of "b"
+        >>> queue.remove('c')
+        >>> queue.next_deadline()
+        30
+        >>> queue.pop_due(35)
+        ['a']
+        >>> queue.pop_due(35)
+        []
+        >>> len(queue), queue.next_deadline()
+        (1, 40)
+
+    """
+
+    # Rebuild the heap when it has this many more entries than keys
+    COMPACT_THRESHOLD = 1000
+
+    def __init__(self) -> None:
+        self._deadlines: Dict[Hashable, float] = {}
+        # [(deadline, n, key), ...], may include replaced/removed deadlines
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = count()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def add(self, key: Hashable, deadline: float) -> None:
+        """Set the deadline for a key."""
+        if self._deadlines.get(key) == deadline:
+            return
+        self._deadlines[key] = deadline
+        heappush(self._heap, (deadline, next(self._counter), key))
+        if len(self._heap) > len(self._deadlines) + self.COMPACT_THRESHOLD:
+            self._heap = [
+                entry
+                for entry in self._heap
+                if self._deadlines.get(entry[2]) == entry[0]
+            ]
+            heapify(self._heap)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove the deadline for a key, if it has one."""
+        self._deadlines.pop(key, None)
+
+    def next_deadline(self) -> Optional[float]:
+        """Return the earliest deadline, or None if there are none."""
+        heap = self._heap
+        while heap:
+            deadline, _, key = heap[0]
+            if self._deadlines.get(key) == deadline:
+                return deadline
+            heappop(heap)
+        return None
+
+    def pop_due(self, time: Optional[float] = None) -> List[Hashable]:
+        """Remove and return the keys with deadlines <= time (default now).
+
+        Keys are returned in deadline order (then in the order added).
+        """
+        if time is None:
+            time = now()
+        heap = self._heap
+        ret = []
+        while heap and heap[0][0] <= time:
+            deadline, _, key = heappop(heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                ret.append(key)
+        return ret
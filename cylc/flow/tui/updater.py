@@ -240,19 +240,16 @@ class Updater():
 
         try:
             # fetch the data from the workflow
-            workflow_update = await client.async_request(
-                'graphql',
+            workflow_update = await client.graphql_request(
+                QUERY,
                 {
-                    'request_string': QUERY,
-                    'variables': {
-                        # list of task states we want to see
-                        'taskStates': [
-                            state
-                            for state, is_on in self.filters['tasks'].items()
-                            if is_on
-                        ]
-                    }
-                }
+                    # list of task states we want to see
+                    'taskStates': [
+                        state
+                        for state, is_on in self.filters['tasks'].items()
+                        if is_on
+                    ]
+                },
             )
         except WorkflowStopped:
             # remove the client on any error, we'll reconnect next time
@@ -23,19 +23,23 @@ This module provides the logic to:
 * Manage existing run database files on restart.
 """
 
+from contextlib import closing, suppress
 import json
 import os
-from shutil import copy, rmtree
+from shutil import rmtree
+import sqlite3
 from sqlite3 import OperationalError
 from tempfile import mkstemp
 from typing import (
-    Any, AnyStr, Dict, List, Optional, Set, TYPE_CHECKING, Tuple, Union
+    Any, AnyStr, Dict, Iterable, List, Optional, Set, TYPE_CHECKING, Tuple,
+    Union
 )
 
 from packaging.version import parse as parse_version
 
 from cylc.flow import LOG
 from cylc.flow.broadcast_report import get_broadcast_change_iter
+from cylc.flow.cfgspec.glbl_cfg import glbl_cfg
 from cylc.flow.rundb import CylcWorkflowDAO
 from cylc.flow import __version__ as CYLC_VERSION
 from cylc.flow.wallclock import get_current_time_string, get_utc_mode
@@ -54,6 +58,10 @@ Version = Any
 # annotations in cylc.flow.task_state.TaskState
 DbArgDict = Dict[str, Any]
 DbUpdateTuple = Tuple[DbArgDict, DbArgDict]
+# (task_pool row, task_prerequisites rows, timeout, task_action_timers rows)
+TaskPoolRows = Tuple[
+    DbArgDict, Tuple[DbArgDict, ...], Optional[float], Tuple[DbArgDict, ...]
+]
 
 
 PERM_PRIVATE = 0o600  # -rw-------
@@ -102,6 +110,10 @@ class WorkflowDatabaseManager:
     TABLE_XTRIGGERS = CylcWorkflowDAO.TABLE_XTRIGGERS
     TABLE_ABS_OUTPUTS = CylcWorkflowDAO.TABLE_ABS_OUTPUTS
 
+    # Max number of rows to copy per main loop iteration when recovering the
+    # public DB (see recover_pub_from_pri)
+    RECOVERY_ROWS = 10000
+
     def __init__(self, pri_d=None, pub_d=None):
         self.pri_path = None
         if pri_d:
@@ -141,9 +153,26 @@ class WorkflowDatabaseManager:
             self.TABLE_XTRIGGERS: [],
             self.TABLE_ABS_OUTPUTS: []}
         self.db_updates_map: Dict[str, List[DbUpdateTuple]] = {}
+        # Task pool rows last written by put_task_pool, by (cycle, name)
+        self._task_pool_rows: Optional[
+            Dict[Tuple[str, str], TaskPoolRows]
+        ] = None
+        # New public DB being populated by recover_pub_from_pri, and the
+        # rowids of the rows left to copy to it {table: (last, end)}
+        self._recovery_dao: Optional[CylcWorkflowDAO] = None
+        self._recovery_rows: Dict[str, Tuple[int, int]] = {}
 
     def copy_pri_to_pub(self) -> None:
-        """Copy content of primary database file to public database file."""
+        """Copy content of primary database to public database file.
+
+        The content is copied from the open private database connection
+        using the SQLite backup API. This gives a consistent snapshot
+        (including any uncheckpointed WAL content) without closing the
+        private database or re-reading its file.
+
+        This is done on start up, before the main loop. A stuck public
+        database is rebuilt incrementally instead (see recover_pub_from_pri).
+        """
         self.pub_dao.close()
         # Use temporary file to ensure that we do not end up with a
         # partial file.
@@ -163,13 +192,20 @@ class WorkflowDatabaseManager:
             # Get default permissions level for public db:
             st_mode = os.stat(self.pub_dao.db_file_name).st_mode
 
-            copy(self.pri_dao.db_file_name, temp_pub_db_file_name)
+            with closing(sqlite3.connect(temp_pub_db_file_name)) as conn:
+                self.pri_dao.connect().backup(conn)
+                # The public DB may be read from other hosts, which WAL
+                # mode does not support
+                conn.execute("PRAGMA journal_mode=DELETE")
             os.rename(temp_pub_db_file_name, self.pub_dao.db_file_name)
             os.chmod(self.pub_dao.db_file_name, st_mode)
-        except OSError:
+        except (OSError, sqlite3.Error):
             if os.path.exists(temp_pub_db_file_name):
                 os.remove(temp_pub_db_file_name)
             raise
+        # Anything still queued for the public DB has already been written
+        # to the private DB, so is included in the copy.
+        self.pub_dao.clear_queued_items()
 
     def get_pri_dao(self) -> CylcWorkflowDAO:
         """Return the primary DAO.
@@ -210,13 +246,21 @@ class WorkflowDatabaseManager:
                 # ... however, in case there is a directory at the path for
                 # some bizarre reason:
                 rmtree(self.pri_path, ignore_errors=True)
-        self.pri_dao = self.get_pri_dao()
+        self.pri_dao = CylcWorkflowDAO(
+            self.pri_path,
+            create_tables=True,
+            persistent=(
+                glbl_cfg().get(['scheduler', 'database journal mode'])
+                == 'wal'
+            ),
+        )
         os.chmod(self.pri_path, PERM_PRIVATE)
         self.pub_dao = CylcWorkflowDAO(self.pub_path, is_public=True)
         self.copy_pri_to_pub()
 
     def on_workflow_shutdown(self):
         """Close data access objects."""
+        self._abort_recovery()
         if self.pri_dao:
             self.pri_dao.close()
             self.pri_dao = None
@@ -228,6 +272,10 @@ class WorkflowDatabaseManager:
         """Handle queued db operations for each task proxy."""
         if self.pri_dao is None or self.pub_dao is None:
             return
+        # (while the public DB is being recovered, write to the new file)
+        pub_dao = self._recovery_dao or self.pub_dao
+        if self._recovery_dao is not None:
+            self._copy_deleted_rows()
         # Record workflow parameters and tasks in pool
         # Record any broadcast settings to be dumped out
         if any(self.db_deletes_map.values()):
@@ -236,14 +284,14 @@ class WorkflowDatabaseManager:
                 while db_deletes:
                     where_args = db_deletes.pop(0)
                     self.pri_dao.add_delete_item(table_name, where_args)
-                    self.pub_dao.add_delete_item(table_name, where_args)
+                    pub_dao.add_delete_item(table_name, where_args)
         if any(self.db_inserts_map.values()):
             for table_name, db_inserts in sorted(
                     self.db_inserts_map.items()):
                 while db_inserts:
                     db_insert = db_inserts.pop(0)
                     self.pri_dao.add_insert_item(table_name, db_insert)
-                    self.pub_dao.add_insert_item(table_name, db_insert)
+                    pub_dao.add_insert_item(table_name, db_insert)
         if (hasattr(self, 'db_updates_map') and
                 any(self.db_updates_map.values())):
             for table_name, db_updates in sorted(
@@ -252,7 +300,7 @@ class WorkflowDatabaseManager:
                     set_args, where_args = db_updates.pop(0)
                     self.pri_dao.add_update_item(
                         table_name, set_args, where_args)
-                    self.pub_dao.add_update_item(
+                    pub_dao.add_update_item(
                         table_name, set_args, where_args)
 
         # Previously, we used a separate thread for database writes. This has
@@ -264,7 +312,7 @@ class WorkflowDatabaseManager:
         # there is no evidence that this is a bottleneck, so it is better to
         # keep the logic simple.
         self.pri_dao.execute_queued_items()
-        self.pub_dao.execute_queued_items()
+        pub_dao.execute_queued_items()
 
     def put_broadcast(self, modified_settings, is_cancel=False):
         """Put or clear broadcasts in runtime database."""
@@ -390,6 +438,11 @@ class WorkflowDatabaseManager:
         """Put statements to update the task_action_timers table."""
         if task_events_mgr.event_timers_updated:
             self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            # This also deletes the task pool action timers, make sure they
+            # are re-written by the next put_task_pool
+            written = self._task_pool_rows or {}
+            for key, rows in written.items():
+                written[key] = (*rows[:3], ())
             id_key: 'EventKey'
             for id_key, timer in task_events_mgr._event_timers.items():
                 key1 = (id_key.handler, id_key.event)
@@ -458,72 +511,57 @@ class WorkflowDatabaseManager:
             (set_args, where_args))
 
     def put_task_pool(self, pool: 'TaskPool') -> None:
-        """Delete task pool table content and recreate from current task pool.
+        """Update the task pool table content from the current task pool.
 
-        Also recreate:
+        Also update:
         - prerequisites table
         - timeout timers table
         - action timers table
-
-        And update:
         - task states table
+
+        Only the rows of tasks which have changed (see
+        TaskPool.get_updated_tasks and TaskPool.pop_db_updates) or left the
+        pool since the last call are rewritten. The first call rewrites the
+        tables in full.
         """
-        self.db_deletes_map[self.TABLE_TASK_POOL].append({})
-        # Comment this out to retain the trigger-time prereq status of past
-        # tasks (but then the prerequisite table will grow indefinitely):
-        self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
-        # This should already be done by self.put_task_event_timers above:
-        # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
-        self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
-        for itask in pool.get_tasks():
-            for prereq in itask.state.prerequisites:
-                for (p_cycle, p_name, p_output), satisfied_state in (
-                    prereq.satisfied.items()
-                ):
-                    self.put_insert_task_prerequisites(itask, {
-                        "flow_nums": serialise(itask.flow_nums),
-                        "prereq_name": p_name,
-                        "prereq_cycle": p_cycle,
-                        "prereq_output": p_output,
-                        "satisfied": satisfied_state
-                    })
-            self.db_inserts_map[self.TABLE_TASK_POOL].append({
-                "name": itask.tdef.name,
-                "cycle": str(itask.point),
-                "flow_nums": serialise(itask.flow_nums),
-                "status": itask.state.status,
-                "is_held": itask.state.is_held
-            })
-            if itask.timeout is not None:
-                self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "timeout": itask.timeout
-                })
-            if itask.poll_timer is not None:
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps("poll_timer"),
-                    "ctx": self._namedtuple2json(itask.poll_timer.ctx),
-                    "delays": json.dumps(itask.poll_timer.delays),
-                    "num": itask.poll_timer.num,
-                    "delay": itask.poll_timer.delay,
-                    "timeout": itask.poll_timer.timeout
-                })
-            for ctx_key_1, timer in itask.try_timers.items():
-                if timer is None:
-                    continue
-                self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].append({
-                    "name": itask.tdef.name,
-                    "cycle": str(itask.point),
-                    "ctx_key": json.dumps(("try_timers", ctx_key_1)),
-                    "ctx": self._namedtuple2json(timer.ctx),
-                    "delays": json.dumps(timer.delays),
-                    "num": timer.num,
-                    "delay": timer.delay,
-                    "timeout": timer.timeout
-                })
+        written = self._task_pool_rows
+        itasks, removed = pool.pop_db_updates()
+        if written is None:
+            written = self._task_pool_rows = {}
+            self.db_deletes_map[self.TABLE_TASK_POOL].append({})
+            # Comment this out to retain the trigger-time prereq status of
+            # past tasks (but then the prerequisite table will grow
+            # indefinitely):
+            self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append({})
+            # This should already be done by self.put_task_event_timers:
+            # self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].append({})
+            self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append({})
+            itasks = pool.get_tasks()
+        else:
+            itasks = list({
+                itask.identity: itask
+                for itask in (*pool.get_updated_tasks(), *itasks)
+            }.values())
+        for cycle, name in removed:
+            prev_rows = written.pop((cycle, name), None)
+            if prev_rows is None:
+                continue
+            where_args = {"cycle": cycle, "name": name}
+            self.db_deletes_map[self.TABLE_TASK_POOL].append(where_args)
+            self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append(
+                where_args
+            )
+            self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append(
+                where_args
+            )
+            self._delete_task_action_timers(where_args, prev_rows[3])
+        for itask in itasks:
+            key = (str(itask.point), itask.tdef.name)
+            rows = self._get_task_pool_rows(itask)
+            prev_rows = written.get(key)
+            if rows != prev_rows:
+                self._put_task_pool_rows(key, rows, prev_rows)
+                written[key] = rows
             if itask.state.time_updated:
                 set_args = {
                     "time_updated": itask.state.time_updated,
@@ -543,6 +581,125 @@ class WorkflowDatabaseManager:
                 )
                 itask.state.time_updated = None
 
+    def _get_task_pool_rows(self, itask) -> 'TaskPoolRows':
+        """Return the rows to write for a task in the pool.
+
+        Returns:
+            (task_pool row, task_prerequisites rows, timeout,
+            task_action_timers rows)
+
+        """
+        flow_nums = serialise(itask.flow_nums)
+        pool_row = {
+            "flow_nums": flow_nums,
+            "status": itask.state.status,
+            "is_held": itask.state.is_held
+        }
+        prereq_rows = tuple(
+            {
+                "flow_nums": flow_nums,
+                "prereq_name": p_name,
+                "prereq_cycle": p_cycle,
+                "prereq_output": p_output,
+                "satisfied": satisfied_state
+            }
+            for prereq in itask.state.prerequisites
+            for (p_cycle, p_name, p_output), satisfied_state in (
+                prereq.satisfied.items()
+            )
+        )
+        timer_rows = []
+        if itask.poll_timer is not None:
+            timer_rows.append({
+                "ctx_key": json.dumps("poll_timer"),
+                "ctx": self._namedtuple2json(itask.poll_timer.ctx),
+                "delays": json.dumps(itask.poll_timer.delays),
+                "num": itask.poll_timer.num,
+                "delay": itask.poll_timer.delay,
+                "timeout": itask.poll_timer.timeout
+            })
+        for ctx_key_1, timer in itask.try_timers.items():
+            if timer is None:
+                continue
+            timer_rows.append({
+                "ctx_key": json.dumps(("try_timers", ctx_key_1)),
+                "ctx": self._namedtuple2json(timer.ctx),
+                "delays": json.dumps(timer.delays),
+                "num": timer.num,
+                "delay": timer.delay,
+                "timeout": timer.timeout
+            })
+        return (pool_row, prereq_rows, itask.timeout, tuple(timer_rows))
+
+    def _put_task_pool_rows(
+        self,
+        key: Tuple[str, str],
+        rows: 'TaskPoolRows',
+        prev_rows: Optional['TaskPoolRows'],
+    ) -> None:
+        """Put statements to replace the changed task pool rows of a task.
+
+        Args:
+            key: The (cycle, name) of the task.
+            rows: The rows to write.
+            prev_rows: The rows last written for the task, if any.
+
+        """
+        cycle, name = key
+        task_args = {"cycle": cycle, "name": name}
+        pool_row, prereq_rows, timeout, timer_rows = rows
+        prev_pool_row, prev_prereq_rows, prev_timeout, prev_timer_rows = (
+            prev_rows or (None, (), None, ())
+        )
+        # (rows are deleted first in case flow_nums, which are part of the
+        # primary key, have changed)
+        if pool_row != prev_pool_row:
+            if prev_pool_row is not None:
+                self.db_deletes_map[self.TABLE_TASK_POOL].append(task_args)
+            self.db_inserts_map[self.TABLE_TASK_POOL].append(
+                {**task_args, **pool_row}
+            )
+        if prereq_rows != prev_prereq_rows:
+            if prev_prereq_rows:
+                self.db_deletes_map[self.TABLE_TASK_PREREQUISITES].append(
+                    task_args
+                )
+            self.db_inserts_map[self.TABLE_TASK_PREREQUISITES].extend(
+                {**task_args, **row} for row in prereq_rows
+            )
+        if timeout != prev_timeout:
+            if prev_timeout is not None:
+                self.db_deletes_map[self.TABLE_TASK_TIMEOUT_TIMERS].append(
+                    task_args
+                )
+            if timeout is not None:
+                self.db_inserts_map[self.TABLE_TASK_TIMEOUT_TIMERS].append(
+                    {**task_args, "timeout": timeout}
+                )
+        if timer_rows != prev_timer_rows:
+            # (only delete the timers written here, the table also holds the
+            # event timers written by put_task_event_timers)
+            self._delete_task_action_timers(task_args, prev_timer_rows)
+            self.db_inserts_map[self.TABLE_TASK_ACTION_TIMERS].extend(
+                {**task_args, **row} for row in timer_rows
+            )
+
+    def _delete_task_action_timers(
+        self,
+        task_args: Dict[str, str],
+        timer_rows: Iterable[Dict[str, Any]],
+    ) -> None:
+        """Put statements to delete task_action_timers rows of a task.
+
+        Args:
+            task_args: The cycle and name of the task.
+            timer_rows: The rows to delete.
+
+        """
+        self.db_deletes_map[self.TABLE_TASK_ACTION_TIMERS].extend(
+            {**task_args, "ctx_key": row["ctx_key"]} for row in timer_rows
+        )
+
     def put_tasks_to_hold(
         self, tasks: Set[Tuple[str, 'PointBase']]
     ) -> None:
@@ -657,14 +814,165 @@ class WorkflowDatabaseManager:
         self.db_updates_map.setdefault(table_name, [])
         self.db_updates_map[table_name].append((set_args, where_args))
 
-    def recover_pub_from_pri(self):
-        """Recover public database from private database."""
-        if self.pub_dao.n_tries >= self.pub_dao.MAX_TRIES:
-            self.copy_pri_to_pub()
-            LOG.warning(
-                f"{self.pub_dao.db_file_name}: recovered from "
-                f"{self.pri_dao.db_file_name}")
-            self.pub_dao.n_tries = 0
+    def recover_pub_from_pri(self) -> None:
+        """Recover public database from private database.
+
+        Statements which could not be written to the public database stay
+        queued and are retried, so a short outage only costs the changes
+        made in the meantime. After MAX_TRIES failures, the public database
+        is rebuilt in a new file, as whatever is locking the old file may
+        never release it.
+
+        The new file is populated incrementally so as not to hold up the
+        main loop: each call copies up to RECOVERY_ROWS rows from the
+        private database, while new statements are written to the new file
+        as they are made (see process_queued_ops). The new file replaces the
+        public database once all rows have been copied.
+        """
+        recovery_dao = self._recovery_dao
+        if recovery_dao is None:
+            if self.pub_dao.n_tries < self.pub_dao.MAX_TRIES:
+                return
+            recovery_dao = self._start_recovery()
+        try:
+            self._copy_rows(self.RECOVERY_ROWS)
+        except (OSError, sqlite3.Error):
+            self._abort_recovery()
+            raise
+        if not self._recovery_rows and not recovery_dao.n_tries:
+            try:
+                self._finish_recovery()
+            except OSError:
+                self._abort_recovery()
+                raise
+
+    def _start_recovery(self) -> CylcWorkflowDAO:
+        """Start rebuilding the public database in a new file.
+
+        The rows to copy are those in the private database now, rows
+        added later are written to the new file by process_queued_ops.
+
+        Returns:
+            The DAO of the new file.
+
+        """
+        self.pub_dao.close()
+        # Anything still queued for the public DB has already been written
+        # to the private DB, so will be copied.
+        self.pub_dao.clear_queued_items()
+        temp_pub_db_fd, temp_pub_db_file_name = mkstemp(
+            prefix=self.pub_dao.DB_FILE_BASE_NAME,
+            dir=os.path.dirname(self.pub_dao.db_file_name)
+        )
+        os.close(temp_pub_db_fd)
+        self._recovery_dao = CylcWorkflowDAO(
+            temp_pub_db_file_name, is_public=True, create_tables=True
+        )
+        self._recovery_dao.close()
+        conn = self.pri_dao.connect()
+        for table_name in self.pri_dao.tables:
+            stmt = f'''
+                SELECT MAX(rowid) FROM {table_name}
+            '''  # nosec (table name is code constant)
+            end = conn.execute(stmt).fetchone()[0]
+            if end is not None:
+                self._recovery_rows[table_name] = (0, end)
+        if not self.pri_dao.persistent:
+            self.pri_dao.close()
+        return self._recovery_dao
+
+    def _copy_rows(
+        self,
+        max_rows: int,
+        table_names: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Copy rows from the private database to the new public database.
+
+        Args:
+            max_rows: The max number of rows to copy, -1 for no limit.
+            table_names: The tables to copy rows from, default all.
+
+        """
+        if self._recovery_dao is None:
+            return
+        pri_conn = self.pri_dao.connect()
+        conn = self._recovery_dao.connect()
+        for table_name in list(table_names or self._recovery_rows):
+            if max_rows == 0:
+                break
+            last, end = self._recovery_rows[table_name]
+            table = self.pri_dao.tables[table_name]
+            columns = ', '.join(column.name for column in table.columns)
+            stmt = f'''
+                SELECT
+                    rowid, {columns}
+                FROM
+                    {table_name}
+                WHERE
+                    rowid > ? AND rowid <= ?
+                ORDER BY
+                    rowid
+                LIMIT ?
+            '''  # nosec (table and column names are code constants)
+            rows = pri_conn.execute(stmt, (last, end, max_rows)).fetchall()
+            conn.executemany(
+                table.get_insert_stmt(), [row[1:] for row in rows]
+            )
+            if max_rows < 0 or len(rows) < max_rows:
+                del self._recovery_rows[table_name]
+            else:
+                max_rows -= len(rows)
+                self._recovery_rows[table_name] = (rows[-1][0], end)
+        conn.commit()
+        self._recovery_dao.close()
+        if not self.pri_dao.persistent:
+            self.pri_dao.close()
+
+    def _copy_deleted_rows(self) -> None:
+        """Copy rows which are about to be deleted from tables without a
+        primary key.
+
+        Rows copied later could not be told apart from rows added later as
+        the rowids of deleted rows may be reused.
+        """
+        table_names = [
+            table_name
+            for table_name, deletes in self.db_deletes_map.items()
+            if deletes
+            and table_name in self._recovery_rows
+            and not any(
+                column.is_primary_key
+                for column in self.pri_dao.tables[table_name].columns
+            )
+        ]
+        if table_names:
+            self._copy_rows(-1, table_names)
+
+    def _finish_recovery(self) -> None:
+        """Replace the public database with the new file."""
+        if self._recovery_dao is None:
+            return
+        # Create the file if it didn't exist; see copy_pri_to_pub
+        open(self.pub_dao.db_file_name, "a").close()  # noqa: SIM115
+        # Get default permissions level for public db:
+        st_mode = os.stat(self.pub_dao.db_file_name).st_mode
+        os.rename(self._recovery_dao.db_file_name, self.pub_dao.db_file_name)
+        os.chmod(self.pub_dao.db_file_name, st_mode)
+        self._recovery_dao = None
+        LOG.warning(
+            f"{self.pub_dao.db_file_name}: recovered from "
+            f"{self.pri_dao.db_file_name}")
+        self.pub_dao.n_tries = 0
+
+    def _abort_recovery(self) -> None:
+        """Stop rebuilding the public database, remove the new file."""
+        if self._recovery_dao is None:
+            return
+        self._recovery_dao.close()
+        with suppress(OSError):
+            os.remove(self._recovery_dao.db_file_name)
+        self._recovery_dao = None
+        self._recovery_rows.clear()
 
     def restart_check(self) -> None:
         """Check & vacuum the runtime DB for a restart.
@@ -0,0 +1,235 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Run xtrigger functions in a pool of long-lived worker processes.
+
+This is an alternative to running each xtrigger function call in a new
+"cylc function-run" subprocess, see "[scheduler]xtrigger pool size".
+"""
+
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout, suppress
+import inspect
+from io import StringIO
+import json
+import multiprocessing
+import os
+from signal import SIGKILL
+import traceback
+from time import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    List,
+    Optional,
+    Tuple,
+)
+
+import psutil
+
+if TYPE_CHECKING:
+    from multiprocessing.queues import SimpleQueue
+
+    from cylc.flow.subprocctx import SubFuncContext
+
+
+# (future, ctx, callback, callback_args)
+XtriggerCall = Tuple[
+    'Future', 'SubFuncContext', Optional[Callable], Optional[List[Any]]
+]
+
+
+def _init_worker(pids: 'SimpleQueue') -> None:
+    """Record the PID of a new worker process."""
+    pids.put(os.getpid())
+
+
+def run_xtrigger(
+    func_name: str,
+    func_args: List[Any],
+    func_kwargs: dict,
+    src_dir: str,
+) -> Tuple[int, str, str]:
+    """Run an xtrigger function in a worker process.
+
+    Functions are imported once per worker and cached. Coroutine functions
+    are run to completion in an event loop in the worker.
+
+    Returns:
+        (ret_code, out, err) like "cylc function-run", i.e. out is the JSON
+        encoded function return value and err any output of the function.
+
+    """
+    # (imported here to avoid a circular import, this runs in the worker)
+    from cylc.flow.subprocpool import _await, get_xtrig_func
+    err = StringIO()
+    try:
+        with redirect_stdout(err), redirect_stderr(err):
+            func = get_xtrig_func(func_name, func_name, src_dir)
+            res = func(*func_args, **func_kwargs)
+            if inspect.isawaitable(res):
+                res = asyncio.run(_await(res))
+        return 0, json.dumps(res), err.getvalue()
+    except Exception:
+        err.write(traceback.format_exc())
+        return 1, '', err.getvalue()
+
+
+class XtriggerExecutor:
+    """Run xtrigger function calls in a pool of worker processes.
+
+    The workers are started on demand and live for as long as the executor,
+    so the cost of starting Python and importing the xtrigger modules is
+    paid once per worker rather than once per call.
+
+    Calls which run for longer than the timeout are abandoned and the
+    workers are restarted to kill them. Any other calls running at the time
+    fail and will be retried at their next interval.
+
+    Args:
+        size: Number of worker processes.
+        timeout: Maximum run time of a call (seconds).
+        wakeup: Function to call (from another thread) when a call returns.
+
+    """
+
+    def __init__(
+        self,
+        size: int,
+        timeout: float,
+        wakeup: Optional[Callable[[], None]] = None,
+    ):
+        self.size = size
+        self.timeout = timeout
+        self.wakeup = wakeup
+        self.runnings: List[XtriggerCall] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # PIDs of the worker processes, reported by the workers on start up
+        self._pids: Optional['SimpleQueue'] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # don't fork the scheduler with its threads and sockets
+            mp_context = multiprocessing.get_context('spawn')
+            self._pids = mp_context.SimpleQueue()
+            self._executor = ProcessPoolExecutor(
+                self.size,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(self._pids,),
+            )
+        return self._executor
+
+    def _kill_workers(self) -> None:
+        """Kill the worker processes, new ones are started on demand."""
+        if self._executor is None:
+            return
+        # ProcessPoolExecutor has no public method to kill its workers
+        pids = self._pids
+        while pids is not None and not pids.empty():
+            pid = pids.get()
+            with suppress(psutil.Error):
+                proc = psutil.Process(pid)
+                # (the PID may have been reused if the worker has exited)
+                if proc.ppid() == os.getpid():
+                    proc.kill()
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        self._pids = None
+
+    def put_command(
+        self,
+        ctx: 'SubFuncContext',
+        callback: Optional[Callable] = None,
+        callback_args: Optional[List[Any]] = None,
+    ) -> None:
+        """Submit an xtrigger function call.
+
+        Returned calls are collected by "process".
+        """
+        ctx.timeout = time() + self.timeout
+        future: Future
+        if ctx.workflow_run_dir is None:
+            # the function context has not been set up for this workflow
+            future = Future()
+            future.set_result(
+                (1, '', f'{ctx.func_name}: workflow run directory not set\n')
+            )
+        else:
+            future = self._get_executor().submit(
+                run_xtrigger,
+                ctx.func_name,
+                ctx.func_args,
+                ctx.func_kwargs,
+                ctx.workflow_run_dir,
+            )
+        if self.wakeup:
+            wakeup = self.wakeup
+            future.add_done_callback(lambda _: wakeup())
+        self.runnings.append((future, ctx, callback, callback_args))
+
+    def process(self) -> List[XtriggerCall]:
+        """Collect calls which have returned or timed out.
+
+        Sets the ret_code, out and err of their contexts.
+        """
+        done: List[XtriggerCall] = []
+        runnings: List[XtriggerCall] = []
+        timed_out = False
+        now = time()
+        for call in self.runnings:
+            future, ctx = call[:2]
+            if future.done():
+                try:
+                    ctx.ret_code, out, err = future.result()
+                except Exception as exc:
+                    # e.g. BrokenProcessPool if a worker died
+                    ctx.ret_code, out, err = 1, '', f'{exc!r}\n'
+            elif ctx.timeout is not None and now > ctx.timeout:
+                timed_out = True
+                ctx.ret_code = -SIGKILL
+                out, err = '', f'killed on timeout ({self.timeout})\n'
+            else:
+                runnings.append(call)
+                continue
+            ctx.out = out or None
+            ctx.err = err or None
+            done.append(call)
+        self.runnings = runnings
+        if timed_out:
+            self._kill_workers()
+        return done
+
+    def close(self) -> None:
+        """Let the workers exit once the running calls have returned."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def terminate(self, err: str, ret_code: int) -> List[XtriggerCall]:
+        """Kill the workers and return the calls which were running.
+
+        Args:
+            err: Error message for the contexts of the running calls.
+            ret_code: Return code for the contexts of the running calls.
+
+        """
+        self._kill_workers()
+        done, self.runnings = self.runnings, []
+        for _, ctx, _, _ in done:
+            ctx.err = err
+            ctx.ret_code = ret_code
+        return done
@@ -18,6 +18,7 @@
 import pytest
 
 from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.network.graphql import get_query_hash
 from cylc.flow.network.server import PB_METHOD_MAP
 
 
@@ -43,6 +44,23 @@ async def test_graphql(harness):
     assert schd.workflow in workflow['id']
 
 
+async def test_graphql_request(harness):
+    """It should send repeated queries by hash."""
+    schd, client = harness
+    request_string = 'query { workflows { id } }'
+    for _ in range(2):
+        ret = await client.graphql_request(request_string)
+        assert schd.workflow in ret['workflows'][0]['id']
+    assert schd.server.persisted_queries.get(
+        get_query_hash(request_string)
+    ) == request_string
+
+    # the scheduler forgets the query (e.g. after a restart)
+    schd.server.persisted_queries.clear()
+    ret = await client.graphql_request(request_string)
+    assert schd.workflow in ret['workflows'][0]['id']
+
+
 async def test_protobuf(harness):
     """It should return True if running."""
     schd, client = harness
@@ -18,11 +18,13 @@ import pytest
 from typing import TYPE_CHECKING
 
 from cylc.flow.data_store_mgr import (
+    EDGES,
     FAMILY_PROXIES,
     JOBS,
     TASKS,
     TASK_PROXIES,
-    WORKFLOW
+    WORKFLOW,
+    generate_checksum,
 )
 from cylc.flow.id import Tokens
 from cylc.flow.task_state import (
@@ -315,3 +317,37 @@ def test_delta_task_prerequisite(harness):
         p.satisfied
         for t in schd.data_store_mgr.updated[TASK_PROXIES].values()
         for p in t.prerequisites})
+
+
+async def test_incremental_checksum(flow, scheduler, start):
+    """The checksums should match those generated from the whole store."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {'R1': 'a => b => c'},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_)
+
+    def check_checksums():
+        data = schd.data_store_mgr.data[schd.data_store_mgr.workflow_id]
+        for key, checksum in schd.data_store_mgr.checksums.items():
+            s_att = 'id' if key == EDGES else 'stamp'
+            assert checksum.value == generate_checksum(
+                [getattr(e, s_att) for e in data[key].values()]
+            ), key
+
+    async with start(schd):
+        await schd.update_data_structure()
+        check_checksums()
+
+        # update elements
+        schd.pool.hold_tasks(['*'])
+        await schd.update_data_structure()
+        check_checksums()
+
+        # add and prune elements
+        itask = schd.pool.get_task_by_id('1/a')
+        schd.pool.spawn_on_output(itask, TASK_STATUS_SUCCEEDED)
+        schd.pool.remove(itask)
+        await schd.update_data_structure()
+        check_checksums()
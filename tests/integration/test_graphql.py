@@ -347,3 +347,36 @@ async def test_jobs(harness):
     assert ret == {
         'job': {'id': f'{j_id}'}
     }
+
+
+async def test_loop_timings(harness):
+    schd, client, w_tokens = harness
+
+    # time a main loop
+    schd.loop_timer.start()
+    schd.loop_timer.lap('command queue')
+    schd.loop_timer.lap('sleep')
+    schd.loop_timer.stop()
+
+    ret = await client.async_request(
+        'graphql',
+        {
+            'request_string': '''
+                query {
+                    workflows {
+                        loopTimings { name loops share histogram { count } }
+                    }
+                }
+            '''
+        }
+    )
+    timings = {
+        timing['name']: timing
+        for timing in ret['workflows'][0]['loopTimings']
+    }
+    assert {'loop', 'sleep', 'command queue', 'data store'} <= set(timings)
+    assert timings['loop']['loops'] > 0
+    assert timings['sleep']['share'] is None
+    assert sum(
+        bucket['count'] for bucket in timings['loop']['histogram']
+    ) == timings['loop']['loops']
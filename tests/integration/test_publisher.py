@@ -13,6 +13,9 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from contextlib import suppress
+
 from async_timeout import timeout
 import pytest
 
@@ -23,9 +26,14 @@ from cylc.flow.network.subscriber import (
 
 
 async def test_publisher(flow, scheduler, run, one_conf, port_range):
-    """It should publish deltas when the flow starts."""
+    """It should publish the workflow's deltas to a new subscriber.
+
+    Deltas are published as soon as they are created, so a subscriber only
+    receives those created after it has connected. Connecting takes a
+    moment, so the workflow is paused/resumed until a delta arrives.
+    """
     id_ = flow(one_conf)
-    schd = scheduler(id_, paused_start=False)
+    schd = scheduler(id_)
     async with run(schd):
         # create a subscriber
         subscriber = WorkflowSubscriber(
@@ -35,9 +43,23 @@ async def test_publisher(flow, scheduler, run, one_conf, port_range):
             topics=[b'workflow']
         )
 
-        async with timeout(2):
-            # wait for the first delta from the workflow
-            btopic, msg = await subscriber.socket.recv_multipart()
+        try:
+            async with timeout(2):
+                # wait for the first delta from the workflow
+                while True:
+                    if schd.is_paused:
+                        schd.resume_workflow()
+                    else:
+                        schd.pause_workflow()
+                    schd.wakeup()
+                    with suppress(asyncio.TimeoutError):
+                        async with timeout(0.1):
+                            btopic, msg = (
+                                await subscriber.socket.recv_multipart()
+                            )
+                            break
+        finally:
+            subscriber.stop(stop_loop=False)
 
         _, delta = process_delta_msg(btopic, msg, None)
         for key in ('added', 'updated'):
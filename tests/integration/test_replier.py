@@ -19,8 +19,6 @@ from cylc.flow.network import decode_
 from cylc.flow.network.client import WorkflowRuntimeClient
 import asyncio
 
-import pytest
-
 
 async def test_listener(one, start, ):
     """Test listener."""
@@ -30,14 +28,12 @@ async def test_listener(one, start, ):
         res = await client.socket.recv()
         assert 'error' in decode_(res.decode())
 
-        one.server.replier.queue.put('STOP')
+        # stop the replier
+        one.server.loop.call_soon_threadsafe(one.server.replier.stop, False)
         async with timeout(2):
-            # wait for the server to consume the STOP item from the queue
-            while True:
-                if one.server.replier.queue.empty():
-                    break
+            # wait for the server to close the socket
+            while not one.server.replier.socket.closed:
                 await asyncio.sleep(0.01)
-        # ensure the server is "closed"
-        one.server.replier.queue.put('foobar')
-        with pytest.raises(ValueError):
-            one.server.replier.listener()
+        # ensure the listener exits when the replier has been stopped
+        async with timeout(2):
+            await one.server.replier.listener()
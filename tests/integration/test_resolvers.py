@@ -14,13 +14,20 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
 from typing import AsyncGenerator, Callable
 from unittest.mock import Mock
 
 import pytest
 
-from cylc.flow.data_store_mgr import EDGES, TASK_PROXIES
+from cylc.flow.data_messages_pb2 import PbTaskProxy  # type: ignore
+from cylc.flow.data_store_mgr import (
+    DELTA_UPDATED,
+    EDGES,
+    TASK_PROXIES,
+    create_delta_store,
+)
 from cylc.flow.id import Tokens
 from cylc.flow import CYLC_LOG
 from cylc.flow.network.resolvers import Resolvers
@@ -245,3 +252,35 @@ async def test_command_logging(mock_flow, caplog, log_filter):
     await mock_flow.resolvers._mutation_mapper("put_messages", kwargs, meta)
     assert log_filter(
         caplog, contains='Command "put_messages" received from Dr Spock')
+
+
+async def test_subscribe_delta_coalesce(mock_flow):
+    """Deltas which arrive before the subscriber is ready should be merged."""
+    info = Mock(field_name='deltas', context={}, variable_values={})
+    subscription = mock_flow.resolvers.subscribe_delta(
+        'root', info, {'ignore_interval': 0.0, 'initial_burst': False}
+    )
+    result = asyncio.ensure_future(subscription.__anext__())
+    # wait for the subscription to register with the data store
+    delta_queues = mock_flow.schd.data_store_mgr.delta_queues[mock_flow.id]
+    while not delta_queues:
+        await asyncio.sleep(0)
+    (delta_queue,) = delta_queues.values()
+
+    node_id = mock_flow.node_ids[0]
+    for update in (
+        PbTaskProxy(id=node_id, state='running'),
+        PbTaskProxy(id=node_id, is_held=True),
+    ):
+        delta_store = create_delta_store(workflow_id=mock_flow.id)
+        delta_store[DELTA_UPDATED][TASK_PROXIES][node_id] = update
+        delta_queue.put((mock_flow.id, 'delta', delta_store))
+
+    delta_store = await result
+    assert delta_store[DELTA_UPDATED][TASK_PROXIES] == {
+        node_id: PbTaskProxy(id=node_id, state='running', is_held=True)
+    }
+
+    # end the subscription (as on cancellation, it yields a final None)
+    assert await subscription.athrow(asyncio.CancelledError()) is None
+    assert not delta_queues
@@ -373,3 +373,17 @@ async def test_restart_timeout(
         schd.pool.force_trigger_tasks(['1/one'], {1})
         await asyncio.sleep(0)  # yield control to the main loop
         assert log_filter(log, contains='restart timer stopped')
+
+
+async def test_loop_timings(one: Scheduler, run: Callable):
+    """The main loop records the time spent in each phase."""
+    schd = one
+    async with run(schd):
+        for _ in range(50):
+            if schd.loop_timer.phases['loop'].count:
+                break
+            await asyncio.sleep(0.1)
+        stats = {stat['name']: stat for stat in schd.loop_timer.get_stats()}
+    for name in ('loop', 'command queue', 'data store', 'sleep'):
+        assert stats[name]['loops'] > 0
+    assert stats['loop']['total'] > 0
@@ -14,14 +14,24 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 from async_timeout import timeout
 from getpass import getuser
+from time import perf_counter, time
 
 import pytest
 
+from cylc.flow.loop_timer import percentile
+from cylc.flow.network.client import WorkflowRuntimeClient
+from cylc.flow.network.graphql import (
+    PERSISTED_QUERY_NOT_FOUND,
+    get_query_hash,
+)
 from cylc.flow.network.server import PB_METHOD_MAP
 from cylc.flow.scheduler import Scheduler
+from cylc.flow.task_state import TASK_STATUS_SUBMITTED, TASK_STATUS_SUCCEEDED
 
 
 @pytest.fixture(scope='module')
@@ -55,6 +65,135 @@ def test_graphql(myflow):
     assert myflow.id == data['workflows'][0]['id']
 
 
+def test_graphql_persisted_queries(myflow):
+    """Test queries can be sent by hash once registered."""
+    request_string = f'''
+        query {{
+            workflows(ids: ["{myflow.id}"]) {{
+                id
+            }}
+        }}
+    '''
+    query_hash = get_query_hash(request_string)
+
+    # unknown hash
+    data = call_server_method(myflow.server.graphql, query_hash=query_hash)
+    assert data == [{'error': {'message': PERSISTED_QUERY_NOT_FOUND}}]
+
+    # the hash must match the request
+    data = call_server_method(
+        myflow.server.graphql, request_string, query_hash='abc'
+    )
+    assert 'ERROR' in data
+
+    # register the query
+    data = call_server_method(
+        myflow.server.graphql, request_string, query_hash=query_hash
+    )
+    assert data['workflows'][0]['id'] == myflow.id
+
+    # now the hash will do
+    data = call_server_method(myflow.server.graphql, query_hash=query_hash)
+    assert data['workflows'][0]['id'] == myflow.id
+
+
+def test_graphql_result_cache(myflow, monkeypatch):
+    """Test query results are reused until the data-store changes."""
+    monkeypatch.setattr(myflow.server, 'result_cache_ttl', 60)
+    request_string = f'''
+        query {{
+            workflows(ids: ["{myflow.id}"]) {{
+                id
+            }}
+        }}
+    '''
+    data = call_server_method(myflow.server.graphql, request_string)
+    assert call_server_method(
+        myflow.server.graphql, request_string
+    ) is data
+
+    # different variables
+    assert call_server_method(
+        myflow.server.graphql, request_string, {'x': 1}
+    ) is not data
+
+    # data-store changed
+    monkeypatch.setattr(
+        myflow.data_store_mgr,
+        'data_version',
+        myflow.data_store_mgr.data_version + 1,
+    )
+    data2 = call_server_method(myflow.server.graphql, request_string)
+    assert data2 == data
+    assert data2 is not data
+
+    # expired
+    later = time() + 120
+    monkeypatch.setattr('cylc.flow.network.server.time', lambda: later)
+    assert call_server_method(
+        myflow.server.graphql, request_string
+    ) is not data2
+
+    # mutations are never cached
+    assert not myflow.server._is_query(
+        'mutation { pause(workflows: []) { result } }'
+    )
+
+    # nor are fields which do not come from the data-store
+    request_string = f'''
+        query {{
+            workflows(ids: ["{myflow.id}"]) {{
+                ...timings
+            }}
+        }}
+        fragment timings on Workflow {{
+            loopTimings {{
+                name
+            }}
+        }}
+    '''
+    monkeypatch.setattr(
+        myflow.loop_timer, 'get_stats', lambda: [{'name': 'a'}]
+    )
+    data = call_server_method(myflow.server.graphql, request_string)
+    assert data['workflows'][0]['loopTimings'] == [{'name': 'a'}]
+    monkeypatch.setattr(
+        myflow.loop_timer, 'get_stats', lambda: [{'name': 'b'}]
+    )
+    data = call_server_method(myflow.server.graphql, request_string)
+    assert data['workflows'][0]['loopTimings'] == [{'name': 'b'}]
+
+
+def test_mutation_lock(myflow):
+    """Test requests which may change the scheduler are served one at a time.
+
+    Queries are served alongside them.
+    """
+    query = f'query {{ workflows(ids: ["{myflow.id}"]) {{ id }} }}'
+    mutation = 'mutation { pause(workflows: ["nope"]) { result } }'
+    with ThreadPoolExecutor(
+        max_workers=3,
+        # (like the replier's worker threads)
+        initializer=lambda: asyncio.set_event_loop(asyncio.new_event_loop()),
+    ) as executor:
+        with myflow.server.mutation_lock:
+            blocked = [
+                executor.submit(
+                    call_server_method, myflow.server.graphql, mutation
+                ),
+                executor.submit(
+                    call_server_method, myflow.server.put_messages, []
+                ),
+            ]
+            data = executor.submit(
+                call_server_method, myflow.server.graphql, query
+            ).result(timeout=10)
+            assert data['workflows'][0]['id'] == myflow.id
+            assert not any(future.done() for future in blocked)
+        for future in blocked:
+            assert future.result(timeout=10)
+
+
 def test_pb_data_elements(myflow):
     """Test Protobuf elements endpoint method."""
     element_type = 'workflow'
@@ -128,3 +267,100 @@ async def test_publish_before_shutdown(
         one.server.publish_queue.put([(b'fake', b'blah')])
         await one.server.stop('i said stop!')
         assert not one.server.publish_queue.qsize()
+
+
+async def test_put_messages(one: Scheduler, start, log_filter):
+    """Test the compact task message endpoint."""
+    async with start(one) as log:
+        itask = one.pool.get_tasks()[0]
+        itask.submit_num = 1
+        itask.state_reset(TASK_STATUS_SUBMITTED)
+        job_id = itask.tokens.duplicate(job='01').relative_id
+
+        msg = {
+            'command': 'put_messages',
+            'user': getuser(),
+            'args': {
+                'messages': [
+                    [job_id, '2000-01-01T00:00:00Z', 'INFO', 'started'],
+                    [job_id, '2000-01-01T00:00:01Z', 'INFO', 'succeeded'],
+                    ['1/nope/01', '2000-01-01T00:00:01Z', 'INFO', 'started'],
+                ],
+            },
+        }
+        assert one.server.receiver(msg) == {
+            'data': (True, 'Messages queued: 3')
+        }
+        assert one.message_queue.qsize() == 3
+        one.process_queued_task_messages()
+        assert itask.state(TASK_STATUS_SUCCEEDED)
+        assert log_filter(log, contains='Undeliverable task messages')
+
+        # malformed messages are rejected
+        msg['args']['messages'] = [[job_id, 'INFO', 'started']]
+        assert 'error' in one.server.receiver(msg)
+        assert not one.message_queue.qsize()
+
+
+async def test_concurrent_requests(one: Scheduler, start):
+    """Concurrent clients should all get answers."""
+    n_clients = 4
+    n_requests = 10
+
+    def _client_requests():
+        client = WorkflowRuntimeClient(one.workflow)
+        try:
+            return [client('api') for _ in range(n_requests)]
+        finally:
+            client.stop()
+
+    async with start(one):
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=n_clients) as executor:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, _client_requests)
+                for _ in range(n_clients)
+            ))
+
+    assert len(results) == n_clients
+    for result in results:
+        assert len(result) == n_requests
+        assert all(result)
+
+
+@pytest.mark.benchmark
+async def test_request_latency(one: Scheduler, start):
+    """Benchmark the latency of requests with concurrent clients.
+
+    Requests are served as they arrive, so the latency should be a few
+    milliseconds rather than the polling interval the server used to sleep
+    for between checking for requests (0.2s).
+
+    Opt in with "pytest -m benchmark".
+    """
+    n_clients = 4
+    n_requests = 50
+
+    def _client_requests():
+        client = WorkflowRuntimeClient(one.workflow)
+        latencies = []
+        try:
+            for _ in range(n_requests):
+                start = perf_counter()
+                assert client('api')
+                latencies.append(perf_counter() - start)
+        finally:
+            client.stop()
+        return latencies
+
+    async with start(one):
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=n_clients) as executor:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, _client_requests)
+                for _ in range(n_clients)
+            ))
+
+    latencies = sorted(latency for result in results for latency in result)
+    assert len(latencies) == n_clients * n_requests
+    assert percentile(latencies, 0.99) < 0.2
@@ -16,6 +16,7 @@
 """Tests involving the Cylc Subprocess Context Object
 """
 
+import asyncio
 from logging import DEBUG
 
 
@@ -52,6 +53,8 @@ async def test_log_xtrigger_stdout(
 
         # while not schd.xtrigger_mgr._get_xtrigs(task):
         while schd.proc_pool.is_not_done():
+            # (commands are run by the event loop)
+            await asyncio.sleep(0.1)
             schd.proc_pool.process()
 
         # Assert that both stderr and out from the print statement
@@ -14,7 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from cylc.flow.task_events_mgr import TaskJobLogsRetrieveContext
+from cylc.flow.task_action_timer import TaskActionTimer
+from cylc.flow.task_events_mgr import EventKey, TaskJobLogsRetrieveContext
 from cylc.flow.scheduler import Scheduler
 
 from typing import Any as Fixture
@@ -64,3 +65,106 @@ async def test__reset_job_timers(
         'polling intervals=PT25S,PT15S,PT10S,...'
         in caplog.records[0].msg
     )
+
+
+async def test_job_timer_deadlines(
+    one_conf: Fixture, flow: Fixture, scheduler: Fixture, start: Fixture,
+    monkeypatch: Fixture,
+):
+    """Only tasks with job timers that are due are checked."""
+    schd = scheduler(flow(one_conf))
+    async with start(schd):
+        itask = schd.pool.get_tasks()[0]
+        itask.state_reset('running')
+        itask.platform['execution polling intervals'] = [60]
+        schd.task_events_mgr._reset_job_timers(itask)
+        deadlines = schd.task_events_mgr.job_timer_deadlines
+        assert itask.identity in deadlines
+        assert deadlines.next_deadline() == itask.poll_timer.timeout
+        assert schd.get_next_deadline() <= itask.poll_timer.timeout
+
+        polled = []
+        monkeypatch.setattr(
+            schd.task_job_mgr, 'poll_task_jobs',
+            lambda _, itasks: polled.extend(itasks))
+
+        # not due yet
+        schd.task_job_mgr.check_task_jobs(schd.workflow, schd.pool)
+        assert polled == []
+
+        # due
+        monkeypatch.setattr(
+            'cylc.flow.task_job_mgr.time',
+            lambda: itask.poll_timer.timeout + 1)
+        schd.task_job_mgr.check_task_jobs(schd.workflow, schd.pool)
+        assert polled == [itask]
+        # the next poll is scheduled
+        assert deadlines.next_deadline() == itask.poll_timer.timeout
+
+        # timers are cleared when the task is no longer active
+        itask.state_reset('succeeded')
+        schd.task_events_mgr._reset_job_timers(itask)
+        assert itask.identity not in deadlines
+
+
+async def test_event_timer_deadlines(
+    one_conf: Fixture, flow: Fixture, scheduler: Fixture, start: Fixture,
+):
+    """Event timers are only processed when they are due."""
+    schd = scheduler(flow(one_conf))
+    async with start(schd):
+        itask = schd.pool.get_tasks()[0]
+        id_key = EventKey(
+            'handler', 'event', 'message', itask.tokens.duplicate(job=1))
+        timer = TaskActionTimer(
+            ctx=TaskJobLogsRetrieveContext('key', 'localhost', None),
+            delays=[3600],
+        )
+        schd.task_events_mgr.add_event_timer(id_key, timer)
+        deadlines = schd.task_events_mgr._event_timer_deadlines
+        # new timers are due now
+        assert deadlines.next_deadline() == 0
+
+        # the first delay is started
+        schd.task_events_mgr.process_events(schd)
+        assert timer.timeout is not None
+        assert not timer.is_waiting
+        assert deadlines.next_deadline() == timer.timeout
+
+        # (nothing to do until the delay is done)
+        schd.task_events_mgr.process_events(schd)
+        assert deadlines.next_deadline() == timer.timeout
+
+        schd.task_events_mgr.remove_event_timer(id_key)
+        assert deadlines.next_deadline() is None
+
+
+async def test_late_task_deadlines(
+    flow: Fixture, scheduler: Fixture, start: Fixture, log_filter: Fixture,
+):
+    """Tasks are checked for lateness at their late time."""
+    id_ = flow({
+        'scheduling': {
+            'initial cycle point': '2000',
+            'graph': {'P1Y': 'foo & bar'},
+        },
+        'runtime': {
+            'foo': {'events': {'late offset': 'PT1H'}},
+        },
+    })
+    schd = scheduler(id_, paused_start=True)
+    async with start(schd) as log:
+        deadlines = schd.pool.late_task_deadlines
+        # only foo has a late offset
+        foos = [
+            itask
+            for itask in schd.pool.get_tasks()
+            if itask.tdef.name == 'foo'
+        ]
+        assert len(deadlines) == len(foos)
+        assert deadlines.next_deadline() == foos[0].get_late_time()
+
+        schd.late_tasks_check()
+        assert all(itask.is_late for itask in foos)
+        assert log_filter(log, contains='late (late-time=2000-01-01T01')
+        assert len(deadlines) == 0
@@ -16,11 +16,17 @@
 
 from contextlib import suppress
 import logging
+from pathlib import Path
 from typing import Any as Fixture
 
 from cylc.flow import CYLC_LOG
+from cylc.flow.cycling.integer import IntegerPoint
 from cylc.flow.scheduler import Scheduler
-from cylc.flow.task_state import TASK_STATUS_RUNNING
+from cylc.flow.task_state import (
+    TASK_STATUS_RUNNING,
+    TASK_STATUS_SUBMITTED,
+    TASK_STATUS_SUCCEEDED,
+)
 
 
 
@@ -186,3 +192,142 @@ async def test__prep_submit_task_job_impl_handles_execution_time_limit(
             schd.task_job_mgr._prep_submit_task_job(
                 schd.workflow, task_a)
         assert not task_a.summary.get('execution_time_limit', '')
+
+
+async def test_batch_submit_window(
+    flow,
+    scheduler,
+    start,
+    mock_glbl_cfg,
+    monkeypatch,
+):
+    """It holds jobs to submit them in batches.
+
+    Jobs are held until "max batch submit size" jobs are ready or until the
+    "batch submit window" has elapsed.
+    """
+    mock_glbl_cfg(
+        'cylc.flow.platforms.glbl_cfg',
+        '''
+            [platforms]
+                [[localhost]]
+                    max batch submit size = 3
+                    batch submit window = PT1M
+        ''',
+    )
+    id_ = flow({
+        'scheduling': {
+            'graph': {
+                'R1': 'a & b & c & d'
+            }
+        },
+    })
+    schd = scheduler(id_)
+    async with start(schd):
+        commands = []
+        monkeypatch.setattr(
+            schd.proc_pool,
+            'put_command',
+            lambda ctx, **kwargs: commands.append(ctx),
+        )
+        itasks = sorted(schd.pool.get_tasks(), key=lambda t: t.identity)
+        for itask in itasks:
+            # (as if released from the queue)
+            itask.waiting_on_job_prep = True
+
+        def submit(itasks):
+            return schd.task_job_mgr.submit_task_jobs(
+                schd.workflow, itasks, None, None)
+
+        # the jobs are held until the batch is full...
+        assert submit(itasks[:1]) == []
+        assert submit(itasks[:2]) == []
+        assert not commands
+        assert all(itask.waiting_on_job_prep for itask in itasks[:2])
+
+        # ... then submitted together
+        assert submit(itasks[:3]) == itasks[:3]
+        assert len(commands) == 1
+        assert commands[0].cmd_kwargs['job_log_dirs'] == [
+            '1/a/01', '1/b/01', '1/c/01'
+        ]
+
+        # ... or until the window has elapsed
+        assert submit(itasks[3:]) == []
+        schd.task_job_mgr.batch_submit_ready_times['localhost'] -= 60
+        assert submit(itasks[3:]) == itasks[3:]
+        assert len(commands) == 2
+
+        stats = schd.task_job_mgr.batch_submit_stats['localhost']
+        assert stats.batches == 2
+        assert stats.jobs == 4
+        assert stats.max_size == 3
+        assert stats.max_wait >= 60
+
+
+async def test_watch_job_status_files(
+    flow,
+    scheduler,
+    start,
+    mock_glbl_cfg,
+    log_filter,
+):
+    """It picks up changes to job status files without polling."""
+    mock_glbl_cfg(
+        'cylc.flow.task_job_mgr.glbl_cfg',
+        '''
+            [scheduler]
+                watch job status files = True
+        ''',
+    )
+    id_ = flow({
+        'scheduling': {
+            'graph': {
+                'R1': 'a => b'
+            }
+        },
+    })
+    schd = scheduler(id_)
+    async with start(schd) as log:
+        task_job_mgr = schd.task_job_mgr
+        watcher = task_job_mgr.job_status_watcher
+        assert watcher is not None
+        itask = schd.pool.get_task(IntegerPoint('1'), 'a')
+        itask.platform = {
+            **itask.platform, 'communication method': 'poll'}
+        itask.submit_num = 1
+        itask.state_reset(TASK_STATUS_SUBMITTED)
+        job_dir = Path(watcher.job_log_root, '1', 'a', '01')
+        job_dir.mkdir(parents=True)
+
+        def check():
+            task_job_mgr.check_job_status_files(schd.workflow, schd.pool)
+
+        # the job is watched once submitted
+        check()
+        assert set(watcher.watches) == {'1/a/01'}
+
+        # the job starts
+        (job_dir / 'job.status').write_text(
+            'CYLC_JOB_RUNNER_NAME=background\n'
+            'CYLC_JOB_ID=1\n'
+            'CYLC_JOB_INIT_TIME=2025-01-01T00:00:00Z\n'
+        )
+        check()
+        assert itask.state(TASK_STATUS_RUNNING)
+
+        # the job sends a message and succeeds
+        with open(job_dir / 'job.status', 'a') as handle:
+            handle.write(
+                'CYLC_MESSAGE=2025-01-01T00:00:01Z|WARNING|hello\n'
+                'CYLC_JOB_EXIT=SUCCEEDED\n'
+                'CYLC_JOB_EXIT_TIME=2025-01-01T00:00:02Z\n'
+            )
+        check()
+        assert itask.state(TASK_STATUS_SUCCEEDED)
+        assert len(log_filter(log, contains='(polled)hello')) == 1
+
+        # finished jobs are no longer watched
+        check()
+        assert watcher.watches == {}
+        assert task_job_mgr.job_status_seen == {}
@@ -1874,3 +1874,120 @@ async def test_runahead_c7_compat_task_state(
     mod_blah.pool.compute_runahead()
     after = mod_blah.pool.runahead_limit_point
     assert bool(before != after) == expected
+
+
+async def test_pool_indexes(example_flow: 'Scheduler'):
+    """The pool indexes are kept consistent with the pool.
+
+    See the NOTE before EXAMPLE_FLOW_CFG above for the tasks in the pool.
+    """
+    pool = example_flow.pool
+
+    def by_status(*statuses):
+        return sorted(
+            itask.identity for itask in pool.get_tasks_by_status(*statuses)
+        )
+
+    # all tasks are indexed by ID
+    for itask in pool.get_tasks():
+        assert pool.get_task_by_id(itask.identity) is itask
+    assert pool.get_task_by_id('8/foo') is None
+    assert by_status(TASK_STATUS_WAITING) == pool_get_task_ids(pool)
+
+    # state changes move tasks between indexes
+    foo = pool.get_task(IntegerPoint('1'), 'foo')
+    pool.reset_updated_tasks()
+    assert pool.get_updated_tasks() == []
+    foo.state_reset(TASK_STATUS_RUNNING)
+    assert by_status(TASK_STATUS_RUNNING) == ['1/foo']
+    assert '1/foo' not in by_status(TASK_STATUS_WAITING)
+    assert pool.get_updated_tasks() == [foo]
+    pool.reset_updated_tasks()
+    assert not foo.state.is_updated
+    assert pool.get_updated_tasks() == []
+
+    # only released, unqueued, waiting tasks are waiting unqueued
+    assert foo not in pool.get_waiting_unqueued_tasks()
+    bar = pool.get_task(IntegerPoint('1'), 'bar')
+    bar.state_reset(is_queued=False, is_runahead=False)
+    assert bar in pool.get_waiting_unqueued_tasks()
+    bar.state_reset(is_queued=True)
+    assert bar not in pool.get_waiting_unqueued_tasks()
+
+    # removed tasks are removed from all indexes
+    pool.remove(foo)
+    assert pool.get_task_by_id('1/foo') is None
+    assert by_status(TASK_STATUS_RUNNING) == []
+    assert foo.on_state_change is None
+
+
+async def test_abs_output_satisfies_waiting_tasks(flow, scheduler, start):
+    """Completing an absolute output updates every task that depends on it.
+
+    The tasks are found via the pool's prerequisite index.
+    """
+    id_ = flow(
+        {
+            'scheduler': {
+                'allow implicit tasks': 'True',
+            },
+            'scheduling': {
+                'cycling mode': 'integer',
+                'initial cycle point': 1,
+                'runahead limit': 'P2',
+                'graph': {
+                    'R1': 'foo',
+                    'P1': 'foo[^] & x => bar',
+                }
+            }
+        }
+    )
+    schd = scheduler(id_)
+    async with start(schd):
+        # spawn bar out to the runahead limit
+        for itask in schd.pool.get_tasks():
+            if itask.tdef.name == 'x':
+                schd.pool.spawn_on_output(itask, 'succeeded')
+        bars = sorted(
+            itask.identity
+            for itask in schd.pool.get_tasks()
+            if itask.tdef.name == 'bar'
+        )
+        assert bars[:3] == ['1/bar', '2/bar', '3/bar']
+        assert sorted(
+            schd.pool._tasks_by_prereq[('1', 'foo', 'succeeded')]
+        ) == bars
+        for id_ in bars:
+            assert not schd.pool.get_task_by_id(
+                id_
+            ).state.prerequisites_all_satisfied()
+
+        foo = schd.pool.get_task(IntegerPoint('1'), 'foo')
+        schd.pool.spawn_on_output(foo, 'succeeded')
+        for id_ in bars:
+            itask = schd.pool.get_task_by_id(id_)
+            assert itask.state.prerequisites_all_satisfied()
+        assert schd.pool.get_task(IntegerPoint('1'), 'bar').state.is_queued
+
+
+async def test_pool_points(example_flow: 'Scheduler'):
+    """The ordered list of cycle points is kept consistent with the pool."""
+    pool = example_flow.pool
+    assert len(pool._points) > 1
+    assert pool._points == sorted(pool.active_tasks)
+    assert pool.get_min_point() == pool._points[0]
+
+    # removing all tasks at a point removes the point
+    first_point = pool._points[0]
+    for itask in list(pool.active_tasks[first_point].values()):
+        pool.remove(itask)
+    assert first_point not in pool._points
+    assert pool._points == sorted(pool.active_tasks)
+    assert pool.get_min_point() == pool._points[0]
+
+    # adding a task at a new point adds the point (in order)
+    itask = pool.spawn_task('foo', first_point, {1})
+    assert itask is not None
+    pool.add_to_pool(itask)
+    assert pool._points[0] == first_point
+    assert pool._points == sorted(pool.active_tasks)
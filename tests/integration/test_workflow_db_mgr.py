@@ -15,11 +15,14 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
+from contextlib import closing
 import pytest
 import sqlite3
 from typing import TYPE_CHECKING
 
+from cylc.flow.cycling.integer import IntegerPoint
 from cylc.flow.cycling.iso8601 import ISO8601Point
+from cylc.flow.task_action_timer import TaskActionTimer
 
 if TYPE_CHECKING:
     from cylc.flow.scheduler import Scheduler
@@ -179,3 +182,294 @@ async def test_record_only_non_clock_triggers(
     assert db_select(schd, False, 'xtriggers', 'signature') == [
         ('xrandom(100)',),
         ('xrandom(100, _=Not a real wall clock trigger)',)]
+
+
+async def test_recover_pub_from_pri(one_conf, flow, scheduler, start):
+    """The public DB should be recovered from the private DB if it gets stuck.
+    """
+    schd: 'Scheduler' = scheduler(flow(one_conf), paused_start=True)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        stmt = 'SELECT value FROM workflow_params WHERE key == "is_paused"'
+
+        # lock the public DB so that writes to it fail
+        locker = sqlite3.connect(db_mgr.pub_path)
+        locker.execute('BEGIN EXCLUSIVE')
+        db_mgr.put_workflow_paused(False)
+        db_mgr.process_queued_ops()
+        assert db_mgr.pub_dao.n_tries == 1
+        assert db_mgr.pub_dao.tables['workflow_params'].insert_queue
+
+        # recover once the max number of tries is reached
+        db_mgr.pub_dao.n_tries = db_mgr.pub_dao.MAX_TRIES
+        db_mgr.recover_pub_from_pri()
+        locker.close()
+        assert db_mgr.pub_dao.n_tries == 0
+        assert not db_mgr.pub_dao.tables['workflow_params'].insert_queue
+        with closing(sqlite3.connect(db_mgr.pub_path)) as conn:
+            assert list(conn.execute(stmt)) == [('0',)]
+            assert list(conn.execute('PRAGMA journal_mode')) == [
+                ('delete',)
+            ]
+
+        # writes to the public DB resume
+        db_mgr.put_workflow_paused(True)
+        db_mgr.process_queued_ops()
+        assert db_mgr.pub_dao.n_tries == 0
+        with closing(sqlite3.connect(db_mgr.pub_path)) as conn:
+            assert list(conn.execute(stmt)) == [('1',)]
+
+
+async def test_recover_pub_from_pri_incremental(
+    one_conf, flow, scheduler, start, monkeypatch
+):
+    """The public DB should be recovered a chunk at a time.
+
+    Each call (i.e. main loop iteration) should copy at most RECOVERY_ROWS
+    rows, changes made in the meantime should not be lost or duplicated.
+    """
+    monkeypatch.setattr(
+        'cylc.flow.workflow_db_mgr.WorkflowDatabaseManager.RECOVERY_ROWS', 10
+    )
+    schd: 'Scheduler' = scheduler(flow(one_conf), paused_start=True)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+
+        def put_events(start, stop):
+            db_mgr.db_inserts_map.setdefault('task_events', []).extend(
+                {'name': 'one', 'cycle': '1', 'event': f'event {num}'}
+                for num in range(start, stop)
+            )
+
+        def dump(path):
+            with closing(sqlite3.connect(path)) as conn:
+                return {
+                    table: sorted(
+                        conn.execute(f'SELECT * FROM {table}'),  # nosec
+                        key=repr,
+                    )
+                    for table in db_mgr.pri_dao.tables
+                }
+
+        put_events(0, 40)
+        db_mgr.put_tasks_to_hold({('one', IntegerPoint('1'))})
+        db_mgr.process_queued_ops()
+
+        # lock the public DB so that writes to it fail
+        locker = sqlite3.connect(db_mgr.pub_path)
+        locker.execute('BEGIN EXCLUSIVE')
+        db_mgr.put_workflow_paused(False)
+        db_mgr.process_queued_ops()
+        db_mgr.pub_dao.n_tries = db_mgr.pub_dao.MAX_TRIES
+        n_rows = sum(len(rows) for rows in dump(db_mgr.pri_path).values())
+        assert n_rows > 50
+
+        # the rows are copied across several main loop iterations
+        copy_rows = db_mgr._copy_rows
+        n_copied = []
+        monkeypatch.setattr(
+            db_mgr,
+            '_copy_rows',
+            lambda max_rows, *args: (
+                n_copied.append(max_rows), copy_rows(max_rows, *args)
+            ),
+        )
+        n_calls = 0
+        while db_mgr.pub_dao.n_tries:
+            # make changes while the public DB is being recovered
+            n_calls += 1
+            put_events(100 + n_calls, 101 + n_calls)
+            db_mgr.put_workflow_paused(n_calls % 2 == 0)
+            if n_calls < 3:
+                # (replaces the rows before they have been copied)
+                db_mgr.put_tasks_to_hold(
+                    {('two', IntegerPoint(str(n_calls)))}
+                )
+            db_mgr.process_queued_ops()
+            db_mgr.recover_pub_from_pri()
+        locker.close()
+        assert n_calls >= n_rows // 10
+        assert all(max_rows in {10, -1} for max_rows in n_copied)
+
+        # the public DB has the same content as the private DB
+        assert dump(db_mgr.pub_path) == dump(db_mgr.pri_path)
+        assert not list(db_mgr.pub_dao.tables['task_events'].insert_queue)
+
+
+async def test_put_task_pool_incremental(
+    flow, scheduler, start, db_select, monkeypatch
+):
+    """Only the task pool rows of changed tasks should be rewritten."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {'R1': 'a & b => c'},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_, paused_start=True)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        pool_stmt = 'SELECT cycle, name, status, is_held FROM task_pool'
+
+        def queued():
+            return {
+                table: len(db_mgr.db_deletes_map[table])
+                + len(db_mgr.db_inserts_map[table])
+                for table in (
+                    db_mgr.TABLE_TASK_POOL,
+                    db_mgr.TABLE_TASK_PREREQUISITES,
+                )
+            }
+
+        db_mgr.put_task_pool(schd.pool)
+        db_mgr.process_queued_ops()
+        assert sorted(db_mgr.pri_dao.connect().execute(pool_stmt)) == [
+            ('1', 'a', 'waiting', 0),
+            ('1', 'b', 'waiting', 0),
+        ]
+
+        # nothing has changed => nothing to write
+        schd.pool.reset_updated_tasks()
+        get_rows = db_mgr._get_task_pool_rows
+        got_rows = []
+        monkeypatch.setattr(
+            db_mgr,
+            '_get_task_pool_rows',
+            lambda itask: (got_rows.append(itask.identity), get_rows(itask))[1]
+        )
+        db_mgr.put_task_pool(schd.pool)
+        assert queued() == {'task_pool': 0, 'task_prerequisites': 0}
+        assert got_rows == []
+
+        # one task has changed => rewrite its rows only
+        schd.pool.hold_tasks(['1/a'])
+        db_mgr.put_task_pool(schd.pool)
+        assert queued() == {'task_pool': 2, 'task_prerequisites': 0}
+        assert got_rows == ['1/a']
+        db_mgr.process_queued_ops()
+        assert sorted(db_mgr.pri_dao.connect().execute(pool_stmt)) == [
+            ('1', 'a', 'waiting', 1),
+            ('1', 'b', 'waiting', 0),
+        ]
+
+        # a task has left the pool => delete its rows
+        schd.pool.remove(schd.pool.get_task_by_id('1/b'))
+        db_mgr.put_task_pool(schd.pool)
+        db_mgr.process_queued_ops()
+        assert sorted(db_mgr.pri_dao.connect().execute(pool_stmt)) == [
+            ('1', 'a', 'waiting', 1),
+        ]
+        assert db_select(schd, False, 'task_prerequisites') == []
+
+
+async def test_put_task_pool_prerequisites(
+    flow, scheduler, start, db_select
+):
+    """Prerequisites satisfied without a state change should be written."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {'R1': 'a & b & z => c'},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_, paused_start=True)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        prereq_stmt = (
+            'SELECT prereq_name, satisfied FROM task_prerequisites'
+            ' WHERE name == "c"'
+        )
+        for name in ('a', 'b'):
+            schd.pool.spawn_on_output(
+                schd.pool.get_task_by_id(f'1/{name}'), 'succeeded'
+            )
+            db_mgr.put_task_pool(schd.pool)
+            db_mgr.process_queued_ops()
+            schd.pool.reset_updated_tasks()
+        assert schd.pool.get_task_by_id('1/c').state('waiting')
+        assert sorted(db_mgr.pri_dao.connect().execute(prereq_stmt)) == [
+            ('a', 'satisfied naturally'),
+            ('b', 'satisfied naturally'),
+            ('z', '0'),
+        ]
+
+
+async def test_put_task_pool_action_timers(
+    flow, scheduler, start, db_select
+):
+    """Action timers of tasks should be deleted with the tasks/timers."""
+    id_ = flow({
+        'scheduling': {
+            'graph': {'R1': 'a & b'},
+        },
+    })
+    schd: 'Scheduler' = scheduler(id_, paused_start=True)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        a = schd.pool.get_task_by_id('1/a')
+        b = schd.pool.get_task_by_id('1/b')
+        for itask in (a, b):
+            itask.try_timers['execution-retry'] = TaskActionTimer(
+                delays=[1.0]
+            )
+            itask.poll_timer = TaskActionTimer(delays=[2.0])
+            schd.pool.set_db_updated(itask)
+        db_mgr.put_task_pool(schd.pool)
+        db_mgr.process_queued_ops()
+        assert sorted(
+            db_select(schd, False, 'task_action_timers', 'name', 'ctx_key')
+        ) == [
+            ('a', '"poll_timer"'),
+            ('a', '["try_timers", "execution-retry"]'),
+            ('b', '"poll_timer"'),
+            ('b', '["try_timers", "execution-retry"]'),
+        ]
+
+        # a timer has been removed => delete its row
+        schd.pool.reset_updated_tasks()
+        a.poll_timer = None
+        schd.pool.set_db_updated(a)
+        db_mgr.put_task_pool(schd.pool)
+        db_mgr.process_queued_ops()
+        assert sorted(
+            db_select(schd, False, 'task_action_timers', 'name', 'ctx_key')
+        ) == [
+            ('a', '["try_timers", "execution-retry"]'),
+            ('b', '"poll_timer"'),
+            ('b', '["try_timers", "execution-retry"]'),
+        ]
+
+        # a task has left the pool => delete its rows
+        schd.pool.remove(b)
+        db_mgr.put_task_pool(schd.pool)
+        db_mgr.process_queued_ops()
+        assert db_select(
+            schd, False, 'task_action_timers', 'name', 'ctx_key'
+        ) == [
+            ('a', '["try_timers", "execution-retry"]'),
+        ]
+
+
+@pytest.mark.parametrize('journal_mode', ['delete', 'wal'])
+async def test_database_journal_mode(
+    one_conf, flow, scheduler, start, mock_glbl_cfg, journal_mode
+):
+    """The private DB journal mode should follow the global config."""
+    mock_glbl_cfg(
+        'cylc.flow.workflow_db_mgr.glbl_cfg',
+        f'''
+            [scheduler]
+                database journal mode = {journal_mode}
+        ''',
+    )
+    schd: 'Scheduler' = scheduler(flow(one_conf), paused_start=True)
+    async with start(schd):
+        db_mgr = schd.workflow_db_mgr
+        db_mgr.put_workflow_paused(True)
+        db_mgr.process_queued_ops()
+        assert db_mgr.pri_dao.persistent == (journal_mode == 'wal')
+        assert list(
+            db_mgr.pri_dao.connect().execute('PRAGMA journal_mode')
+        ) == [(journal_mode,)]
+        with closing(sqlite3.connect(db_mgr.pub_path)) as conn:
+            assert list(conn.execute('PRAGMA journal_mode')) == [
+                ('delete',)
+            ]
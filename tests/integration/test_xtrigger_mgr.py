@@ -188,3 +188,48 @@ async def test_xtriggers_restart(flow, start, scheduler, db_select):
 
     # check the DB to ensure no additional entries have been created
     assert db_select(schd, True, 'xtriggers') == db_xtriggers
+
+
+async def test_xtrigger_pool(flow, start, scheduler, mock_glbl_cfg):
+    """It should run xtriggers in the xtrigger pool if configured."""
+    mock_glbl_cfg(
+        'cylc.flow.subprocpool.glbl_cfg',
+        '''
+            [scheduler]
+                xtrigger pool size = 1
+        '''
+    )
+    id_ = flow({
+        'scheduling': {
+            'xtriggers': {
+                'mytrig': 'mytrig(%(point)s)'
+            },
+            'graph': {
+                'R1': '@mytrig => foo'
+            },
+        },
+        'runtime': {'foo': {}},
+    })
+    run_dir = Path(get_workflow_run_dir(id_))
+    xtrig_dir = run_dir / 'lib/python'
+    xtrig_dir.mkdir(parents=True)
+    (xtrig_dir / 'mytrig.py').write_text(dedent('''
+        def mytrig(point):
+            return True, {"point": point}
+    '''))
+
+    schd = scheduler(id_)
+    async with start(schd):
+        foo = schd.pool.get_task_by_id('1/foo')
+        schd.xtrigger_mgr.call_xtriggers_async(foo)
+        # the call should be run by the xtrigger pool
+        assert not schd.proc_pool.queuings
+        assert len(schd.proc_pool.xtrigger_executor.runnings) == 1
+        for _ in range(100):
+            await asyncio.sleep(0.1)
+            schd.proc_pool.process()
+            if not schd.proc_pool.is_not_done():
+                break
+        else:
+            raise Exception('Xtrigger pool did not clear')
+        assert schd.xtrigger_mgr.sat_xtrig == {'mytrig(1)': {'point': '1'}}
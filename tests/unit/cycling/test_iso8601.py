@@ -23,6 +23,7 @@ from cylc.flow.cycling.iso8601 import (
     ISO8601Interval,
     ISO8601Point,
     ISO8601Sequence,
+    _interval_seconds,
     ingest_time,
 )
 from cylc.flow.cycling.loader import ISO8601_CYCLING_TYPE
@@ -933,3 +934,130 @@ def test_validate_fails_comma_sep_offset_list(_input, errortext, set_cycling_typ
     set_cycling_type(ISO8601_CYCLING_TYPE, "Z")
     with pytest.raises(Exception, match=errortext):
         ingest_time(_input)
+
+
+@pytest.mark.parametrize(
+    'spec, start, stop, time_zone',
+    [
+        param('PT6H', '20000101T00', '20000201T00', 'Z', id='unbounded'),
+        param('R5/T00/PT7H', '20000101T00', None, 'Z', id='repetitions'),
+        param('PT3H/20000110T06', '20000101T00', None, 'Z', id='end-point'),
+        param('+P1D/PT1H', '20000101T00', '20000110T00', 'Z', id='offset'),
+        param(
+            'P1D!(20000103T00, 20000105T00)',
+            '20000101T00', '20000201T00', 'Z',
+            id='exclusions',
+        ),
+        param('R3/2000/P1D!20000103', '2000', None, 'Z', id='excluded-end'),
+        param('PT90M', '20000101T00', None, '+0530', id='time-zone'),
+    ],
+)
+def test_regular_recurrence(spec, start, stop, time_zone, set_cycling_type):
+    """Fixed-step sequences give the same results as the recurrence."""
+    set_cycling_type(ISO8601_CYCLING_TYPE, time_zone)
+    sequence = ISO8601Sequence(spec, start, stop)
+    assert sequence._regular is not None
+    reference = ISO8601Sequence(spec, start, stop)
+    reference._regular = None
+
+    points = [
+        ISO8601Point(f'200001{day:02d}T{hour:02d}{minute:02d}')
+        .standardise()
+        for day in range(1, 12)
+        for hour in (0, 5, 6, 23)
+        for minute in (0, 30)
+    ]
+    for point in points:
+        for method in (
+            'is_valid',
+            'get_first_point',
+            'get_next_point',
+            'get_nearest_prev_point',
+        ):
+            assert (
+                getattr(sequence, method)(point)
+                == getattr(reference, method)(point)
+            ), (method, point)
+        on_sequence = reference.get_first_point(point)
+        if on_sequence is not None:
+            for method in ('get_prev_point', 'get_next_point_on_sequence'):
+                assert (
+                    getattr(sequence, method)(on_sequence)
+                    == getattr(reference, method)(on_sequence)
+                ), (method, on_sequence)
+    assert sequence.get_start_point() == reference.get_start_point()
+    assert sequence.get_stop_point() == reference.get_stop_point()
+
+
+def test_regular_recurrence_walk(set_cycling_type):
+    """Walking a fixed-step sequence beyond the point window."""
+    set_cycling_type(ISO8601_CYCLING_TYPE, 'Z')
+    sequence = ISO8601Sequence('PT1H', '20000101T00')
+    window = sequence._regular.MAX_WINDOW
+    point = sequence.get_start_point()
+    for _ in range(window + 10):
+        point = sequence.get_next_point_on_sequence(point)
+    assert point == ISO8601Point('20000101T00') + ISO8601Interval(
+        f'PT{window + 10}H')
+    assert len(sequence._regular._values) == window
+    for _ in range(window + 10):
+        point = sequence.get_prev_point(point)
+    assert point == sequence.get_start_point()
+    assert sequence.get_prev_point(point) is None
+
+
+def test_irregular_recurrence(set_cycling_type):
+    """Sequences with a calendar-dependent step use the recurrence."""
+    set_cycling_type(ISO8601_CYCLING_TYPE, 'Z')
+    sequence = ISO8601Sequence('P1M', '2000', '2001')
+    assert sequence._regular is None
+    assert sequence.get_next_point(
+        ISO8601Point('20000131T0000Z')
+    ) == ISO8601Point('20000201T0000Z')
+
+
+@pytest.mark.parametrize(
+    'interval, expected',
+    [
+        ('PT6H', 21600),
+        ('-P1D', -86400),
+        ('P1M', None),
+        ('PT0.5S', None),
+    ],
+)
+def test_interval_seconds(interval, expected, set_cycling_type):
+    set_cycling_type(ISO8601_CYCLING_TYPE, 'Z')
+    assert _interval_seconds(interval) == expected
+
+
+def test_point_seconds(set_cycling_type):
+    """Points are compared and hashed by their seconds since the epoch."""
+    set_cycling_type(ISO8601_CYCLING_TYPE, 'Z')
+    point = ISO8601Point('20000101T0000Z')
+    # equivalent points in other time zones
+    other = ISO8601Point('20000101T0100+01')
+    assert point.seconds == 946684800
+    assert point == other
+    assert hash(point) == hash(other)
+    assert len({point, other}) == 1
+    assert not point < other
+    assert point <= other
+
+    later = ISO8601Point('20000101T0130+01')
+    assert point < later
+    assert later > point
+    assert point != later
+    assert sorted([later, other, point]) == [other, point, later]
+
+    # the seconds are carried through exact arithmetic
+    next_point = point + ISO8601Interval('PT6H')
+    assert next_point._seconds == point.seconds + 21600
+    assert next_point.seconds == ISO8601Point('20000101T0600Z').seconds
+    assert (next_point - ISO8601Interval('PT6H'))._seconds == point.seconds
+    assert (point + ISO8601Interval('P1M'))._seconds is None
+
+    # standardising the value resets the seconds
+    point = ISO8601Point('2000-01-01T00Z')
+    assert point.seconds == 946684800
+    assert point.standardise()._seconds is None
+    assert point.seconds == 946684800
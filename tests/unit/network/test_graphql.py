@@ -19,10 +19,15 @@ from typing import Optional, Type
 import pytest
 from pytest import param
 from graphql import parse
+from graphql.validation import validate
 
 from cylc.flow.data_messages_pb2 import PbTaskProxy, PbPrerequisite
 from cylc.flow.network.graphql import (
-    AstDocArguments, null_setter, NULL_VALUE, grow_tree
+    AstDocArguments,
+    CylcGraphQLBackend,
+    null_setter,
+    NULL_VALUE,
+    grow_tree,
 )
 from cylc.flow.network.schema import schema
 
@@ -186,3 +191,33 @@ def test_null_setter(pre_result, expected_result):
 def test_grow_tree(expect, tree, path, leaves):
     grow_tree(tree, path, leaves)
     assert tree == expect
+
+
+def test_document_cache(monkeypatch):
+    """Documents are parsed and validated once."""
+    validations = []
+
+    def _validate(*args):
+        validations.append(args)
+        return validate(*args)
+
+    monkeypatch.setattr('cylc.flow.network.graphql.validate', _validate)
+    backend = CylcGraphQLBackend(cache_size=1)
+    query = 'query { workflows { id } }'
+    document = backend.document_from_string(schema, query)
+    assert backend.document_from_string(schema, query) is document
+    assert len(validations) == 1
+
+    # invalid documents are cached with their validation errors
+    invalid = 'query { workflows { foo } }'
+    result = backend.document_from_string(schema, invalid).execute(
+        variable_values=None)
+    assert result.invalid
+    result = backend.document_from_string(schema, invalid).execute(
+        variable_values=None)
+    assert result.invalid
+    assert len(validations) == 2
+
+    # the least recently used document was discarded
+    assert backend.document_from_string(schema, query) is not document
+    assert len(validations) == 3
@@ -0,0 +1,157 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from cylc.flow.data_messages_pb2 import (  # type: ignore
+    PbJob,
+    PbTaskProxy,
+)
+from cylc.flow.data_store_mgr import (
+    DELTA_ADDED,
+    DELTA_UPDATED,
+    create_delta_store,
+)
+from cylc.flow.network.resolvers import DeltaQueue, get_delta_filter
+
+
+def _delta_store(delta_type=DELTA_UPDATED, **elements):
+    """Return a delta store containing the provided elements."""
+    delta_store = create_delta_store(workflow_id='~u/w')
+    for key, nodes in elements.items():
+        delta_store[delta_type][key] = {node.id: node for node in nodes}
+    return delta_store
+
+
+def test_DeltaQueue():
+    """It should drop unwanted deltas and resync when full."""
+    queue = DeltaQueue(
+        maxsize=3,
+        delta_filter=lambda delta_store: delta_store.get('wanted'),
+    )
+    queue.put(('a', 'delta', {'wanted': False}))
+    assert queue.empty()
+    for w_id in ('a', 'a', 'b'):
+        queue.put((w_id, 'delta', {'wanted': True}))
+    assert queue.qsize() == 3
+
+    # the queue is full, deltas for "a" are replaced by a resync
+    queue.put(('a', 'delta', {'wanted': True}))
+    assert queue.qsize() == 1
+    # later deltas for "a" are covered by the resync
+    queue.put(('a', 'delta', {'wanted': True}))
+    # shutdown deltas are always queued
+    queue.put(('a', 'shutdown', {}))
+    assert queue.get_all() == (
+        [('b', 'delta', {'wanted': True}), ('a', 'shutdown', {})],
+        {'a'},
+    )
+    assert queue.get_all() == ([], set())
+
+
+@pytest.mark.parametrize(
+    'field_name, args, delta_store, expected',
+    [
+        pytest.param(
+            'deltas',
+            {},
+            _delta_store(),
+            None,
+            id='not-an-element-subscription',
+        ),
+        pytest.param(
+            'task_proxies',
+            {'delta_store': False},
+            _delta_store(),
+            None,
+            id='resolved-from-the-data-store',
+        ),
+        pytest.param(
+            'task_proxies',
+            {'delta_store': True, 'delta_type': DELTA_UPDATED},
+            _delta_store(jobs=[PbJob(id='~u/w//1/a/01')]),
+            False,
+            id='other-element-type',
+        ),
+        pytest.param(
+            'task_proxies',
+            {'delta_store': True, 'delta_type': DELTA_ADDED},
+            _delta_store(task_proxies=[PbTaskProxy(id='~u/w//1/a')]),
+            False,
+            id='other-delta-type',
+        ),
+        pytest.param(
+            'task_proxies',
+            {
+                'delta_store': True,
+                'delta_type': DELTA_UPDATED,
+                'ids': ['1/b'],
+                'states': ['running'],
+            },
+            _delta_store(task_proxies=[
+                PbTaskProxy(id='~u/w//1/a', state='running'),
+                PbTaskProxy(id='~u/w//1/b', state='waiting'),
+            ]),
+            False,
+            id='no-matching-elements',
+        ),
+        pytest.param(
+            'task_proxies',
+            {
+                'delta_store': True,
+                'delta_type': DELTA_UPDATED,
+                'ids': ['1/b'],
+                'states': ['running'],
+            },
+            _delta_store(task_proxies=[
+                PbTaskProxy(id='~u/w//1/a', state='running'),
+                # (no state in the delta)
+                PbTaskProxy(id='~u/w//1/b', is_held=True),
+            ]),
+            True,
+            id='matching-element',
+        ),
+        pytest.param(
+            'job',
+            {
+                'delta_store': True,
+                'delta_type': DELTA_UPDATED,
+                'id': '~u/w//1/a/02',
+            },
+            _delta_store(jobs=[PbJob(id='~u/w//1/a/01')]),
+            False,
+            id='other-id',
+        ),
+        pytest.param(
+            'job',
+            {
+                'delta_store': True,
+                'delta_type': DELTA_UPDATED,
+                'id': '~u/w//1/a/01',
+            },
+            _delta_store(jobs=[PbJob(id='~u/w//1/a/01')]),
+            True,
+            id='matching-id',
+        ),
+    ]
+)
+def test_get_delta_filter(field_name, args, delta_store, expected):
+    """It should filter out deltas the subscription has no use for."""
+    delta_filter = get_delta_filter(field_name, args)
+    if expected is None:
+        assert delta_filter is None
+    else:
+        assert delta_filter(delta_store) is expected
@@ -19,10 +19,12 @@ from inspect import signature
 import logging
 from pathlib import Path
 from random import random
+from threading import Thread
 
 import pytest
 
 from cylc.flow.async_util import (
+    ThreadSafeEvent,
     pipe,
     asyncqgen,
     scandir,
@@ -264,3 +266,15 @@ async def test_scandir_non_exist(tmp_path: Path):
     doesn't exist."""
     with pytest.raises(FileNotFoundError):
         await scandir(tmp_path / 'HORSE')
+
+
+async def test_thread_safe_event():
+    """It can be set from another thread to wake the event loop."""
+    event = ThreadSafeEvent()
+    assert not await event.wait(0)
+    thread = Thread(target=event.set)
+    thread.start()
+    assert await event.wait(5)
+    thread.join()
+    event.clear()
+    assert not event.is_set()
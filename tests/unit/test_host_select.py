@@ -22,10 +22,14 @@ NOTE: these are functional tests, for unit tests see the docstrings in
 """
 import logging
 import socket
+from subprocess import PIPE, Popen
+import sys
+from time import time
 
 import pytest
 
 from cylc.flow import CYLC_LOG
+from cylc.flow import host_select
 from cylc.flow.exceptions import HostSelectException
 from cylc.flow.host_select import (
     _get_metrics,
@@ -218,3 +222,81 @@ def test_get_metrics_no_hosts_error(caplog):
     assert not host_stats
     # the return code should be recorded
     assert data == {'not-a-host': {'returncode': 255}}
+
+
+@pytest.fixture
+def mock_psutil(monkeypatch):
+    """Replace "cylc psutil" with commands which return "results" after
+    "delay" seconds, in the order provided."""
+    commands = []
+
+    def _run_cmd(cmd, stdin_str=None, **kwargs):
+        delay, results = commands.pop(0)
+        return Popen(  # nosec
+            [
+                sys.executable,
+                '-c',
+                f'import time; time.sleep({delay}); print({results!r})',
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            text=True,
+        )
+
+    monkeypatch.setattr(host_select, 'run_cmd', _run_cmd)
+    monkeypatch.setattr(host_select, 'is_remote_host', lambda _: False)
+    return commands
+
+
+def test_get_metrics_timeout(mock_psutil):
+    """Hosts which do not respond in time are not selected."""
+    mock_psutil.extend([(0, [2]), (30, [1])])
+    start = time()
+    results, data = _get_metrics(['a', 'b'], [('cpu_count',)], timeout=1)
+    assert time() - start < 10
+    assert results == {'a': {('cpu_count',): 2}}
+    assert data['b'] == {'timed out': True}
+
+
+def test_get_metrics_quorum(mock_psutil):
+    """It should stop waiting once enough good hosts have responded."""
+    mock_psutil.extend([(0, [1]), (0.5, [2]), (30, [3])])
+    start = time()
+    results, data = _get_metrics(
+        ['a', 'b', 'c'],
+        [('cpu_count',)],
+        quorum=1,
+        is_good=lambda host, results: results[('cpu_count',)] > 1,
+    )
+    assert time() - start < 10
+    assert results == {
+        'a': {('cpu_count',): 1},
+        'b': {('cpu_count',): 2},
+    }
+    assert data['c'] == {}
+
+
+def test_get_metrics_cache(mock_psutil, monkeypatch, tmp_path):
+    """It should reuse recent metrics from the cache."""
+    monkeypatch.setattr(
+        host_select, 'METRICS_CACHE_FILE', str(tmp_path / 'cache.json'))
+    metrics = [('cpu_count',), ('getloadavg',)]
+    mock_psutil.extend([(0, [4, [1, 2, 3]])])
+    results, _ = _get_metrics(['a'], metrics, cache_duration=60)
+    assert not mock_psutil
+
+    # the cached metrics are reused...
+    assert _get_metrics(['a'], metrics, cache_duration=60) == (
+        results, {'a': {'cached': True}}
+    )
+    # ... unless different metrics are required
+    mock_psutil.extend([(0, [5])])
+    assert _get_metrics(['a'], [('cpu_percent',)], cache_duration=60)[0] == {
+        'a': {('cpu_percent',): 5}
+    }
+    # ... or they are too old
+    monkeypatch.setattr(host_select, 'time', lambda: time() + 120)
+    mock_psutil.extend([(0, [8, [1, 2, 3]])])
+    assert _get_metrics(['a'], metrics, cache_duration=60)[0] == {
+        'a': {('cpu_count',): 8, ('getloadavg',): [1, 2, 3]}
+    }
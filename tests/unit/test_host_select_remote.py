@@ -111,7 +111,7 @@ def test_remote_exclude(monkeypatch):
 
     Already tested elsewhere but this double-checks that it works if more
     than one host is provided to choose from."""
-    def mocked_get_metrics(hosts, metrics, _=None):
+    def mocked_get_metrics(hosts, metrics, _=None, **kwargs):
         # pretend that ssh to remote_platform failed
         return (
             {f'{local_host_fqdn}': {('cpu_count',): 123}},
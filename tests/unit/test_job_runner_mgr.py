@@ -0,0 +1,126 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import builtins
+import json
+import os
+
+import pytest
+
+from cylc.flow import job_runner_mgr
+from cylc.flow.job_runner_mgr import JobRunnerManager
+
+
+STATUS = '''CYLC_JOB_RUNNER_NAME=background
+CYLC_JOB_ID=99999999
+CYLC_JOB_RUNNER_SUBMIT_TIME=2025-01-01T00:00:00Z
+CYLC_JOB_PID=99999999
+CYLC_JOB_INIT_TIME=2025-01-01T00:00:01Z
+CYLC_JOB_EXIT=SUCCEEDED
+CYLC_JOB_EXIT_TIME=2025-01-01T00:00:02Z
+'''
+
+
+@pytest.fixture
+def job_log_root(tmp_path, monkeypatch):
+    """A job log directory containing finished jobs 1/a/01 ... 1/e/01."""
+    monkeypatch.setattr(job_runner_mgr, '_STATUS_FILE_CACHE', {})
+    root = tmp_path / 'log' / 'job'
+    for name in 'abcde':
+        job_dir = root / '1' / name / '01'
+        job_dir.mkdir(parents=True)
+        (job_dir / 'job.status').write_text(STATUS)
+    return root
+
+
+def get_summaries(out):
+    """Return {job_log_dir: summary} from "cylc jobs-poll" output."""
+    ret = {}
+    for line in out.splitlines():
+        if line.startswith(JobRunnerManager.OUT_PREFIX_SUMMARY):
+            _, job_log_dir, summary = line.split('|', 2)
+            ret[job_log_dir] = json.loads(summary)
+    return ret
+
+
+def test_jobs_poll(job_log_root, capsys):
+    """It should report the status of each job, in order."""
+    job_log_dirs = [f'1/{name}/01' for name in 'edcba'] + ['1/x/01']
+    JobRunnerManager().jobs_poll(str(job_log_root), job_log_dirs)
+    out, err = capsys.readouterr()
+    summaries = get_summaries(out)
+    assert list(summaries) == job_log_dirs[:-1]
+    for summary in summaries.values():
+        assert summary['run_status'] == 0
+        assert summary['job_runner_name'] == 'background'
+    # missing status file
+    assert '1/x/01' in err
+
+
+def test_jobs_poll_cache(job_log_root, capsys, monkeypatch):
+    """It should only re-read status files which have changed."""
+    job_log_dirs = [f'1/{name}/01' for name in 'abcde']
+    jrm = JobRunnerManager()
+    jrm.jobs_poll(str(job_log_root), job_log_dirs)
+    first = get_summaries(capsys.readouterr()[0])
+
+    read = []
+    orig_open = builtins.open
+
+    class _Handle:
+        """A file handle which records when its lines are read."""
+
+        def __init__(self, path, *args, **kwargs):
+            self.path = str(path)
+            self.handle = orig_open(path, *args, **kwargs)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.handle.close()
+
+        def __iter__(self):
+            read.append(self.path)
+            return iter(self.handle)
+
+        def fileno(self):
+            return self.handle.fileno()
+
+    monkeypatch.setattr(builtins, 'open', _Handle)
+
+    # unchanged files are not read again
+    jrm.jobs_poll(str(job_log_root), job_log_dirs)
+    assert get_summaries(capsys.readouterr()[0]) == first
+    assert read == []
+
+    # changed files are
+    status_file = job_log_root / '1' / 'c' / '01' / 'job.status'
+    status_file.write_text(
+        STATUS.replace('SUCCEEDED', 'EXIT')
+        + 'CYLC_MESSAGE=2025-01-01T00:00:02Z|CRITICAL|failed/ERR\n'
+    )
+    stat = os.stat(status_file)
+    os.utime(
+        status_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000)
+    )
+    jrm.jobs_poll(str(job_log_root), job_log_dirs)
+    out = capsys.readouterr()[0]
+    assert read == [str(status_file)]
+    summaries = get_summaries(out)
+    assert summaries['1/c/01']['run_status'] == 1
+    assert summaries['1/c/01']['run_signal'] == 'EXIT'
+    assert out.count('CRITICAL|failed/ERR') == 1
@@ -0,0 +1,74 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+
+import pytest
+
+from cylc.flow.job_status_watcher import JobStatusWatcher
+
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith('linux'), reason='requires inotify')
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    watcher = JobStatusWatcher(str(tmp_path))
+    yield watcher
+    watcher.close()
+
+
+def test_watch(tmp_path, watcher):
+    """It should report changes to the status files of watched jobs."""
+    for job in ('1/a/01', '1/b/01', '1/c/01'):
+        (tmp_path / job).mkdir(parents=True)
+    assert watcher.watch('1/a/01')
+    assert watcher.watch('1/b/01')
+    assert not watcher.watch('1/x/01')
+    assert watcher.get_changed() == set()
+
+    (tmp_path / '1/a/01/job.status').write_text('CYLC_JOB_PID=1\n')
+    (tmp_path / '1/b/01/job.out').write_text('')
+    (tmp_path / '1/c/01/job.status').write_text('CYLC_JOB_PID=1\n')
+    assert watcher.get_changed() == {'1/a/01'}
+    assert watcher.get_changed() == set()
+
+    # appending to the file is a change
+    with open(tmp_path / '1/b/01/job.status', 'a') as handle:
+        handle.write('CYLC_JOB_PID=1\n')
+    watcher.unwatch('1/a/01')
+    (tmp_path / '1/a/01/job.status').write_text('CYLC_JOB_PID=2\n')
+    assert watcher.get_changed() == {'1/b/01'}
+    assert set(watcher.watches) == {'1/b/01'}
+
+
+def test_removed_dir(tmp_path, watcher):
+    """It should forget directories which have been removed."""
+    (tmp_path / '1/a/01').mkdir(parents=True)
+    assert watcher.watch('1/a/01')
+    (tmp_path / '1/a/01').rmdir()
+    assert watcher.get_changed() == set()
+    assert watcher.watches == {}
+
+
+def test_close(tmp_path, watcher):
+    (tmp_path / '1/a/01').mkdir(parents=True)
+    watcher.watch('1/a/01')
+    watcher.close()
+    assert watcher.fd is None
+    assert not watcher.watch('1/a/01')
+    assert watcher.get_changed() == set()
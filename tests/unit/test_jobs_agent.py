@@ -0,0 +1,214 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cylc.flow.exceptions import JobsAgentError
+from cylc.flow.jobs_agent import (
+    JobsAgent,
+    encode_frame,
+    read_frame,
+    run_command,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+JOB_STATUS = '''
+CYLC_JOB_RUNNER_NAME=background
+CYLC_JOB_ID=99999
+CYLC_JOB_INIT_TIME=2020-01-01T00:00:00Z
+CYLC_JOB_EXIT=SUCCEEDED
+CYLC_JOB_EXIT_TIME=2020-01-01T00:00:01Z
+'''
+
+
+@pytest.fixture
+def job_log_root(tmp_path: 'Path') -> 'Path':
+    """A job log directory containing the status file of one job."""
+    job_log_dir = tmp_path / 'log' / 'job' / '1' / 'foo' / '01'
+    job_log_dir.mkdir(parents=True)
+    (job_log_dir / 'job.status').write_text(JOB_STATUS)
+    return tmp_path / 'log' / 'job'
+
+
+@pytest.fixture
+def local_agent(monkeypatch):
+    """Run the jobs agent locally rather than over SSH."""
+    def _construct_ssh_cmd(*args, **kwargs):
+        return [
+            sys.executable,
+            '-c',
+            'from cylc.flow.jobs_agent import serve; serve()',
+        ]
+
+    monkeypatch.setattr(
+        'cylc.flow.jobs_agent.construct_ssh_cmd', _construct_ssh_cmd)
+    agent = JobsAgent({'name': 'myplatform'}, 'myhost')
+    yield agent
+    agent.terminate()
+
+
+async def test_frames():
+    """It reads framed messages, ignoring any other output."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(b'Welcome to the HPC!\n')
+    reader.feed_data(encode_frame({'a': 1}))
+    reader.feed_data(encode_frame({'b': [2, 3]}))
+    reader.feed_eof()
+    assert await read_frame(reader) == {'a': 1}
+    assert await read_frame(reader) == {'b': [2, 3]}
+    assert await read_frame(reader) is None
+
+
+def test_run_command(job_log_root):
+    """It runs jobs commands in-process and captures their output."""
+    ret_code, out, err = run_command(
+        ['jobs-poll', '--', str(job_log_root), '1/foo/01'])
+    assert ret_code == 0
+    assert '|1/foo/01|' in out
+    assert '"run_status": 0' in out
+    assert err == ''
+
+    ret_code, out, err = run_command(['jobs-poll', '--no-such-option'])
+    assert ret_code == 2
+    assert 'no such option' in err
+
+    assert run_command(['play', 'myworkflow'])[0] == 1
+
+
+def test_run_command_concurrent(job_log_root):
+    """It keeps the output of concurrent commands apart."""
+    def _poll(job_log_dir):
+        return run_command(
+            ['jobs-poll', '--', str(job_log_root), job_log_dir, '1/x/01'])
+
+    job_log_dirs = ['1/foo/01', '1/bar/01'] * 10
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(_poll, job_log_dirs))
+    for job_log_dir, (ret_code, out, err) in zip(job_log_dirs, results):
+        assert ret_code == 0
+        if job_log_dir == '1/foo/01':
+            assert '|1/foo/01|' in out
+        else:
+            assert '|1/foo/01|' not in out
+        # (written by the threads which read the status files)
+        assert err.count('/1/x/01/job.status') == 1
+        assert err.count(f'/{job_log_dir}/job.status') == (
+            job_log_dir == '1/bar/01'
+        )
+
+
+async def test_jobs_agent(local_agent, job_log_root):
+    """It runs commands via a long-lived agent process."""
+    results = await asyncio.gather(*(
+        local_agent.run(['jobs-poll', '--', str(job_log_root), '1/foo/01'])
+        for _ in range(3)
+    ))
+    for ret_code, out, _ in results:
+        assert ret_code == 0
+        assert '|1/foo/01|' in out
+    proc = local_agent.proc
+    assert proc is not None
+
+    # it reuses the agent process
+    assert (await local_agent.run(['play']))[0] == 1
+    assert local_agent.proc is proc
+
+    # it exits when closed
+    local_agent.close()
+    assert await asyncio.wait_for(proc.wait(), 5) == 0
+    with pytest.raises(JobsAgentError) as exc_ctx:
+        await local_agent.run(['jobs-poll'])
+    assert not exc_ctx.value.sent
+
+
+async def test_jobs_agent_fail(local_agent, monkeypatch):
+    """It reports whether failed commands were sent to the agent."""
+    # the agent can't start => commands not sent
+    monkeypatch.setattr(
+        'cylc.flow.jobs_agent.construct_ssh_cmd',
+        lambda *args, **kwargs: ['false'],
+    )
+    with pytest.raises(JobsAgentError) as exc_ctx:
+        await local_agent.run(['jobs-poll'])
+    assert not exc_ctx.value.sent
+
+    # it doesn't try again for a while
+    assert local_agent.failed_at
+    with pytest.raises(JobsAgentError) as exc_ctx:
+        await local_agent.run(['jobs-poll'])
+    assert not exc_ctx.value.sent
+
+    # the agent dies while running a command => command sent
+    monkeypatch.undo()
+    local_agent.failed_at = None
+    monkeypatch.setattr(
+        'cylc.flow.jobs_agent.construct_ssh_cmd',
+        lambda *args, **kwargs: [
+            sys.executable,
+            '-c',
+            (
+                'import sys;'
+                ' from cylc.flow.jobs_agent import encode_frame;'
+                ' sys.stdout.buffer.write(encode_frame({"version": "x"}));'
+                ' sys.stdout.flush();'
+                ' sys.stdin.readline()'
+            ),
+        ],
+    )
+    with pytest.raises(JobsAgentError) as exc_ctx:
+        await local_agent.run(['jobs-poll'])
+    assert exc_ctx.value.sent
+
+
+async def test_jobs_agent_timeout(local_agent, monkeypatch):
+    """A request can time out without affecting other requests."""
+    monkeypatch.setattr(
+        'cylc.flow.jobs_agent.construct_ssh_cmd',
+        lambda *args, **kwargs: [sys.executable, '-c', dedent('''
+            import sys
+            from cylc.flow.jobs_agent import encode_frame, read_frame_sync
+            out = sys.stdout.buffer
+            out.write(encode_frame({"version": "x"}))
+            out.flush()
+            while True:
+                msg = read_frame_sync(sys.stdin.buffer)
+                if msg is None:
+                    break
+                if msg["cmd"] != ["slow"]:
+                    out.write(encode_frame({
+                        "id": msg["id"], "ret_code": 0, "out": "", "err": ""
+                    }))
+                    out.flush()
+        ''')],
+    )
+    slow = asyncio.ensure_future(local_agent.run(['slow']))
+    assert await local_agent.run(['fast']) == (0, '', '')
+    proc = local_agent.proc
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(slow, 0.5)
+    # the agent is still running
+    assert await local_agent.run(['fast']) == (0, '', '')
+    assert local_agent.proc is proc
+    assert not local_agent._requests
@@ -0,0 +1,108 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from cylc.flow import loop_timer
+from cylc.flow.loop_timer import (
+    PHASE_COMMANDS,
+    PHASE_LOOP,
+    PHASE_OTHER,
+    PHASE_SLEEP,
+    PHASES,
+    LoopTimer,
+)
+from cylc.flow.scripts.loop_timings import format_timings
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Mock perf_counter, advance the time with clock.tick(seconds)."""
+    times = [0.0]
+    monkeypatch.setattr(loop_timer, 'perf_counter', lambda: times[-1])
+
+    class Clock:
+        @staticmethod
+        def tick(seconds):
+            times.append(times[-1] + seconds)
+
+    return Clock
+
+
+def test_loop_timer(clock):
+    timer = LoopTimer(window=2)
+    for command_time in (0.1, 0.3, 0.5):
+        timer.start()
+        clock.tick(0.01)
+        timer.lap(PHASE_OTHER)
+        clock.tick(command_time)
+        timer.lap(PHASE_COMMANDS)
+        clock.tick(0.01)
+        # laps of the same phase are added together
+        timer.lap(PHASE_OTHER)
+        clock.tick(1.0)
+        timer.lap(PHASE_SLEEP)
+        timer.stop()
+
+    stats = {stat['name']: stat for stat in timer.get_stats()}
+    assert set(stats) == {PHASE_LOOP, PHASE_SLEEP, *PHASES}
+
+    commands = stats[PHASE_COMMANDS]
+    assert commands['count'] == 3
+    assert commands['total'] == pytest.approx(0.9)
+    # the window only contains the last two loops
+    assert commands['loops'] == 2
+    assert commands['mean'] == pytest.approx(0.4)
+    assert commands['max'] == pytest.approx(0.5)
+    assert commands['p50'] == pytest.approx(0.3)
+    assert commands['p99'] == pytest.approx(0.5)
+    assert commands['share'] == pytest.approx(0.8 / 0.84)
+    assert [
+        (bucket['le'], bucket['count'])
+        for bucket in commands['histogram']
+        if bucket['count']
+    ] == [(0.5, 2)]
+
+    assert stats[PHASE_OTHER]['mean'] == pytest.approx(0.02)
+    assert stats[PHASE_LOOP]['mean'] == pytest.approx(0.42)
+    assert stats[PHASE_LOOP]['share'] == pytest.approx(1)
+    assert stats[PHASE_SLEEP]['mean'] == pytest.approx(1.0)
+    assert stats[PHASE_SLEEP]['share'] is None
+    assert stats[PHASE_SLEEP]['histogram'][-1] == {'le': None, 'count': 0}
+
+
+def test_loop_timer_empty():
+    stats = LoopTimer().get_stats()
+    assert all(stat['loops'] == 0 for stat in stats)
+    assert all(stat['share'] is None for stat in stats)
+
+
+def test_format_timings(clock):
+    timer = LoopTimer()
+    timer.start()
+    clock.tick(0.002)
+    timer.lap(PHASE_COMMANDS)
+    timer.stop()
+    lines = format_timings(timer.get_stats(), histogram=True).splitlines()
+    assert lines[0].split() == [
+        'phase', 'loops', 'share', 'mean', 'p50', 'p90', 'p99', 'max'
+    ]
+    assert lines[1].split() == ['loop', '1', '100.0%', *['2.0ms'] * 5]
+    assert lines[2].split() == [
+        'command', 'queue', '1', '100.0%', *['2.0ms'] * 5
+    ]
+    assert 'command queue:' in lines
+    assert '<= 2.0ms  1' in [line.strip() for line in lines]
@@ -14,9 +14,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import re
+
 import pytest
 
 from cylc.flow.cycling.loader import ISO8601_CYCLING_TYPE, get_point
+from cylc.flow.exceptions import TriggerExpressionError
 from cylc.flow.prerequisite import Prerequisite
 from cylc.flow.id import Tokens
 
@@ -102,3 +105,46 @@ def test_get_target_points(prereq):
         get_point('2000'),
         get_point('2001'),
     }
+
+
+@pytest.mark.parametrize(
+    'expr, satisfied, expected',
+    [
+        ('1/a x|1/b x', [], False),
+        ('1/a x|1/b x', ['b'], True),
+        ('1/a x&1/b x|1/c x', ['a'], False),
+        ('1/a x&1/b x|1/c x', ['c'], True),
+        ('1/a x&(1/b x|1/c x)', ['c'], False),
+        ('1/a x&(1/b x|1/c x)', ['a', 'c'], True),
+        ('((1/a x|1/b x))&1/c x', ['b', 'c'], True),
+    ]
+)
+def test_conditional_is_satisfied(expr, satisfied, expected):
+    """It evaluates conditional expressions."""
+    prereq = Prerequisite(1)
+    for name in 'abc':
+        prereq.add(name, 1, 'x')
+    prereq.set_condition(expr)
+    prereq.satisfy_me(
+        [Tokens(f'1/{name}:x', relative=True) for name in satisfied]
+    )
+    assert prereq.is_satisfied() == expected
+
+
+@pytest.mark.parametrize(
+    'expr, err',
+    [
+        ('(1/a x|1/b x', 'unmatched parentheses'),
+        ('1/a x|1/b x)', 'unmatched parentheses'),
+        ('1/a x|', 'incomplete expression'),
+        ('1/a x|@wall_clock', "invalid term '@wall_clock'"),
+    ]
+)
+def test_conditional_bad_expression(expr, err):
+    """It raises TriggerExpressionError for bad expressions."""
+    prereq = Prerequisite(1)
+    for name in 'ab':
+        prereq.add(name, 1, 'x')
+    prereq.set_condition(expr)
+    with pytest.raises(TriggerExpressionError, match=re.escape(err)):
+        prereq.is_satisfied()
@@ -175,3 +175,101 @@ def test_select_task_pool_for_restart_if_not_platforms(tmp_path):
         match='not defined.*\n.*foo.*\n.*bar'
     ):
         dao.select_task_pool_for_restart(callback)
+
+
+def _job_churn(dao: CylcWorkflowDAO, n_jobs: int, batch_size: int) -> None:
+    """Write task_states/task_events/task_jobs rows as a scheduler would."""
+    for batch in range(0, n_jobs, batch_size):
+        for num in range(batch, min(batch + batch_size, n_jobs)):
+            point, name = str(num // 10), f'foo{num % 10}'
+            dao.add_insert_item(
+                CylcWorkflowDAO.TABLE_TASK_STATES,
+                {'name': name, 'cycle': point, 'status': 'submitted'},
+            )
+            dao.add_insert_item(
+                CylcWorkflowDAO.TABLE_TASK_JOBS,
+                {'name': name, 'cycle': point, 'submit_num': 1},
+            )
+            dao.add_insert_item(
+                CylcWorkflowDAO.TABLE_TASK_EVENTS,
+                {'name': name, 'cycle': point, 'event': 'submitted'},
+            )
+        dao.execute_queued_items()
+        for num in range(batch, min(batch + batch_size, n_jobs)):
+            point, name = str(num // 10), f'foo{num % 10}'
+            dao.add_update_item(
+                CylcWorkflowDAO.TABLE_TASK_STATES,
+                {'status': 'succeeded'},
+                {'name': name, 'cycle': point},
+            )
+            dao.add_update_item(
+                CylcWorkflowDAO.TABLE_TASK_JOBS,
+                {'run_status': 0},
+                {'name': name, 'cycle': point, 'submit_num': 1},
+            )
+        dao.execute_queued_items()
+
+
+@pytest.mark.parametrize('persistent', [False, True])
+def test_job_churn(tmp_path: Path, persistent: bool):
+    """Benchmark writes for heavy job churn with and without persistence.
+
+    Run with "pytest --durations=0" to compare the write throughput of the
+    two modes.
+    """
+    db_file = tmp_path / 'db'
+    with CylcWorkflowDAO(
+        db_file, create_tables=True, persistent=persistent
+    ) as dao:
+        _job_churn(dao, n_jobs=2000, batch_size=20)
+    with CylcWorkflowDAO(db_file) as dao:
+        conn = dao.connect()
+        assert list(conn.execute(
+            'SELECT COUNT(*) FROM task_jobs WHERE run_status == 0'
+        )) == [(2000,)]
+        assert list(conn.execute(
+            'SELECT COUNT(*) FROM task_states WHERE status == "succeeded"'
+        )) == [(2000,)]
+        assert list(conn.execute(
+            'SELECT COUNT(*) FROM task_events'
+        )) == [(2000,)]
+
+
+def test_persistent_connection(tmp_path: Path):
+    """Test the connection is kept open in WAL mode if persistent."""
+    db_file = tmp_path / 'db'
+    with CylcWorkflowDAO(db_file, create_tables=True, persistent=True) as dao:
+        conn = dao.connect()
+        assert list(conn.execute('PRAGMA journal_mode')) == [('wal',)]
+        dao.add_insert_item(CylcWorkflowDAO.TABLE_TASK_POOL, ['1', 'foo'])
+        dao.execute_queued_items()
+        assert dao.conn is conn
+
+        # other connections can read committed data while it is open
+        with CylcWorkflowDAO(db_file) as reader:
+            assert list(reader.connect().execute(
+                'SELECT cycle, name FROM task_pool'
+            )) == [('1', 'foo')]
+
+    # the rollback journal is restored on close
+    assert dao.conn is None
+    assert not Path(f'{db_file}-wal').exists()
+    with CylcWorkflowDAO(db_file) as dao:
+        assert list(
+            dao.connect().execute('PRAGMA journal_mode')
+        ) == [('delete',)]
+
+
+def test_persistent_connection_file_removed(tmp_path: Path):
+    """Test a persistent connection fails if the DB file is removed."""
+    db_file = tmp_path / 'db'
+    dao = CylcWorkflowDAO(db_file, create_tables=True, persistent=True)
+    dao.add_insert_item(CylcWorkflowDAO.TABLE_TASK_POOL, ['1', 'foo'])
+    dao.execute_queued_items()
+    assert dao.conn is not None
+
+    db_file.unlink()
+    dao.add_insert_item(CylcWorkflowDAO.TABLE_TASK_POOL, ['2', 'foo'])
+    with pytest.raises(sqlite3.OperationalError, match='database file'):
+        dao.execute_queued_items()
+    assert dao.conn is None
@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
+import sys
 from tempfile import (
     NamedTemporaryFile, SpooledTemporaryFile, TemporaryFile,
     TemporaryDirectory
@@ -397,3 +399,134 @@ def test_rsync_255_fail(mock_ctx, expect, ctx_kwargs):
         }
     )
     assert output == expect
+
+
+async def test_wakeup():
+    """It calls wakeup when commands are queued and when they exit."""
+    woken = asyncio.Event()
+    pool = SubProcPool(wakeup=woken.set)
+    results = []
+    ctx = SubProcContext(
+        'parrot', ['bash', '-c', 'sleep 0.2; echo pirate; echo errrr >&2'])
+    pool.put_command(ctx, callback=results.append)
+    assert woken.is_set()
+    woken.clear()
+
+    # the command is started, the event loop reads its pipes
+    pool.process()
+    assert pool.runnings
+    assert not woken.is_set()
+
+    # wakeup is called when the command exits
+    await asyncio.wait_for(woken.wait(), 5)
+    pool.process()
+    assert not pool.runnings
+    assert results == [ctx]
+    assert ctx.ret_code == 0
+    assert ctx.out == 'pirate\n'
+    assert ctx.err == 'errrr\n'
+
+
+async def test_timeout():
+    """It kills commands which exceed the timeout."""
+    woken = asyncio.Event()
+    pool = SubProcPool(wakeup=woken.set)
+    pool.proc_pool_timeout = 0.5
+    results = []
+    ctx = SubProcContext('parrot', ['bash', '-c', 'echo pirate; sleep 10'])
+    pool.put_command(ctx, callback=results.append)
+    pool.process()
+    woken.clear()
+    await asyncio.wait_for(woken.wait(), 5)
+    pool.process()
+    assert results == [ctx]
+    assert ctx.ret_code == -9
+    assert ctx.out == 'pirate\n'
+    assert ctx.err == '\nkilled on timeout (0.5)'
+
+
+async def test_command_error(caplog, monkeypatch):
+    """It logs the traceback of errors running commands."""
+    async def _run_command_async(*args):
+        raise ValueError('parrot')
+
+    woken = asyncio.Event()
+    pool = SubProcPool(wakeup=woken.set)
+    monkeypatch.setattr(pool, '_run_command_async', _run_command_async)
+    results = []
+    ctx = SubProcContext('parrot', ['true'])
+    pool.put_command(ctx, callback=results.append)
+    pool.process()
+    woken.clear()
+    await asyncio.wait_for(woken.wait(), 5)
+    pool.process()
+    assert results == [ctx]
+    assert ctx.ret_code == 1
+    [record] = [r for r in caplog.records if r.levelname == 'ERROR']
+    assert record.getMessage() == 'parrot: command failed: parrot'
+    assert record.exc_info[0] is ValueError
+    assert '_run_command_async' in caplog.text
+
+
+async def test_terminate():
+    """It kills running commands and calls their callbacks on terminate."""
+    pool = SubProcPool(wakeup=lambda: None)
+    results = []
+    ctx = SubProcContext('parrot', ['sleep', '10'])
+    pool.put_command(ctx, callback=results.append)
+    pool.process()
+    # let the event loop start the command
+    await asyncio.sleep(0.2)
+    assert pool._procs
+    pool.terminate()
+    assert results == [ctx]
+    assert ctx.ret_code == SubProcPool.RET_CODE_WORKFLOW_STOPPING
+    assert not pool.is_not_done()
+    await asyncio.sleep(0.1)
+    assert not pool._procs
+
+
+async def test_jobs_agent(monkeypatch):
+    """It runs job commands via jobs agents, with fallback to ctx.cmd."""
+    agent_cmd = [
+        sys.executable, '-c', 'from cylc.flow.jobs_agent import serve; serve()'
+    ]
+    monkeypatch.setattr(
+        'cylc.flow.jobs_agent.construct_ssh_cmd',
+        lambda *args, **kwargs: agent_cmd,
+    )
+    woken = asyncio.Event()
+    pool = SubProcPool(wakeup=woken.set)
+
+    async def run(ctx):
+        results = []
+        pool.put_command(ctx, callback=results.append)
+        pool.process()
+        while not results:
+            woken.clear()
+            await asyncio.wait_for(woken.wait(), 10)
+            pool.process()
+        return ctx
+
+    platform = {'name': 'myplatform', 'use jobs agent': True}
+    # the agent runs the remote command
+    ctx = await run(SubProcContext(
+        'jobs-poll', ['bash', '-c', 'echo ssh'], host='myhost',
+        platform=platform, remote_cmd=['jobs-poll', '--no-such-option'],
+    ))
+    assert ctx.ret_code == 2
+    assert 'no such option' in ctx.err
+    assert ctx.out is None
+    assert list(pool.jobs_agents) == [('myplatform', 'myhost')]
+
+    # if the agent can't be started, the command is run over SSH
+    agent_cmd[:] = ['false']
+    pool.jobs_agents.pop(('myplatform', 'myhost')).terminate()
+    ctx = await run(SubProcContext(
+        'jobs-poll', ['bash', '-c', 'echo ssh'], host='myhost',
+        platform=platform, remote_cmd=['jobs-poll', '--no-such-option'],
+    ))
+    assert ctx.ret_code == 0
+    assert ctx.out == 'ssh\n'
+
+    pool.terminate()
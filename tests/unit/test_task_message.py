@@ -0,0 +1,101 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Event
+
+import pytest
+
+from cylc.flow import task_message
+from cylc.flow.exceptions import ClientError
+from cylc.flow.network.client_factory import CommsMeth
+from cylc.flow.task_message import MessageBatcher, send_batch
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Capture batches sent to the workflow."""
+    sent = []
+    monkeypatch.setattr(
+        task_message, 'send_batch', lambda _, batch: sent.append(batch))
+    monkeypatch.setattr(task_message, 'write_messages', lambda *_: None)
+    monkeypatch.setattr(
+        task_message, 'get_comms_method', lambda: CommsMeth.ZMQ)
+    return sent
+
+
+def test_MessageBatcher(sent):
+    """Messages added within the window are sent in one batch."""
+    batcher = MessageBatcher('w', '1/a/01', 60)
+    batcher.add([['INFO', 'x']])
+    batcher.add([['INFO', 'y'], ['WARNING', 'z']])
+    assert sent == []
+    batcher.flush()
+    assert [
+        [severity, message] for _, _, severity, message in sent[0]
+    ] == [['INFO', 'x'], ['INFO', 'y'], ['WARNING', 'z']]
+    assert {job_id for job_id, *_ in sent[0]} == {'1/a/01'}
+
+    # nothing left to send
+    batcher.flush()
+    assert len(sent) == 1
+
+
+def test_MessageBatcher_window(sent, monkeypatch):
+    """Messages are sent when the window expires."""
+    done = Event()
+    monkeypatch.setattr(
+        task_message,
+        'send_batch',
+        lambda _, batch: (sent.append(batch), done.set()),
+    )
+    batcher = MessageBatcher('w', '1/a/01', 0.01)
+    batcher.add([['INFO', 'x']])
+    assert done.wait(5)
+    assert len(sent) == 1
+    batcher.flush()
+    assert len(sent) == 1
+
+
+def test_MessageBatcher_poll(sent, monkeypatch):
+    """Messages are not sent if the comms method is polling."""
+    monkeypatch.setattr(
+        task_message, 'get_comms_method', lambda: CommsMeth.POLL)
+    batcher = MessageBatcher('w', '1/a/01', 0.01)
+    batcher.add([['INFO', 'x']])
+    batcher.flush()
+    assert sent == []
+
+
+def test_send_batch_back_compat(monkeypatch):
+    """It falls back to the GraphQL mutation for older schedulers."""
+    requests = []
+
+    def _client(command, args):
+        requests.append(command)
+        if command == 'put_messages':
+            raise ClientError('No method by the name "put_messages"')
+
+    monkeypatch.setattr(task_message, 'get_client', lambda _: _client)
+    send_batch('w', [['1/a/01', 't1', 'INFO', 'x']])
+    assert requests == ['put_messages', 'graphql']
+
+    # other errors are not caught
+    def _bad_client(command, args):
+        raise ClientError('boom')
+
+    monkeypatch.setattr(task_message, 'get_client', lambda _: _bad_client)
+    with pytest.raises(ClientError):
+        send_batch('w', [['1/a/01', 't1', 'INFO', 'x']])
@@ -14,7 +14,10 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from types import SimpleNamespace
+
 from cylc.flow.cycling.loader import get_point, get_sequence
+from cylc.flow.id import Tokens
 from cylc.flow.task_trigger import TaskTrigger, Dependency
 from cylc.flow.task_outputs import TaskOutputs
 
@@ -171,3 +174,31 @@ def test_str(set_cycling_type):
 
     trigger = TaskTrigger('name', None, 'output')
     assert str(trigger) == 'name:output'
+
+
+def test_get_prerequisite_condition(set_cycling_type):
+    """Prerequisites of a dependency share one compiled condition."""
+    set_cycling_type()
+    a, b, c = (TaskTrigger(name, None, 'x') for name in 'abc')
+    dependency = Dependency([a, '|', [b, '&', c]], [a, b, c], False)
+    tdef = SimpleNamespace(
+        max_future_prereq_offset=None,
+        start_point=get_point('1'),
+    )
+    prereqs = [
+        dependency.get_prerequisite(get_point(point), tdef)
+        for point in ('1', '2')
+    ]
+    assert prereqs[0]._condition is prereqs[1]._condition
+    assert prereqs[0].get_raw_conditional_expression() == (
+        '1/a x|(1/b x&1/c x)'
+    )
+
+    prereq = prereqs[0]
+    assert not prereq.is_satisfied()
+    prereq.satisfy_me([Tokens('1/b:x', relative=True)])
+    assert not prereq.is_satisfied()
+    prereq.satisfy_me([Tokens('1/c:x', relative=True)])
+    assert prereq.is_satisfied()
+    # the other prerequisite is unaffected
+    assert not prereqs[1].is_satisfied()
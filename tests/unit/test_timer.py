@@ -18,7 +18,7 @@ from time import sleep
 
 import pytest
 
-from cylc.flow.timer import Timer
+from cylc.flow.timer import DeadlineQueue, Timer
 
 
 def test_Timer(caplog: pytest.LogCaptureFixture):
@@ -54,3 +54,51 @@ def test_Timer(caplog: pytest.LogCaptureFixture):
     caplog.clear()
     timer.stop()
     assert not caplog.records
+
+
+def test_DeadlineQueue(monkeypatch: pytest.MonkeyPatch):
+    """Test the DeadlineQueue class."""
+    queue = DeadlineQueue()
+    assert queue.next_deadline() is None
+    assert queue.pop_due(100) == []
+
+    queue.add('a', 10)
+    queue.add('b', 10)
+    queue.add('c', 5)
+    assert 'a' in queue
+    assert len(queue) == 3
+    assert queue.next_deadline() == 5
+    # keys are returned in deadline order then in the order added
+    assert queue.pop_due(10) == ['c', 'a', 'b']
+    assert len(queue) == 0
+
+    # re-adding a key replaces its deadline
+    queue.add('a', 10)
+    queue.add('a', 20)
+    queue.add('a', 10)
+    assert queue.pop_due(15) == ['a']
+    assert queue.pop_due(25) == []
+
+    # removed keys are not returned
+    queue.add('b', 10)
+    queue.remove('b')
+    queue.remove('b')
+    assert queue.next_deadline() is None
+    assert queue.pop_due(15) == []
+
+    # the default time is now
+    monkeypatch.setattr('cylc.flow.timer.now', lambda: 50)
+    queue.add('c', 50)
+    queue.add('d', 51)
+    assert queue.pop_due() == ['c']
+
+
+def test_DeadlineQueue_compact(monkeypatch: pytest.MonkeyPatch):
+    """Replaced deadlines are cleared out of the heap."""
+    monkeypatch.setattr(DeadlineQueue, 'COMPACT_THRESHOLD', 10)
+    queue = DeadlineQueue()
+    for deadline in range(100):
+        queue.add('a', deadline)
+        queue.add('b', 1000 - deadline)
+    assert len(queue._heap) <= 12
+    assert queue.pop_due(1000) == ['a', 'b']
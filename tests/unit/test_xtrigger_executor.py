@@ -0,0 +1,140 @@
+# THIS FILE IS PART OF THE CYLC WORKFLOW ENGINE.
+# Copyright (C) NIWA & British Crown (Met Office) & Contributors.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+from textwrap import dedent
+from time import sleep, time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cylc.flow.subprocctx import SubFuncContext
+from cylc.flow.xtrigger_executor import XtriggerExecutor, run_xtrigger
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def xtrig_dir(tmp_path: 'Path'):
+    """A workflow run dir with local xtrigger modules."""
+    lib = tmp_path / 'lib' / 'python'
+    lib.mkdir(parents=True)
+    (lib / 'xtrig_pid.py').write_text(dedent('''
+        import os
+
+        def xtrig_pid(name):
+            print('hello')
+            return True, {'name': name, 'pid': os.getpid()}
+    '''))
+    (lib / 'xtrig_async.py').write_text(dedent('''
+        import asyncio
+
+        async def xtrig_async():
+            await asyncio.sleep(0)
+            return False, {}
+    '''))
+    (lib / 'xtrig_error.py').write_text(dedent('''
+        def xtrig_error():
+            raise ValueError('oops')
+    '''))
+    (lib / 'xtrig_sleep.py').write_text(dedent('''
+        from time import sleep
+
+        def xtrig_sleep():
+            sleep(60)
+    '''))
+    return tmp_path
+
+
+def get_ctx(func_name, run_dir, *args):
+    ctx = SubFuncContext(func_name, func_name, list(args), {})
+    ctx.update_command(str(run_dir))
+    return ctx
+
+
+def wait(executor, timeout=20):
+    """Wait for all calls to return, return the callback contexts."""
+    done = []
+    start = time()
+    while executor.runnings and time() < start + timeout:
+        sleep(0.05)
+        done.extend(call[1] for call in executor.process())
+    return done
+
+
+def test_run_xtrigger(xtrig_dir):
+    """It should run (coroutine) functions and capture the result/output."""
+    ret_code, out, err = run_xtrigger('xtrig_pid', ['x'], {}, str(xtrig_dir))
+    assert ret_code == 0
+    assert json.loads(out)[1]['name'] == 'x'
+    assert err == 'hello\n'
+
+    assert run_xtrigger('xtrig_async', [], {}, str(xtrig_dir)) == (
+        0, '[false, {}]', ''
+    )
+
+    ret_code, out, err = run_xtrigger('xtrig_error', [], {}, str(xtrig_dir))
+    assert ret_code == 1
+    assert out == ''
+    assert 'ValueError: oops' in err
+
+
+def test_xtrigger_executor(xtrig_dir):
+    """It should run calls in long-lived workers and kill slow calls."""
+    wakeups = []
+    executor = XtriggerExecutor(1, 10, lambda: wakeups.append(True))
+    try:
+        # calls are run by the same worker
+        for name in ('a', 'b'):
+            executor.put_command(get_ctx('xtrig_pid', xtrig_dir, name))
+        ctx_a, ctx_b = wait(executor)
+        assert wakeups
+        assert ctx_a.ret_code == ctx_b.ret_code == 0
+        assert ctx_a.err == ctx_b.err == 'hello\n'
+        satisfied, results = json.loads(ctx_a.out)
+        assert satisfied
+        assert results['name'] == 'a'
+        assert json.loads(ctx_b.out)[1]['pid'] == results['pid']
+
+        # slow calls are killed on timeout
+        executor.timeout = 0.5
+        executor.put_command(get_ctx('xtrig_sleep', xtrig_dir))
+        (ctx,) = wait(executor)
+        assert ctx.ret_code == -9
+        assert 'killed on timeout' in ctx.err
+
+        # new workers are started for later calls
+        executor.timeout = 10
+        executor.put_command(get_ctx('xtrig_pid', xtrig_dir, 'c'))
+        (ctx,) = wait(executor)
+        assert json.loads(ctx.out)[1]['pid'] != results['pid']
+    finally:
+        executor.terminate('stopping', 999)
+
+
+def test_xtrigger_executor_no_run_dir():
+    """It should fail calls which have no workflow run directory."""
+    executor = XtriggerExecutor(1, 10)
+    try:
+        executor.put_command(SubFuncContext('x', 'xtrig_pid', [], {}))
+        (ctx,) = wait(executor)
+        assert ctx.ret_code == 1
+        assert 'workflow run directory not set' in ctx.err
+        # no workers are started
+        assert executor._executor is None
+    finally:
+        executor.terminate('stopping', 999)